@@ -0,0 +1,263 @@
+"""
+命令列工具（不需 Tk）：排練大型抽籤、腳本化匯入 / 匯出
+
+    python -m app.cli [--db PATH] [--profile event] draw [--reset] [--summary] [--next] [--weighted | --uniform]
+    python -m app.cli [--db PATH] import roster.xlsx [--mode append] [--sync] [--dry-run]
+    python -m app.cli [--db PATH] export history.csv
+    python -m app.cli [--db PATH] history [--limit 100] [--after DRAWN_AT,ID] [--special]
+    python -m app.cli --trace sql_trace.json draw       # 另存每個 SQL 的次數 / 耗時報告
+
+輸出一律為 JSON（stdout）：{"command", "db", "result", "timing"}，
+timing 為各階段秒數；錯誤時輸出 {"error": ...} 到 stderr 並以 1 結束
+"""
+import argparse
+import json
+import sqlite3
+import sys
+import time
+from contextlib import contextmanager
+from itertools import islice
+from typing import Any, Dict, Iterator, List, Optional
+
+from app.db import database, sql_trace
+from app.db.database import PRAGMA_PROFILES
+from app.services.lottery_history_service import HISTORY_COLUMNS, LotteryHistoryService
+from app.services.lottery_service import LotteryService
+from app.services.participant_service import ParticipantService
+from app.services.prize_service import PrizeService
+
+
+class _PhaseTimer:
+    """
+    依序記錄各階段耗時（秒）
+    """
+
+    def __init__(self):
+        self.phases: Dict[str, float] = {}
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = round(time.perf_counter() - start, 6)
+
+
+# ==================================================
+# 子命令
+# ==================================================
+def _cmd_draw(args, timer: _PhaseTimer) -> Dict[str, Any]:
+    with timer.phase("prepare"):
+        participants = ParticipantService()
+        if args.reset:
+            participants.reset_all_participants()
+        prizes = PrizeService().get_all()
+        candidates = participants.count_participants(active=True)
+
+    remaining = None
+    with timer.phase("draw"):
+        if args.next:
+            session = LotteryService().start_session(weighted=args.weighted)
+            results = list(islice(session, 1))
+            remaining = session.remaining
+        else:
+            results = LotteryService().run_lottery(weighted=args.weighted)
+
+    summary = [
+        {
+            "session_id": r["session_id"],
+            "prize": r["prize"],
+            "is_special": bool(r["is_special"]),
+            "winners": len(r["winners"]),
+            "message": r["message"],
+        }
+        for r in results
+    ]
+
+    output = {
+        "prizes": len(prizes),
+        "candidates": candidates,
+        "winners": sum(len(r["winners"]) for r in results),
+        "results": summary if args.summary else results,
+    }
+    if remaining is not None:
+        output["remaining"] = remaining
+    return output
+
+
+def _cmd_import(args, timer: _PhaseTimer) -> Dict[str, Any]:
+    service = ParticipantService()
+
+    if args.sync:
+        with timer.phase("sync"):
+            diff = service.sync_from_file(args.file, dry_run=args.dry_run)
+        return {
+            "dry_run": args.dry_run,
+            "added": len(diff.added),
+            "renamed": len(diff.renamed),
+            "reweighted": len(diff.reweighted),
+            "removed": len(diff.removed),
+            "unchanged": diff.unchanged,
+        }
+
+    if args.dry_run:
+        raise ValueError("--dry-run 只能搭配 --sync 使用")
+
+    with timer.phase("import"):
+        result = service.import_from_file(args.file, mode=args.mode)
+    return result._asdict()
+
+
+def _cmd_export(args, timer: _PhaseTimer) -> Dict[str, Any]:
+    with timer.phase("export"):
+        count = LotteryHistoryService().export_records(args.file)
+    return {"file": args.file, "records": count}
+
+
+def _cmd_history(args, timer: _PhaseTimer) -> Dict[str, Any]:
+    filters = {
+        "prize_id": args.prize_id,
+        "session_id": args.session_id,
+        "is_special": args.special,
+        "date_from": args.date_from,
+        "date_to": args.date_to,
+    }
+
+    with timer.phase("query"):
+        page = LotteryHistoryService().get_page(
+            args.limit,
+            after=args.after,
+            **{k: v for k, v in filters.items() if v is not None}
+        )
+
+    return {
+        "records": [dict(zip(HISTORY_COLUMNS, row)) for row in page.rows],
+        "next_cursor": (
+            f"{page.next_cursor[0]},{page.next_cursor[1]}"
+            if page.next_cursor else None
+        ),
+    }
+
+
+def _history_cursor(text: str):
+    drawn_at, _, record_id = text.rpartition(",")
+    if not drawn_at or not record_id.isdigit():
+        raise argparse.ArgumentTypeError("游標格式為 DRAWN_AT,ID（取自上一頁的 next_cursor）")
+    return drawn_at, int(record_id)
+
+
+# ==================================================
+# 參數
+# ==================================================
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m app.cli",
+        description="抽籤系統命令列工具（JSON 輸出）"
+    )
+    parser.add_argument("--db", help="資料庫路徑（預設為應用程式資料夾的 lottery.db）")
+    parser.add_argument(
+        "--profile",
+        choices=sorted(PRAGMA_PROFILES),
+        help="PRAGMA 設定檔（排練大量抽籤可用 event）"
+    )
+    parser.add_argument("--indent", type=int, default=2, help="JSON 縮排，0 為單行")
+    parser.add_argument("--trace", help="追蹤每個 SQL 的次數與耗時，報告寫到此路徑（JSON）")
+
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    draw = commands.add_parser("draw", help="依獎項順序執行全部抽籤")
+    draw.add_argument("--reset", action="store_true", help="抽籤前先把全部名單重設為可抽")
+    draw.add_argument("--summary", action="store_true", help="只輸出各獎項中獎人數，不列名單")
+    draw.add_argument(
+        "--next", action="store_true",
+        help="只抽下一個尚未抽出的獎項（已完成場次的獎項略過，可分次執行）"
+    )
+    weighting = draw.add_mutually_exclusive_group()
+    weighting.add_argument(
+        "--weighted", dest="weighted", action="store_true", default=None,
+        help="依 participants.weight 加權抽籤（預設：名單中有非 1 的權重時自動啟用）"
+    )
+    weighting.add_argument(
+        "--uniform", dest="weighted", action="store_false",
+        help="忽略權重，每人機率相同"
+    )
+    draw.set_defaults(handler=_cmd_draw)
+
+    imp = commands.add_parser("import", help="匯入名單（xlsx / csv / tsv）")
+    imp.add_argument("file")
+    imp.add_argument("--mode", choices=("upsert", "append"), default="upsert")
+    imp.add_argument("--sync", action="store_true", help="同步名單：新增 / 改名 / 移除差異")
+    imp.add_argument("--dry-run", action="store_true", help="搭配 --sync：只預覽差異")
+    imp.set_defaults(handler=_cmd_import)
+
+    exp = commands.add_parser("export", help="匯出中獎紀錄（xlsx / csv / jsonl）")
+    exp.add_argument("file")
+    exp.set_defaults(handler=_cmd_export)
+
+    history = commands.add_parser("history", help="分頁查詢中獎紀錄（新到舊）")
+    history.add_argument("--limit", type=int, default=100)
+    history.add_argument("--after", type=_history_cursor, help="上一頁的 next_cursor")
+    history.add_argument("--prize-id", type=int)
+    history.add_argument("--session-id", type=int)
+    history.add_argument(
+        "--special",
+        action=argparse.BooleanOptionalAction,
+        help="只看特別獎（--no-special 排除特別獎）"
+    )
+    history.add_argument("--from", dest="date_from", help="起始時間（含），YYYY-MM-DD[ HH:MM:SS]")
+    history.add_argument("--to", dest="date_to", help="結束時間（不含）")
+    history.set_defaults(handler=_cmd_history)
+
+    return parser
+
+
+# ==================================================
+# 進入點
+# ==================================================
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    timer = _PhaseTimer()
+    indent = args.indent or None
+
+    try:
+        if args.db:
+            database.configure(args.db)
+        if args.profile:
+            database.set_pragma_profile(args.profile)
+        if args.trace:
+            database.enable_sql_trace()
+
+        with timer.phase("setup_database"):
+            database.setup_database()
+
+        result = args.handler(args, timer)
+    except (OSError, ValueError, ImportError, sqlite3.Error) as exc:
+        json.dump({"error": str(exc)}, sys.stderr, ensure_ascii=False)
+        sys.stderr.write("\n")
+        return 1
+    finally:
+        database.shutdown()
+        if args.trace:
+            database.disable_sql_trace()
+            sql_trace.dump(args.trace)
+
+    timer.phases["total"] = round(sum(timer.phases.values()), 6)
+
+    json.dump(
+        {
+            "command": args.command,
+            "db": str(database.get_manager().db_path),
+            "result": result,
+            "timing": timer.phases,
+        },
+        sys.stdout,
+        ensure_ascii=False,
+        indent=indent
+    )
+    sys.stdout.write("\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,100 @@
+import sqlite3
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from app.utils.random_helper import WeightedSampler
+
+
+class CandidatePool:
+    """
+    抽籤候選池（每個抽籤 session 只載入一次名單）：
+    - roster：全部名單（特別獎使用，不受 is_active 影響）
+    - active：尚未中獎的名單（一般獎使用）
+    - 一般獎開獎後以 remove() 增量移除中獎者，O(1) / 人（index-swap）
+    - 加權抽籤用的 WeightedSampler 第一次需要時才建立（alias table O(n)），
+      之後中獎者同樣以 remove() 移除，不必每個獎項重建
+    - version：載入時的名單變動計數（roster_version），與 current_version()
+      相同代表名單沒被編輯過，可繼續沿用
+    """
+
+    def __init__(self, rows: Iterable[sqlite3.Row], version: Optional[int] = None):
+        self.version = version
+        self._roster: List[sqlite3.Row] = list(rows)
+        self._active: List[sqlite3.Row] = [
+            r for r in self._roster if r["is_active"]
+        ]
+        self._position: Dict[int, int] = {
+            r["id"]: i for i, r in enumerate(self._active)
+        }
+        self._samplers: Dict[bool, WeightedSampler] = {}
+        self._has_weights: Optional[bool] = None
+
+    @staticmethod
+    def current_version(conn: sqlite3.Connection) -> int:
+        return conn.execute("SELECT version FROM roster_version").fetchone()[0]
+
+    @classmethod
+    def load(cls, conn: sqlite3.Connection) -> "CandidatePool":
+        # 先讀計數：讀完前若有人編輯，計數已不同，下次會再重新載入
+        version = cls.current_version(conn)
+        rows = conn.execute("""
+            SELECT id, name, employee_no, is_active, weight
+            FROM participants
+            ORDER BY id
+        """).fetchall()
+        return cls(rows, version)
+
+    def candidates(self, is_special: bool) -> Sequence[sqlite3.Row]:
+        """
+        回傳該獎項的候選名單（唯讀，請勿修改）
+        """
+        return self._roster if is_special else self._active
+
+    @property
+    def has_weights(self) -> bool:
+        """
+        名單中是否有人的權重不是預設的 1（自動切換加權抽籤用）
+        """
+        if self._has_weights is None:
+            self._has_weights = any(r["weight"] != 1 for r in self._roster)
+        return self._has_weights
+
+    def sampler(self, is_special: bool) -> WeightedSampler:
+        """
+        該獎項的加權抽樣器（權重為 0 的人不會被抽中）
+        """
+        sampler: Optional[WeightedSampler] = self._samplers.get(is_special)
+        if sampler is None:
+            rows = self.candidates(is_special)
+            sampler = WeightedSampler(
+                rows, [r["weight"] for r in rows], key=lambda r: r["id"]
+            )
+            self._samplers[is_special] = sampler
+        return sampler
+
+    def remove(self, participant_ids: Iterable[int]) -> None:
+        """
+        中獎者移出 active：把最後一位搬到空位，避免 list.remove 的 O(n)
+        """
+        participant_ids = list(participant_ids)
+        active = self._active
+        position = self._position
+
+        active_sampler = self._samplers.get(False)
+        if active_sampler is not None:
+            active_sampler.remove(participant_ids)
+
+        for pid in participant_ids:
+            idx = position.pop(pid, None)
+            if idx is None:
+                continue
+
+            last = active.pop()
+            if idx < len(active):
+                active[idx] = last
+                position[last["id"]] = idx
+
+    def __contains__(self, participant_id: int) -> bool:
+        return participant_id in self._position
+
+    def __len__(self) -> int:
+        return len(self._active)
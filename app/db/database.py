@@ -1,13 +1,23 @@
+import os
 import sqlite3
 import sys
+import threading
+import time
+from contextlib import contextmanager
 from pathlib import Path
-from hashlib import sha256
+from typing import Dict, Iterator, Optional, Union
+
+from app.db import sql_trace
 
 # ==================================================
 # 應用程式名稱（資料夾用）
 # ==================================================
 APP_NAME = "LotteryApp"
 
+# 預設管理者帳號（由 migration 建立，建議首次登入後修改密碼）
+DEFAULT_ADMIN_USERNAME = "admin"
+DEFAULT_ADMIN_PASSWORD = "admin123"
+
 # ==================================================
 # 使用者資料目錄（可寫、永久保存）
 # macOS: ~/Library/Application Support/LotteryApp
@@ -51,83 +61,374 @@ def resource_path(relative_path: str) -> Path:
 
 
 # ==================================================
-# 取得資料庫連線
+# PRAGMA 設定檔
+# - durable：每次 commit 都完整 fsync（平日維護名單用）
+# - event：活動當晚使用，WAL + synchronous=NORMAL，
+#   讀取（歷史視窗）不會卡住抽籤寫入，commit 只在 checkpoint 才 fsync
+# 可用環境變數 LOTTERY_DB_PROFILE 切換預設值
 # ==================================================
-def get_connection():
+PRAGMA_PROFILES: Dict[str, Dict[str, Union[str, int]]] = {
+    "durable": {
+        "journal_mode": "WAL",
+        "synchronous": "FULL",
+        "cache_size": -16000,       # 負數單位為 KiB，約 16 MB
+        "mmap_size": 0,
+        "temp_store": "DEFAULT",
+        "busy_timeout": 5000,       # 毫秒
+    },
+    "event": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": -65536,       # 約 64 MB
+        "mmap_size": 268435456,     # 256 MB
+        "temp_store": "MEMORY",
+        "busy_timeout": 10000,
+    },
+}
+
+DEFAULT_PROFILE = os.environ.get("LOTTERY_DB_PROFILE", "durable")
+
+# 允許的 PRAGMA 與合法值（None 代表整數）
+_PRAGMA_CHOICES = {
+    "journal_mode": {"DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL", "OFF"},
+    "synchronous": {"OFF", "NORMAL", "FULL", "EXTRA"},
+    "temp_store": {"DEFAULT", "FILE", "MEMORY"},
+    "cache_size": None,
+    "mmap_size": None,
+    "busy_timeout": None,
+}
+
+
+def resolve_pragmas(
+    profile: Union[str, Dict[str, Union[str, int]]]
+) -> Dict[str, Union[str, int]]:
     """
-    建立並回傳 SQLite 連線
+    將設定檔名稱或自訂 dict 轉成完整且已驗證的 PRAGMA 設定；
+    自訂 dict 只需列出要覆寫 durable 的項目
     """
-    conn = sqlite3.connect(DB_PATH)
+    if isinstance(profile, str):
+        if profile not in PRAGMA_PROFILES:
+            raise ValueError(f"未知的 PRAGMA 設定檔：{profile}")
+        pragmas = dict(PRAGMA_PROFILES[profile])
+    else:
+        pragmas = dict(PRAGMA_PROFILES["durable"])
+        pragmas.update(profile)
+
+    for key, value in pragmas.items():
+        if key not in _PRAGMA_CHOICES:
+            raise ValueError(f"不支援的 PRAGMA：{key}")
+
+        choices = _PRAGMA_CHOICES[key]
+        if choices is None:
+            if not isinstance(value, int) or isinstance(value, bool):
+                raise ValueError(f"PRAGMA {key} 必須是整數：{value!r}")
+        elif str(value).upper() not in choices:
+            raise ValueError(f"PRAGMA {key} 不支援的值：{value!r}")
+        else:
+            pragmas[key] = str(value).upper()
+
+    return pragmas
+
+
+# ==================================================
+# 建立單一 SQLite 連線
+# ==================================================
+def _open_connection(
+    db_path: Path,
+    pragmas: Dict[str, Union[str, int]]
+) -> sqlite3.Connection:
+    # check_same_thread=False：連線仍只在建立它的執行緒使用，
+    # 但允許 ConnectionManager.close_all() 從主執行緒統一關閉
+    # SQL 追蹤未啟用時 factory 就是 sqlite3.Connection
+    conn = sqlite3.connect(
+        db_path,
+        timeout=pragmas["busy_timeout"] / 1000,
+        check_same_thread=False,
+        factory=sql_trace.connection_factory()
+    )
     conn.row_factory = sqlite3.Row
     conn.execute("PRAGMA foreign_keys = ON;")
+
+    # busy_timeout 先設，journal_mode 切換時才不會因鎖定立即失敗
+    conn.execute(f"PRAGMA busy_timeout = {pragmas['busy_timeout']};")
+    for key, value in pragmas.items():
+        if key != "busy_timeout":
+            conn.execute(f"PRAGMA {key} = {value};")
     return conn
 
 
 # ==================================================
-# 初始化資料庫（建立資料表）
+# 連線管理器（每個執行緒一條長期連線）
 # ==================================================
-def init_db():
+class ConnectionManager:
     """
-    若資料庫不存在，建立資料表
+    SQLite 連線管理器：
+    - 每個執行緒第一次使用時建立連線，之後重複使用
+    - connection()：借用連線（不自動 commit）
+    - transaction()：借用連線，成功 commit、例外 rollback（可巢狀）
+    - close_all()：關閉所有執行緒的連線（App 結束時呼叫）
     """
-    schema_path = resource_path("schema.sql")
 
-    if not schema_path.exists():
-        raise FileNotFoundError(f"schema.sql not found: {schema_path}")
+    def __init__(
+        self,
+        db_path: Optional[Union[str, Path]] = None,
+        profile: Union[str, Dict[str, Union[str, int]]] = DEFAULT_PROFILE
+    ):
+        self._db_path = Path(db_path) if db_path else None
+        self._pragmas = resolve_pragmas(profile)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections = set()
+        self._generation = 0
+
+    @property
+    def db_path(self) -> Path:
+        return self._db_path or DB_PATH
+
+    @property
+    def pragmas(self) -> Dict[str, Union[str, int]]:
+        return dict(self._pragmas)
+
+    def configure(self, db_path: Optional[Union[str, Path]] = None) -> None:
+        """
+        切換資料庫路徑（測試 / CLI 使用），會先關閉既有連線
+        """
+        self.close_all()
+        self._db_path = Path(db_path) if db_path else None
 
-    conn = get_connection()
-    cursor = conn.cursor()
+    def set_profile(
+        self,
+        profile: Union[str, Dict[str, Union[str, int]]]
+    ) -> None:
+        """
+        切換 PRAGMA 設定檔；既有連線關閉，下次借用時套用新設定
+        """
+        pragmas = resolve_pragmas(profile)
+        self.close_all()
+        self._pragmas = pragmas
 
-    with open(schema_path, "r", encoding="utf-8") as f:
-        schema_sql = f.read()
+    def acquire(self) -> sqlite3.Connection:
+        """
+        取得目前執行緒的長期連線（不存在則建立）
+        """
+        local = self._local
+        if getattr(local, "generation", None) != self._generation:
+            conn = _open_connection(self.db_path, self._pragmas)
+            with self._lock:
+                self._connections.add(conn)
+            local.conn = conn
+            local.depth = 0
+            local.generation = self._generation
+        return local.conn
 
-    cursor.executescript(schema_sql)
-    conn.commit()
-    conn.close()
+    def release(self) -> None:
+        """
+        關閉目前執行緒的連線（背景執行緒結束前呼叫）
+        """
+        local = self._local
+        if getattr(local, "generation", None) != self._generation:
+            return
+
+        conn = local.conn
+        with self._lock:
+            self._connections.discard(conn)
+        conn.close()
+        local.generation = None
+        local.conn = None
+
+    def close_all(self) -> None:
+        """
+        關閉所有執行緒的連線
+        """
+        with self._lock:
+            connections = list(self._connections)
+            self._connections.clear()
+            self._generation += 1
+
+        for conn in connections:
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        yield self.acquire()
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        conn = self.acquire()
+        local = self._local
+        outermost = local.depth == 0
+
+        if outermost and not conn.in_transaction:
+            conn.execute("BEGIN")
+
+        local.depth += 1
+        try:
+            yield conn
+        except BaseException:
+            local.depth -= 1
+            if outermost:
+                conn.rollback()
+            raise
+        else:
+            local.depth -= 1
+            if outermost:
+                conn.commit()
+
+
+_manager = ConnectionManager()
+
+
+def get_manager() -> ConnectionManager:
+    return _manager
+
+
+def configure(db_path: Optional[Union[str, Path]] = None) -> None:
+    """
+    切換資料庫路徑；None 代表回到預設 DB_PATH
+    """
+    _manager.configure(db_path)
+
+
+def set_pragma_profile(
+    profile: Union[str, Dict[str, Union[str, int]]]
+) -> None:
+    """
+    切換 PRAGMA 設定檔："durable"、"event" 或自訂 dict
+    """
+    _manager.set_profile(profile)
+
+
+def connection():
+    """
+    借用目前執行緒的長期連線：
+
+        with connection() as conn:
+            conn.execute(...)
+    """
+    return _manager.connection()
+
+
+def transaction():
+    """
+    借用連線並包成一個 transaction：
+
+        with transaction() as conn:
+            conn.execute(...)
+    """
+    return _manager.transaction()
+
+
+def release_connection() -> None:
+    """
+    關閉目前執行緒的長期連線（背景執行緒結束前呼叫）
+    """
+    _manager.release()
+
+
+def shutdown() -> None:
+    """
+    App 結束時呼叫，關閉所有長期連線
+    """
+    _manager.close_all()
+
+
+def enable_sql_trace() -> None:
+    """
+    開始追蹤 SQL（既有連線關閉，之後借用的連線才會計時）
+    """
+    sql_trace.enable()
+    _manager.close_all()
+
+
+def disable_sql_trace() -> None:
+    """
+    停止追蹤；已收集的統計保留，可再用 sql_trace.report() / dump() 取出
+    """
+    sql_trace.disable()
+    _manager.close_all()
+
+
+# 環境變數 LOTTERY_SQL_TRACE=報告路徑：啟動即追蹤，app 結束時寫出報告
+SQL_TRACE_PATH = os.environ.get("LOTTERY_SQL_TRACE") or None
+if SQL_TRACE_PATH:
+    sql_trace.enable()
 
 
 # ==================================================
-# 初始化預設管理者帳號
+# 取得資料庫連線（一次性，呼叫端自行 close）
 # ==================================================
-def init_default_admin():
+def get_connection():
     """
-    建立預設管理者帳號（若不存在）
+    建立並回傳 SQLite 連線
     """
-    default_username = "admin"
-    default_password = "admin123"  # 建議首次登入後修改
-    password_hash = sha256(default_password.encode("utf-8")).hexdigest()
+    return _open_connection(_manager.db_path, _manager.pragmas)
 
-    conn = get_connection()
-    cursor = conn.cursor()
 
-    cursor.execute(
-        "SELECT id FROM users WHERE username = ?",
-        (default_username,)
-    )
-
-    if cursor.fetchone() is None:
-        cursor.execute(
-            """
-            INSERT INTO users (username, password_hash)
-            VALUES (?, ?)
-            """,
-            (default_username, password_hash)
-        )
-        conn.commit()
+# ==================================================
+# 初始化 / 升級資料庫（建立資料表、索引）
+# ==================================================
+def init_db():
+    """
+    依 PRAGMA user_version 套用尚未執行的 migration；
+    新 DB 從頭建立，舊 DB 就地升級
+    """
+    from app.db.migrations import migrate
 
-    conn.close()
+    return migrate()
 
 
 # ==================================================
 # 一次性初始化入口（App 啟動時呼叫）
 # ==================================================
-def setup_database():
+def setup_database() -> Dict[str, object]:
     """
     App 啟動時呼叫：
-    - DB 不存在 → 建立資料表
-    - 建立預設管理者帳號
+    - 快速路徑：以長期連線讀一次 user_version / application_id，
+      已是最新版本的 LotteryApp 資料庫就不做任何寫入
+    - 否則套用尚未執行的 migration（新 DB 建表、舊 DB 補索引、建立預設管理者）
+    - 名單搜尋索引（FTS5）與目前 SQLite 的能力不符時補建或停用
+
+    回傳 {"fast_path", "applied", "seconds"}，供啟動報告使用
     """
-    if not DB_PATH.exists():
-        init_db()
+    from app.db.migrations import (
+        APPLICATION_ID,
+        SCHEMA_VERSION,
+        ensure_search_index,
+        migrate,
+        search_index_stale,
+    )
+
+    start = time.perf_counter()
+    with connection() as conn:
+        version, application_id, fts_table, fts_triggers = conn.execute(
+            """
+            SELECT
+                (SELECT user_version FROM pragma_user_version),
+                (SELECT application_id FROM pragma_application_id),
+                (SELECT count(*) FROM sqlite_master
+                 WHERE type = 'table' AND name = 'participants_fts'),
+                (SELECT count(*) FROM sqlite_master
+                 WHERE type = 'trigger' AND name LIKE 'participants_fts_%')
+            """
+        ).fetchone()
+
+        if application_id not in (0, APPLICATION_ID):
+            raise sqlite3.DatabaseError(
+                f"不是 {APP_NAME} 的資料庫：{_manager.db_path}"
+            )
+
+        fast_path = version >= SCHEMA_VERSION and application_id == APPLICATION_ID
+        applied = [] if fast_path else migrate(conn)
+
+        # 搜尋索引依這次執行的 SQLite 是否支援 FTS5 trigram 而定（可能換過版本）
+        if not fast_path or search_index_stale(bool(fts_table), fts_triggers):
+            ensure_search_index(conn)
 
-    init_default_admin()
+    return {
+        "fast_path": fast_path,
+        "applied": applied,
+        "seconds": time.perf_counter() - start,
+    }
@@ -0,0 +1,313 @@
+"""
+資料庫版本遷移（以 PRAGMA user_version 記錄目前版本）
+
+新增 migration：在 MIGRATIONS 尾端加上 (版本, 說明, SQL)，
+版本號必須遞增；已發佈的 migration 不可再修改。
+"""
+import sqlite3
+from functools import lru_cache
+from hashlib import sha256
+from typing import Callable, List, Optional, Tuple, Union
+
+from app.db.database import (
+    DEFAULT_ADMIN_PASSWORD,
+    DEFAULT_ADMIN_USERNAME,
+    connection,
+    resource_path,
+    transaction,
+)
+
+# PRAGMA application_id："LOTT"，用來辨識是本 App 的資料庫
+APPLICATION_ID = 0x4C4F5454
+
+
+def _baseline_schema() -> str:
+    schema_path = resource_path("schema.sql")
+
+    if not schema_path.exists():
+        raise FileNotFoundError(f"schema.sql not found: {schema_path}")
+
+    with open(schema_path, "r", encoding="utf-8") as f:
+        return f.read()
+
+
+@lru_cache(maxsize=None)
+def fts5_trigram_available() -> bool:
+    """
+    目前的 SQLite 是否支援 FTS5 trigram tokenizer（3.34+ 且編譯時啟用 FTS5）
+    同一個行程內結果不變，只探測一次
+    """
+    probe = sqlite3.connect(":memory:")
+    try:
+        probe.execute(
+            "CREATE VIRTUAL TABLE t USING fts5(x, tokenize = 'trigram')"
+        )
+        return True
+    except sqlite3.OperationalError:
+        return False
+    finally:
+        probe.close()
+
+
+# participants_fts 與 participants 同步的 trigger（名稱 → SQL）；
+# 大量匯入時 ParticipantService 會暫時移除，結束前重建並 rebuild 一次
+PARTICIPANT_FTS_TRIGGERS = {
+    "participants_fts_insert": """
+        CREATE TRIGGER IF NOT EXISTS participants_fts_insert
+        AFTER INSERT ON participants BEGIN
+            INSERT INTO participants_fts (rowid, name, employee_no)
+            VALUES (new.id, new.name, new.employee_no);
+        END;
+    """,
+    "participants_fts_delete": """
+        CREATE TRIGGER IF NOT EXISTS participants_fts_delete
+        AFTER DELETE ON participants BEGIN
+            INSERT INTO participants_fts (participants_fts, rowid, name, employee_no)
+            VALUES ('delete', old.id, old.name, old.employee_no);
+        END;
+    """,
+    "participants_fts_update": """
+        CREATE TRIGGER IF NOT EXISTS participants_fts_update
+        AFTER UPDATE OF name, employee_no ON participants BEGIN
+            INSERT INTO participants_fts (participants_fts, rowid, name, employee_no)
+            VALUES ('delete', old.id, old.name, old.employee_no);
+            INSERT INTO participants_fts (rowid, name, employee_no)
+            VALUES (new.id, new.name, new.employee_no);
+        END;
+    """,
+}
+
+
+# participants 每次增刪改都把 roster_version 加一（名單變動計數）；
+# 大量匯入同樣由 ParticipantService 暫停，結束時只加一次
+ROSTER_VERSION_TRIGGERS = {
+    "roster_version_insert": """
+        CREATE TRIGGER IF NOT EXISTS roster_version_insert
+        AFTER INSERT ON participants BEGIN
+            UPDATE roster_version SET version = version + 1;
+        END;
+    """,
+    "roster_version_delete": """
+        CREATE TRIGGER IF NOT EXISTS roster_version_delete
+        AFTER DELETE ON participants BEGIN
+            UPDATE roster_version SET version = version + 1;
+        END;
+    """,
+    "roster_version_update": """
+        CREATE TRIGGER IF NOT EXISTS roster_version_update
+        AFTER UPDATE OF name, employee_no, is_active, weight ON participants BEGIN
+            UPDATE roster_version SET version = version + 1;
+        END;
+    """,
+}
+
+
+# 外部內容 FTS5：不重複存資料，由 trigger 與 participants 同步
+PARTICIPANT_FTS_TABLE = """
+    CREATE VIRTUAL TABLE IF NOT EXISTS participants_fts USING fts5(
+        name,
+        employee_no,
+        content = 'participants',
+        content_rowid = 'id',
+        tokenize = 'trigram'
+    );
+"""
+
+
+# ==================================================
+# 名單搜尋索引（FTS5）：依執行時的 SQLite 而定，不屬於固定的 migration
+# ==================================================
+def search_index_stale(has_table: bool, trigger_count: int) -> bool:
+    """
+    目前的 participants_fts / trigger 是否與這個 SQLite 的能力不符
+    （啟動快速路徑用，只比對 sqlite_master 的查詢結果）
+    """
+    if fts5_trigram_available():
+        return not has_table or trigger_count != len(PARTICIPANT_FTS_TRIGGERS)
+    return trigger_count > 0
+
+
+def ensure_search_index(conn: sqlite3.Connection) -> Optional[str]:
+    """
+    讓名單搜尋索引符合目前 SQLite 的能力，回傳做了什麼（沒變動時為 None）：
+    - 支援 trigram：缺表就建立、缺 trigger 就補上，並 rebuild 一次 → "rebuilt"
+    - 不支援：移除 trigger（否則 participants 的每次寫入都會因缺 tokenizer 失敗），
+      表留著不動；之後換回支援的 SQLite 時補 trigger 並 rebuild → "disabled"
+    """
+    has_table = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'participants_fts'"
+    ).fetchone() is not None
+    triggers = {
+        r[0] for r in conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'trigger'"
+        )
+    } & set(PARTICIPANT_FTS_TRIGGERS)
+
+    if not search_index_stale(has_table, len(triggers)):
+        return None
+
+    with transaction() as tx:
+        if not fts5_trigram_available():
+            for name in triggers:
+                tx.execute(f"DROP TRIGGER IF EXISTS {name}")
+            return "disabled"
+
+        tx.execute(PARTICIPANT_FTS_TABLE)
+        for sql in PARTICIPANT_FTS_TRIGGERS.values():
+            tx.execute(sql)
+        tx.execute("INSERT INTO participants_fts (participants_fts) VALUES ('rebuild')")
+    return "rebuilt"
+
+
+def _default_admin() -> str:
+    # 原本每次啟動都查一次 users；改成建立 / 升級資料庫時建立一次，
+    # 之後啟動只需比對 user_version / application_id
+    password_hash = sha256(DEFAULT_ADMIN_PASSWORD.encode("utf-8")).hexdigest()
+    return f"""
+        INSERT OR IGNORE INTO users (username, password_hash)
+        VALUES ('{DEFAULT_ADMIN_USERNAME}', '{password_hash}');
+
+        PRAGMA application_id = {APPLICATION_ID};
+    """
+
+
+# ==================================================
+# Migration 清單
+# ==================================================
+MIGRATIONS: List[Tuple[int, str, Union[str, Callable[[], str]]]] = [
+    # v1：原始 schema.sql（CREATE TABLE IF NOT EXISTS，舊 DB 可安全重跑）
+    (1, "baseline schema", _baseline_schema),
+
+    # v2：熱門查詢所需索引
+    (2, "hot query indexes", """
+        -- LotteryService：WHERE is_active = 1（覆蓋 id/name/employee_no）
+        CREATE INDEX IF NOT EXISTS idx_participants_active
+            ON participants (is_active, name, employee_no);
+
+        -- ParticipantService.delete 的 FK 檢查、依人查詢中獎紀錄
+        CREATE INDEX IF NOT EXISTS idx_draw_records_participant
+            ON draw_records (participant_id);
+
+        -- LotteryHistoryService：ORDER BY dr.drawn_at DESC
+        CREATE INDEX IF NOT EXISTS idx_draw_records_drawn_at
+            ON draw_records (drawn_at, session_id, participant_id);
+
+        -- LotteryHistoryService：WHERE ds.prize_id = ?、PrizeService.delete 的 FK 檢查
+        CREATE INDEX IF NOT EXISTS idx_draw_sessions_prize
+            ON draw_sessions (prize_id);
+    """),
+
+    # v3：employee_no 唯一（名單 upsert 匯入的 key）
+    # 舊資料先正規化空字串；重複員編只保留最小 id 的那一筆，其餘清成 NULL
+    # （不刪人、不動中獎紀錄與 is_active：歷史紀錄是抽籤的稽核依據）
+    (3, "unique employee_no", """
+        UPDATE participants
+        SET employee_no = NULLIF(trim(employee_no), '')
+        WHERE employee_no IS NOT NULL;
+
+        UPDATE participants
+        SET employee_no = NULL
+        WHERE employee_no IS NOT NULL
+          AND id NOT IN (
+              SELECT MIN(id) FROM participants
+              WHERE employee_no IS NOT NULL
+              GROUP BY employee_no
+          );
+
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_participants_employee_no
+            ON participants (employee_no)
+            WHERE employee_no IS NOT NULL;
+    """),
+
+    # v4：歷史紀錄 keyset 分頁（drawn_at, id）需要 id 緊接在 drawn_at 之後
+    (4, "history keyset index", """
+        DROP INDEX IF EXISTS idx_draw_records_drawn_at;
+
+        CREATE INDEX IF NOT EXISTS idx_draw_records_drawn_at_id
+            ON draw_records (drawn_at, id, session_id, participant_id);
+    """),
+
+    # v5：名單搜尋（姓名前綴索引；1～2 字的中文姓氏 / 名字走一般索引）
+    # FTS5 trigram 子字串搜尋依執行時的 SQLite 而定，由 ensure_search_index 在啟動時處理
+    (5, "participant search index", """
+        CREATE INDEX IF NOT EXISTS idx_participants_name
+            ON participants (name);
+    """),
+
+    # v6：預設管理者帳號 + application_id（啟動快速路徑的判斷依據）
+    (6, "default admin and application id", _default_admin),
+
+    # v7：抽籤權重（加權抽籤用；預設 1，0 代表不參加加權抽籤）
+    (7, "participant weight", """
+        ALTER TABLE participants
+            ADD COLUMN weight REAL NOT NULL DEFAULT 1 CHECK (weight >= 0);
+    """),
+
+    # v8：抽籤輪次（resume 只看目前這一輪；抽完整輪後下次從頭開始）
+    # 舊場次 run_id 為 NULL，不影響之後的輪次
+    (8, "draw runs", """
+        CREATE TABLE IF NOT EXISTS draw_runs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            started_at DATETIME DEFAULT (datetime('now', '+8 hours')),
+            finished_at DATETIME
+        );
+
+        ALTER TABLE draw_sessions
+            ADD COLUMN run_id INTEGER REFERENCES draw_runs(id);
+
+        CREATE INDEX IF NOT EXISTS idx_draw_sessions_run
+            ON draw_sessions (run_id, prize_id);
+    """),
+
+    # v9：名單變動計數（逐獎項揭曉時，名單沒變就沿用已載入的候選池）
+    (9, "roster version", """
+        CREATE TABLE IF NOT EXISTS roster_version (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            version INTEGER NOT NULL
+        );
+
+        INSERT OR IGNORE INTO roster_version (id, version) VALUES (1, 0);
+    """ + "".join(ROSTER_VERSION_TRIGGERS.values())),
+]
+
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+
+def get_schema_version(conn: sqlite3.Connection) -> int:
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def _apply(conn: sqlite3.Connection, version: int, sql: str) -> None:
+    # executescript 會先 commit 既有 transaction，
+    # 因此 BEGIN / COMMIT 寫在 script 內，確保單一 migration 全有或全無
+    try:
+        conn.executescript(
+            f"BEGIN;\n{sql}\nPRAGMA user_version = {version};\nCOMMIT;"
+        )
+    except Exception:
+        if conn.in_transaction:
+            conn.rollback()
+        raise
+
+
+def migrate(conn: Optional[sqlite3.Connection] = None) -> List[int]:
+    """
+    將資料庫升級到最新版本，回傳本次套用的版本號
+    """
+    if conn is None:
+        with connection() as conn:
+            return migrate(conn)
+
+    current = get_schema_version(conn)
+    applied: List[int] = []
+
+    for version, _description, sql in MIGRATIONS:
+        if version <= current:
+            continue
+
+        _apply(conn, version, sql() if callable(sql) else sql)
+        applied.append(version)
+
+    # executescript 內的 PRAGMA foreign_keys 不會生效於 transaction 中，這裡補回
+    conn.execute("PRAGMA foreign_keys = ON;")
+    return applied
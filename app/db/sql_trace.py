@@ -0,0 +1,276 @@
+"""
+SQL 追蹤（選用）：每個 SQL 敘述的呼叫次數、累計時間、列數與 VM 指令數，依 service 方法彙總
+
+啟用方式：
+    LOTTERY_SQL_TRACE=sql_trace.json python -m app.main     # 結束時寫出報告
+    python -m app.cli --trace sql_trace.json draw
+    database.enable_sql_trace() / database.disable_sql_trace()
+
+未啟用時連線就是一般 sqlite3.Connection，執行期間沒有任何額外成本；
+啟用後以 connection / cursor factory 包住 execute / fetch 計時，
+progress handler 每 PROGRESS_STEPS 個 VM 指令計數一次（估算 CPU 工作量）
+"""
+import json
+import sqlite3
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Type, Union
+
+PROGRESS_STEPS = 1000
+
+# 彙總的歸屬：最內層的 service 方法；不在 service 內則取最近的 app 模組
+_SERVICE_PREFIX = "app.services."
+
+# 多行 script（migration）只保留開頭作為 key
+_SCRIPT_KEY_LENGTH = 120
+
+_enabled = False
+_lock = threading.Lock()
+# (caller, sql) → [calls, seconds, rows, vm_steps]
+_stats: Dict[Tuple[str, str], List[Union[int, float]]] = {}
+
+
+# ==================================================
+# 開關
+# ==================================================
+def enable() -> None:
+    """
+    之後新開的連線才會被追蹤（database.enable_sql_trace 會一併重開連線）
+    """
+    global _enabled
+    _enabled = True
+
+
+def disable() -> None:
+    global _enabled
+    _enabled = False
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def reset() -> None:
+    with _lock:
+        _stats.clear()
+
+
+def connection_factory() -> Type[sqlite3.Connection]:
+    return TracedConnection if _enabled else sqlite3.Connection
+
+
+# ==================================================
+# 紀錄
+# ==================================================
+def _caller() -> str:
+    fallback = None
+    frame = sys._getframe(2)
+    while frame is not None:
+        module = frame.f_globals.get("__name__", "")
+        if module.startswith(_SERVICE_PREFIX):
+            return _frame_name(module, frame)
+        if fallback is None and module.startswith("app.") and module != __name__:
+            fallback = _frame_name(module, frame)
+        frame = frame.f_back
+    return fallback or "(other)"
+
+
+def _frame_name(module: str, frame) -> str:
+    code = frame.f_code
+    return f"{module}:{getattr(code, 'co_qualname', code.co_name)}"
+
+
+def _normalize(sql: str) -> str:
+    return " ".join(sql.split())
+
+
+def _record(
+    key: Tuple[str, str],
+    calls: int,
+    seconds: float,
+    rows: int,
+    ticks: int
+) -> None:
+    with _lock:
+        stat = _stats.get(key)
+        if stat is None:
+            stat = _stats[key] = [0, 0.0, 0, 0]
+        stat[0] += calls
+        stat[1] += seconds
+        stat[2] += rows
+        stat[3] += ticks * PROGRESS_STEPS
+
+
+# ==================================================
+# 追蹤用連線 / cursor
+# ==================================================
+class TracedCursor(sqlite3.Cursor):
+    """
+    execute 計時並記下 key；之後的 fetch 時間與列數也算在同一個敘述上
+    """
+
+    _trace_key: Optional[Tuple[str, str]] = None
+
+    def _run(self, key, method, *args):
+        self._trace_key = key
+        conn = self.connection
+        ticks = conn.vm_ticks
+        start = time.perf_counter()
+        try:
+            return method(self, *args)
+        finally:
+            # SELECT 的列數在 fetch 時才累計；寫入取 rowcount
+            rows = self.rowcount if self.description is None and self.rowcount > 0 else 0
+            _record(key, 1, time.perf_counter() - start, rows, conn.vm_ticks - ticks)
+
+    def execute(self, sql, parameters=()):
+        return self._run(
+            (_caller(), _normalize(sql)),
+            sqlite3.Cursor.execute, sql, parameters
+        )
+
+    def executemany(self, sql, seq_of_parameters):
+        return self._run(
+            (_caller(), _normalize(sql)),
+            sqlite3.Cursor.executemany, sql, seq_of_parameters
+        )
+
+    def executescript(self, sql_script):
+        return self._run(
+            (_caller(), _normalize(sql_script)[:_SCRIPT_KEY_LENGTH]),
+            sqlite3.Cursor.executescript, sql_script
+        )
+
+    def _fetch(self, method, *args):
+        conn = self.connection
+        ticks = conn.vm_ticks
+        start = time.perf_counter()
+        result = method(self, *args)
+        if self._trace_key is not None:
+            if isinstance(result, list):
+                rows = len(result)
+            else:
+                rows = 0 if result is None else 1
+            _record(
+                self._trace_key, 0, time.perf_counter() - start,
+                rows, conn.vm_ticks - ticks
+            )
+        return result
+
+    def fetchone(self):
+        return self._fetch(sqlite3.Cursor.fetchone)
+
+    def fetchmany(self, size=None):
+        if size is None:
+            size = self.arraysize
+        return self._fetch(sqlite3.Cursor.fetchmany, size)
+
+    def fetchall(self):
+        return self._fetch(sqlite3.Cursor.fetchall)
+
+    def __next__(self):
+        return self._fetch(sqlite3.Cursor.__next__)
+
+
+class TracedConnection(sqlite3.Connection):
+    """
+    Connection.execute 等捷徑在 C 層直接建立 cursor，這裡改走 self.cursor() 才能追蹤
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.vm_ticks = 0
+        self.set_progress_handler(self._on_progress, PROGRESS_STEPS)
+
+    def _on_progress(self) -> int:
+        self.vm_ticks += 1
+        return 0
+
+    def cursor(self, factory=TracedCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+    def executescript(self, sql_script):
+        return self.cursor().executescript(sql_script)
+
+    def commit(self):
+        # durable 設定檔下 commit 含 fsync，常是寫入最慢的一步
+        start = time.perf_counter()
+        try:
+            super().commit()
+        finally:
+            _record((_caller(), "COMMIT"), 1, time.perf_counter() - start, 0, 0)
+
+
+# ==================================================
+# 報告
+# ==================================================
+def statements() -> List[Dict[str, Any]]:
+    """
+    每個 (caller, sql) 一筆，依累計時間由大到小
+    """
+    with _lock:
+        items = [(key, list(stat)) for key, stat in _stats.items()]
+
+    result = [
+        {
+            "caller": caller,
+            "sql": sql,
+            "calls": calls,
+            "seconds": round(seconds, 6),
+            "rows": rows,
+            "vm_steps": steps,
+        }
+        for (caller, sql), (calls, seconds, rows, steps) in items
+    ]
+    result.sort(key=lambda r: r["seconds"], reverse=True)
+    return result
+
+
+def callers() -> List[Dict[str, Any]]:
+    """
+    依 service 方法彙總，依累計時間由大到小
+    """
+    totals: Dict[str, Dict[str, Any]] = {}
+    for stat in statements():
+        total = totals.setdefault(stat["caller"], {
+            "caller": stat["caller"],
+            "statements": 0,
+            "calls": 0,
+            "seconds": 0.0,
+            "rows": 0,
+            "vm_steps": 0,
+        })
+        total["statements"] += 1
+        for key in ("calls", "seconds", "rows", "vm_steps"):
+            total[key] += stat[key]
+
+    result = sorted(totals.values(), key=lambda t: t["seconds"], reverse=True)
+    for total in result:
+        total["seconds"] = round(total["seconds"], 6)
+    return result
+
+
+def report() -> Dict[str, Any]:
+    return {
+        "enabled": _enabled,
+        "progress_steps": PROGRESS_STEPS,
+        "callers": callers(),
+        "statements": statements(),
+    }
+
+
+def dump(path: Union[str, Path]) -> Path:
+    path = Path(path)
+    path.write_text(
+        json.dumps(report(), ensure_ascii=False, indent=2) + "\n",
+        encoding="utf-8"
+    )
+    return path
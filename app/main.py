@@ -1,15 +1,31 @@
+# 需最先匯入：啟用啟動報告時，之後的匯入才會被計時
+from app.utils import startup_timing
+
 import tkinter as tk
 
-from app.db.database import setup_database
+from app.db import sql_trace
+from app.db.database import SQL_TRACE_PATH, setup_database, shutdown
 from app.ui.login_window import LoginWindow
 
 
 def main():
-    setup_database()
+    startup_timing.mark("imports")
+    bootstrap = setup_database()
+    startup_timing.mark(
+        "database setup" if bootstrap["fast_path"] else "database setup (migrate)"
+    )
 
-    root = tk.Tk()
-    LoginWindow(root)
-    root.mainloop()
+    try:
+        root = tk.Tk()
+        LoginWindow(root)
+        startup_timing.mark("login window")
+        startup_timing.on_first_frame(root)
+        root.mainloop()
+    finally:
+        startup_timing.finish()
+        shutdown()
+        if SQL_TRACE_PATH:
+            sql_trace.dump(SQL_TRACE_PATH)
 
 
 if __name__ == "__main__":
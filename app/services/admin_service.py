@@ -1,5 +1,5 @@
 # app/services/admin_service.py
-from app.db.database import get_connection
+from app.db.database import transaction
 
 
 class AdminService:
@@ -8,20 +8,13 @@ class AdminService:
         """
         清空所有抽獎相關資料（僅限測試用）
         """
-        conn = get_connection()
-        cursor = conn.cursor()
+        with transaction() as conn:
+            cursor = conn.cursor()
 
-        try:
             cursor.execute("DELETE FROM draw_records")
             cursor.execute("DELETE FROM draw_sessions")
+            cursor.execute("DELETE FROM draw_runs")
             cursor.execute("""
                 UPDATE participants
                 SET is_active = 1
             """)
-
-            conn.commit()
-        except Exception:
-            conn.rollback()
-            raise
-        finally:
-            conn.close()
@@ -1,5 +1,5 @@
 from hashlib import sha256
-from app.db.database import get_connection
+from app.db.database import connection
 
 
 class AuthService:
@@ -21,19 +21,18 @@ class AuthService:
         """
         password_hash = AuthService.hash_password(password)
 
-        conn = get_connection()
-        cursor = conn.cursor()
+        with connection() as conn:
+            cursor = conn.cursor()
 
-        cursor.execute(
-            """
-            SELECT id
-            FROM users
-            WHERE username = ? AND password_hash = ?
-            """,
-            (username, password_hash)
-        )
+            cursor.execute(
+                """
+                SELECT id
+                FROM users
+                WHERE username = ? AND password_hash = ?
+                """,
+                (username, password_hash)
+            )
 
-        user = cursor.fetchone()
-        conn.close()
+            user = cursor.fetchone()
 
         return user is not None
@@ -1,5 +1,82 @@
-from typing import List, Dict
-from app.db.database import get_connection
+import threading
+from typing import Any, List, Dict, Iterator, NamedTuple, Optional, Callable, Tuple
+from app.db.database import connection
+from app.utils.history_exporter import export_rows
+
+# iter_records() 每列 tuple 的欄位順序
+HISTORY_COLUMNS = (
+    "record_id",
+    "prize_name",
+    "is_special",
+    "participant_name",
+    "employee_no",
+    "drawn_at",
+)
+
+# 匯出檔欄位標題
+EXPORT_HEADERS = ["獎項", "特別獎", "中獎者", "員工編號", "抽籤時間"]
+
+# 分頁游標：上一頁最後一筆的 (drawn_at, record_id)
+HistoryCursor = Tuple[str, int]
+
+
+class HistoryPage(NamedTuple):
+    """
+    一頁中獎紀錄：rows 依 HISTORY_COLUMNS 順序；next_cursor 為 None 代表已是最後一頁
+    """
+    rows: List[Tuple]
+    next_cursor: Optional[HistoryCursor]
+
+
+def _history_filters(
+    prize_id: Optional[int] = None,
+    session_id: Optional[int] = None,
+    is_special: Optional[bool] = None,
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None
+) -> Tuple[List[str], List[Any]]:
+    """
+    篩選條件 → (WHERE 子句清單, 參數)
+    date_from / date_to 格式同 drawn_at（'YYYY-MM-DD[ HH:MM:SS]'），date_to 不含
+    """
+    clauses: List[str] = []
+    params: List[Any] = []
+
+    if prize_id is not None:
+        clauses.append("ds.prize_id = ?")
+        params.append(prize_id)
+    if session_id is not None:
+        clauses.append("dr.session_id = ?")
+        params.append(session_id)
+    if is_special is not None:
+        clauses.append("pr.is_special = ?")
+        params.append(1 if is_special else 0)
+    if date_from is not None:
+        clauses.append("dr.drawn_at >= ?")
+        params.append(date_from)
+    if date_to is not None:
+        clauses.append("dr.drawn_at < ?")
+        params.append(date_to)
+
+    return clauses, params
+
+
+def _history_source(filters: Dict[str, Any]) -> Tuple[str, List[Any]]:
+    """
+    計數 / 定位用的 FROM + WHERE；只有篩選條件需要時才 JOIN
+    """
+    clauses, params = _history_filters(**filters)
+
+    source = "FROM draw_records dr"
+    if filters.get("prize_id") is not None or filters.get("is_special") is not None:
+        source += """
+            JOIN draw_sessions ds ON dr.session_id = ds.id
+            JOIN prizes pr ON ds.prize_id = pr.id
+        """
+    if clauses:
+        source += f" WHERE {' AND '.join(clauses)}"
+
+    return source, params
 
 
 class LotteryHistoryService:
@@ -11,51 +88,176 @@ class LotteryHistoryService:
     # 1. 查詢所有中獎紀錄
     # ==================================================
     def get_all_records(self) -> List[Dict]:
-        conn = get_connection()
-        cursor = conn.cursor()
-
-        cursor.execute("""
-            SELECT
-                dr.id AS record_id,
-                p.name AS participant_name,
-                p.employee_no AS employee_no,
-                pr.name AS prize_name,
-                pr.is_special,
-                dr.drawn_at
-            FROM draw_records dr
-            JOIN draw_sessions ds ON dr.session_id = ds.id
-            JOIN prizes pr ON ds.prize_id = pr.id
-            JOIN participants p ON dr.participant_id = p.id
-            ORDER BY dr.drawn_at DESC
-        """)
+        with connection() as conn:
+            cursor = conn.cursor()
+
+            cursor.execute("""
+                SELECT
+                    dr.id AS record_id,
+                    p.name AS participant_name,
+                    p.employee_no AS employee_no,
+                    pr.name AS prize_name,
+                    pr.is_special,
+                    dr.drawn_at
+                FROM draw_records dr
+                JOIN draw_sessions ds ON dr.session_id = ds.id
+                JOIN prizes pr ON ds.prize_id = pr.id
+                JOIN participants p ON dr.participant_id = p.id
+                ORDER BY dr.drawn_at DESC, dr.id DESC
+            """)
 
-        rows = cursor.fetchall()
-        conn.close()
+            rows = cursor.fetchall()
 
         return [dict(row) for row in rows]
 
+    # ==================================================
+    # 1-1. 串流讀取所有中獎紀錄（匯出用，記憶體固定）
+    # ==================================================
+    def iter_records(self, batch_size: int = 1000) -> Iterator[Tuple]:
+        """
+        依 HISTORY_COLUMNS 順序逐列產生 tuple，以 fetchmany 分批讀取
+        """
+        with connection() as conn:
+            cursor = conn.execute("""
+                SELECT
+                    dr.id,
+                    pr.name,
+                    pr.is_special,
+                    p.name,
+                    p.employee_no,
+                    dr.drawn_at
+                FROM draw_records dr
+                JOIN draw_sessions ds ON dr.session_id = ds.id
+                JOIN prizes pr ON ds.prize_id = pr.id
+                JOIN participants p ON dr.participant_id = p.id
+                ORDER BY dr.drawn_at DESC, dr.id DESC
+            """)
+
+            try:
+                while True:
+                    rows = cursor.fetchmany(batch_size)
+                    if not rows:
+                        break
+                    for row in rows:
+                        yield tuple(row)
+            finally:
+                cursor.close()
+
+    # ==================================================
+    # 1-2. 串流匯出（.xlsx / .csv / .jsonl）
+    # ==================================================
+    def export_records(
+        self,
+        file_path: str,
+        progress: Optional[Callable[[int], None]] = None,
+        cancel: Optional[threading.Event] = None
+    ) -> int:
+        """
+        邊讀 cursor 邊寫檔，記憶體不隨紀錄筆數成長；回傳匯出筆數
+        """
+        rows = (
+            (prize_name, "是" if is_special else "否", name, employee_no or "", drawn_at)
+            for _, prize_name, is_special, name, employee_no, drawn_at
+            in self.iter_records()
+        )
+        return export_rows(file_path, EXPORT_HEADERS, rows, progress, cancel)
+
+    # ==================================================
+    # 1-3. Keyset 分頁查詢（新到舊）
+    # ==================================================
+    def get_page(
+        self,
+        limit: int = 100,
+        after: Optional[HistoryCursor] = None,
+        **filters
+    ) -> HistoryPage:
+        """
+        依 (drawn_at, record_id) 由新到舊分頁；after 傳入上一頁的 next_cursor
+        以游標而非 OFFSET 定位：翻頁成本固定，且翻頁期間新增的抽籤不會讓頁面錯位
+        filters：prize_id / session_id / is_special / date_from / date_to
+        """
+        clauses, params = _history_filters(**filters)
+
+        if after is not None:
+            clauses.append("(dr.drawn_at, dr.id) < (?, ?)")
+            params.extend(after)
+
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+
+        with connection() as conn:
+            rows = conn.execute(f"""
+                SELECT
+                    dr.id,
+                    pr.name,
+                    pr.is_special,
+                    p.name,
+                    p.employee_no,
+                    dr.drawn_at
+                FROM draw_records dr
+                JOIN draw_sessions ds ON dr.session_id = ds.id
+                JOIN prizes pr ON ds.prize_id = pr.id
+                JOIN participants p ON dr.participant_id = p.id
+                {where}
+                ORDER BY dr.drawn_at DESC, dr.id DESC
+                LIMIT ?
+            """, (*params, limit + 1)).fetchall()
+
+        rows = [tuple(r) for r in rows]
+        if len(rows) <= limit:
+            return HistoryPage(rows, None)
+
+        rows = rows[:limit]
+        last = rows[-1]
+        return HistoryPage(rows, (last[5], last[0]))
+
+    # ==================================================
+    # 1-4. 分頁輔助：總筆數、任意位置的游標（虛擬捲動用）
+    # ==================================================
+    def count_records(self, **filters) -> int:
+        source, params = _history_source(filters)
+        with connection() as conn:
+            return conn.execute(f"SELECT COUNT(*) {source}", params).fetchone()[0]
+
+    def cursor_at(self, offset: int, **filters) -> Optional[HistoryCursor]:
+        """
+        回傳「第 offset 筆之前那一筆」的游標，供 get_page(after=...) 從第 offset 筆開始
+        捲軸直接拖到中間時使用；OFFSET 只掃描索引，不讀取資料列
+        """
+        if offset <= 0:
+            return None
+
+        source, params = _history_source(filters)
+        with connection() as conn:
+            row = conn.execute(f"""
+                SELECT dr.drawn_at, dr.id
+                {source}
+                ORDER BY dr.drawn_at DESC, dr.id DESC
+                LIMIT 1 OFFSET ?
+            """, (*params, offset - 1)).fetchone()
+
+        return (row[0], row[1]) if row else None
+
     # ==================================================
     # 2. 依獎項查詢
     # ==================================================
     def get_records_by_prize(self, prize_id: int) -> List[Dict]:
-        conn = get_connection()
-        cursor = conn.cursor()
-
-        cursor.execute("""
-            SELECT
-                dr.id AS record_id,
-                p.name AS participant_name,
-                p.employee_no AS employee_no,
-                dr.drawn_at
-            FROM draw_records dr
-            JOIN draw_sessions ds ON dr.session_id = ds.id
-            JOIN participants p ON dr.participant_id = p.id
-            WHERE ds.prize_id = ?
-            ORDER BY dr.drawn_at DESC
-        """, (prize_id,))
+        with connection() as conn:
+            cursor = conn.cursor()
+
+            cursor.execute("""
+                SELECT
+                    dr.id AS record_id,
+                    p.name AS participant_name,
+                    p.employee_no AS employee_no,
+                    dr.drawn_at
+                FROM draw_records dr
+                JOIN draw_sessions ds ON dr.session_id = ds.id
+                JOIN participants p ON dr.participant_id = p.id
+                WHERE ds.prize_id = ?
+                ORDER BY dr.drawn_at DESC
+            """, (prize_id,))
 
-        rows = cursor.fetchall()
-        conn.close()
+            rows = cursor.fetchall()
 
         return [dict(row) for row in rows]
 
@@ -63,24 +265,23 @@ class LotteryHistoryService:
     # 3. 查詢某一次抽籤（session）
     # ==================================================
     def get_records_by_session(self, session_id: int) -> List[Dict]:
-        conn = get_connection()
-        cursor = conn.cursor()
-
-        cursor.execute("""
-            SELECT
-                p.name AS participant_name,
-                p.employee_no AS employee_no,
-                pr.name AS prize_name,
-                dr.drawn_at
-            FROM draw_records dr
-            JOIN draw_sessions ds ON dr.session_id = ds.id
-            JOIN prizes pr ON ds.prize_id = pr.id
-            JOIN participants p ON dr.participant_id = p.id
-            WHERE dr.session_id = ?
-        """, (session_id,))
+        with connection() as conn:
+            cursor = conn.cursor()
+
+            cursor.execute("""
+                SELECT
+                    p.name AS participant_name,
+                    p.employee_no AS employee_no,
+                    pr.name AS prize_name,
+                    dr.drawn_at
+                FROM draw_records dr
+                JOIN draw_sessions ds ON dr.session_id = ds.id
+                JOIN prizes pr ON ds.prize_id = pr.id
+                JOIN participants p ON dr.participant_id = p.id
+                WHERE dr.session_id = ?
+            """, (session_id,))
 
-        rows = cursor.fetchall()
-        conn.close()
+            rows = cursor.fetchall()
 
         return [dict(row) for row in rows]
 # from typing import List, Dict
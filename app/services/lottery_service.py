@@ -1,8 +1,9 @@
-import random
 import sqlite3
-from typing import List, Dict, Any
+from typing import Any, Dict, Iterator, List, Optional
 
-from app.db.database import get_connection
+from app.core.candidate_pool import CandidatePool
+from app.db.database import connection, transaction
+from app.utils.random_helper import sample_without_replacement
 
 
 class LotteryService:
@@ -11,32 +12,95 @@ class LotteryService:
     - 同一獎項內「絕不重複中獎」
     - 一般獎：中獎即停用 participant
     - 特別獎：不影響 is_active
-    - 每個獎項一個 transaction
+    - 每個獎項一個 transaction（由 DrawSession 逐一包覆）
+    - run_lottery 名單只載入一次（CandidatePool），之後增量移除中獎者；
+      start_session 每次揭曉前重讀名單（兩次揭曉之間可能有人編輯）
+    - 加權抽籤：依 participants.weight 不放回抽樣（weighted=None 時，
+      名單中有人權重不是 1 就自動啟用）
     """
 
     # ==================================================
     # 對外主入口
     # ==================================================
-    def run_lottery(self) -> List[Dict[str, Any]]:
-        conn = get_connection()
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
+    def start_session(
+        self,
+        resume: bool = True,
+        weighted: Optional[bool] = None
+    ) -> "DrawSession":
+        """
+        建立逐獎項抽籤的 session：只讀獎項清單，next() 時才抽下一個獎項並 commit
 
-        cursor.execute("""
-            SELECT id, name, quota, is_special
-            FROM prizes
-            ORDER BY draw_order
-        """)
-        prizes = cursor.fetchall()
+        resume=True：上一輪（draw_runs）還沒抽完時接著抽，本輪已有完成場次
+        （finished_at 不為 NULL）的獎項視為已抽，活動中斷後重開 App 會從下一個
+        未抽的獎項繼續；上一輪已抽完則開始新的一輪（歷史紀錄保留）
+        resume=False：一律開始新的一輪
+        weighted：True 加權 / False 等機率 / None 依名單權重自動判斷
+        """
+        with transaction() as conn:
+            run_id = self._open_run(conn, resume)
+            prizes = conn.execute("""
+                SELECT id, name, quota, is_special
+                FROM prizes p
+                WHERE NOT EXISTS (
+                    SELECT 1
+                    FROM draw_sessions ds
+                    WHERE ds.run_id = ?
+                      AND ds.prize_id = p.id
+                      AND ds.finished_at IS NOT NULL
+                )
+                ORDER BY draw_order
+            """, (run_id,)).fetchall()
+
+        return DrawSession(self, prizes, weighted, live=True, run_id=run_id)
+
+    def run_lottery(
+        self,
+        weighted: Optional[bool] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        依 draw_order 一次抽完所有獎項（新的一輪，不跳過已抽過的）；每個獎項各自 commit
+        """
+        # 一次抽完、中間不會有人編輯名單：候選池只載入一次
+        with transaction() as conn:
+            run_id = self._open_run(conn, resume=False)
+            prizes = conn.execute("""
+                SELECT id, name, quota, is_special
+                FROM prizes
+                ORDER BY draw_order
+            """).fetchall()
+
+        return list(DrawSession(self, prizes, weighted, live=False, run_id=run_id))
 
-        results: List[Dict[str, Any]] = []
+    # ==================================================
+    # 抽籤輪次
+    # ==================================================
+    def _open_run(self, conn: sqlite3.Connection, resume: bool) -> int:
+        """
+        resume 時沿用最近一輪未結束的；否則結束殘留的輪次並開始新的一輪
+        """
+        if resume:
+            row = conn.execute("""
+                SELECT id FROM draw_runs
+                WHERE finished_at IS NULL
+                ORDER BY id DESC
+                LIMIT 1
+            """).fetchone()
+            if row is not None:
+                return row[0]
 
-        for prize in prizes:
-            result = self._draw_for_prize(conn, prize)
-            results.append(result)
+        self._finish_runs(conn)
+        return conn.execute("INSERT INTO draw_runs DEFAULT VALUES").lastrowid
 
-        conn.close()
-        return results
+    def _finish_runs(self, conn: sqlite3.Connection, run_id: Optional[int] = None) -> None:
+        """
+        結束指定輪次（None：所有未結束的輪次）
+        """
+        conn.execute("""
+            UPDATE draw_runs
+            SET finished_at = datetime('now', '+8 hours')
+            WHERE finished_at IS NULL
+              AND (?1 IS NULL OR id = ?1)
+        """, (run_id,))
 
     # ==================================================
     # 單一獎項抽籤
@@ -44,7 +108,10 @@ class LotteryService:
     def _draw_for_prize(
         self,
         conn: sqlite3.Connection,
-        prize: sqlite3.Row
+        prize: sqlite3.Row,
+        pool: CandidatePool,
+        weighted: bool = False,
+        run_id: Optional[int] = None
     ) -> Dict[str, Any]:
 
         cursor = conn.cursor()
@@ -54,87 +121,192 @@ class LotteryService:
         quota = prize["quota"]
         is_special = prize["is_special"]
 
-        try:
-            # ---------- 建立抽籤場次 ----------
-            cursor.execute("""
-                INSERT INTO draw_sessions (prize_id)
-                VALUES (?)
-            """, (prize_id,))
-            session_id = cursor.lastrowid
-
-            # ---------- 取得候選名單 ----------
-            if is_special:
-                cursor.execute("""
-                    SELECT id, name, employee_no
-                    FROM participants
-                """)
-            else:
-                cursor.execute("""
-                    SELECT id, name, employee_no
-                    FROM participants
-                    WHERE is_active = 1
-                """)
-
-            candidates = list(cursor.fetchall())
-
-            if not candidates:
-                conn.commit()
-                return {
-                    "session_id": session_id,
-                    "prize": prize_name,
-                    "is_special": is_special,
-                    "winners": [],
-                    "message": "無可抽名單"
-                }
-
-            # ---------- 抽籤（不重複） ----------
-            remaining = candidates.copy()
-            winners: List[Dict[str, Any]] = []
-
-            while remaining and len(winners) < quota:
-                p = random.choice(remaining)
-                remaining.remove(p)  # ⚠️ 立刻移除，避免重複
-
-                cursor.execute("""
-                    INSERT INTO draw_records (session_id, participant_id, drawn_at)
-                    VALUES (?, ?, datetime('now', '+8 hours'))
-                """, (session_id, p["id"]))
-
-                # 一般獎項 → 停用
-                if not is_special:
-                    cursor.execute("""
-                        UPDATE participants
-                        SET is_active = 0
-                        WHERE id = ?
-                    """, (p["id"],))
-
-                winners.append({
-                    "id": p["id"],
-                    "name": p["name"],
-                    "employee_no": p["employee_no"] or ""
-                })
-
-            # ---------- 結束場次 ----------
-            cursor.execute("""
-                UPDATE draw_sessions
-                SET finished_at = datetime('now', '+8 hours')
-                WHERE id = ?
-            """, (session_id,))
+        # ---------- 建立抽籤場次 ----------
+        cursor.execute("""
+            INSERT INTO draw_sessions (prize_id, run_id)
+            VALUES (?, ?)
+        """, (prize_id, run_id))
+        session_id = cursor.lastrowid
 
-            conn.commit()
+        # ---------- 取得候選名單（記憶體內，不再查表） ----------
+        # 加權抽籤時權重為 0 的人不列入候選
+        candidates = pool.sampler(is_special) if weighted else pool.candidates(is_special)
 
+        if not candidates:
+            self._finish_session(cursor, session_id)
             return {
                 "session_id": session_id,
                 "prize": prize_name,
                 "is_special": is_special,
-                "winners": winners,
-                "message": (
-                    "人數不足，全部中獎"
-                    if len(candidates) < quota
-                    else ""
+                "winners": [],
+                "message": "無可抽名單"
+            }
+
+        # ---------- 抽籤（不重複，O(quota)，先在記憶體完成） ----------
+        if weighted:
+            picked = candidates.sample(quota)
+        else:
+            picked = sample_without_replacement(candidates, quota)
+
+        # ---------- 批次寫入中獎紀錄 ----------
+        cursor.executemany("""
+            INSERT INTO draw_records (session_id, participant_id, drawn_at)
+            VALUES (?, ?, datetime('now', '+8 hours'))
+        """, [(session_id, p["id"]) for p in picked])
+
+        # 一般獎項 → 停用（以本場次的中獎紀錄做單一 set-based UPDATE）
+        if not is_special:
+            cursor.execute("""
+                UPDATE participants
+                SET is_active = 0
+                WHERE id IN (
+                    SELECT participant_id
+                    FROM draw_records
+                    WHERE session_id = ?
                 )
+            """, (session_id,))
+
+        winners: List[Dict[str, Any]] = [
+            {
+                "id": p["id"],
+                "name": p["name"],
+                "employee_no": p["employee_no"] or ""
             }
+            for p in picked
+        ]
+
+        self._finish_session(cursor, session_id)
 
+        return {
+            "session_id": session_id,
+            "prize": prize_name,
+            "is_special": is_special,
+            "winners": winners,
+            "message": (
+                "人數不足，全部中獎"
+                if len(candidates) < quota
+                else ""
+            )
+        }
+
+    # ==================================================
+    # 結束場次（resume 以 finished_at 判斷獎項是否已抽）
+    # ==================================================
+    def _finish_session(self, cursor: sqlite3.Cursor, session_id: int) -> None:
+        cursor.execute("""
+            UPDATE draw_sessions
+            SET finished_at = datetime('now', '+8 hours')
+            WHERE id = ?
+        """, (session_id,))
+
+
+# ==================================================
+# 逐獎項抽籤 session
+# ==================================================
+class DrawSession:
+    """
+    依 draw_order 逐一抽籤的 iterator：
+    - 每次 next() 才抽一個獎項，並在自己的 transaction 內 commit
+    - 名單在抽籤時才載入，尚未揭曉的獎項不花任何成本
+    - live=True（start_session）：兩次揭曉之間可能有人編輯名單 / 獎項，
+      每次 next() 都重讀該獎項（已被刪除則略過）；名單變動計數（roster_version）
+      與候選池不同時才重新載入名單，否則沿用（加權抽樣表也不必重建）
+    - live=False（run_lottery）：名單只載入一次，之後增量移除中獎者
+    - 某個獎項失敗（rollback）時停在原位並丟棄候選池，再次 next() 會重讀後重抽
+    - 最後一個獎項與結束輪次（draw_runs）在同一個 transaction commit
+    - 各步驟可在不同執行緒呼叫（每次借用該執行緒的連線），但不可同時呼叫
+    """
+
+    def __init__(
+        self,
+        service: LotteryService,
+        prizes: List[sqlite3.Row],
+        weighted: Optional[bool] = None,
+        live: bool = True,
+        run_id: Optional[int] = None
+    ):
+        self._service = service
+        self._run_id = run_id
+        self._prizes = prizes
+        self._index = 0
+        self._pool: Optional[CandidatePool] = None
+        self._requested_weighted = weighted
+        self._weighted = weighted
+        self._live = live
+
+    @property
+    def weighted(self) -> Optional[bool]:
+        """
+        是否加權抽籤；自動判斷時在載入名單後才確定（live 模式每次重新判斷）
+        """
+        return self._weighted
+
+    @property
+    def remaining(self) -> int:
+        """
+        尚未抽出的獎項數
+        """
+        return len(self._prizes) - self._index
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return self
+
+    def __next__(self) -> Dict[str, Any]:
+        while True:
+            if self._index >= len(self._prizes):
+                self._finish_run()
+                raise StopIteration
+
+            prize = self._prizes[self._index]
+            if self._live or self._pool is None:
+                with connection() as conn:
+                    if self._live:
+                        prize = conn.execute("""
+                            SELECT id, name, quota, is_special
+                            FROM prizes
+                            WHERE id = ?
+                        """, (prize["id"],)).fetchone()
+                    if prize is not None and (
+                        self._pool is None
+                        or self._pool.version != CandidatePool.current_version(conn)
+                    ):
+                        self._pool = CandidatePool.load(conn)
+
+            if prize is not None:
+                break
+            # 揭曉前獎項已被刪除
+            self._index += 1
+
+        if self._requested_weighted is None:
+            self._weighted = self._pool.has_weights
+
+        # 每個獎項一個 transaction（失敗自動 rollback）
+        try:
+            with transaction() as conn:
+                before = CandidatePool.current_version(conn)
+                result = self._service._draw_for_prize(
+                    conn, prize, self._pool, self._weighted, self._run_id
+                )
+                after = CandidatePool.current_version(conn)
+                if self._run_id is not None and self._index + 1 >= len(self._prizes):
+                    self._service._finish_runs(conn, self._run_id)
         except Exception:
-            conn.rollback()
+            # 候選池可能已與資料庫不一致，重試時重新載入
+            self._pool = None
             raise
+
+        # commit 成功後才把一般獎中獎者移出候選池
+        if not prize["is_special"]:
+            self._pool.remove(w["id"] for w in result["winners"])
+        # 名單只被本獎項停用中獎者改過 → 候選池已同步，計數跟著前進；
+        # 載入後到抽籤前有人編輯過則作廢，下次重新載入
+        self._pool.version = after if before == self._pool.version else None
+
+        self._index += 1
+        return result
+
+    def _finish_run(self) -> None:
+        # 沒有獎項、或最後幾個獎項已被刪除時，輪次在這裡結束
+        if self._run_id is not None:
+            with transaction() as conn:
+                self._service._finish_runs(conn, self._run_id)
@@ -1,183 +1,778 @@
 import sqlite3
-from typing import List, Tuple
+import threading
+from contextlib import contextmanager
+from hashlib import blake2b
+from itertools import islice
+from typing import Callable, Iterable, Iterator, List, NamedTuple, Optional, Tuple
 
-from app.db.database import get_connection
+from app.db.database import connection, transaction
+from app.db.migrations import (
+    PARTICIPANT_FTS_TRIGGERS,
+    ROSTER_VERSION_TRIGGERS,
+    fts5_trigram_available,
+)
+from app.utils.csv_loader import iter_csv_participants
+from app.utils.excel_loader import ParticipantRow, iter_excel_participants
+
+# 匯入時每批 executemany 的筆數（記憶體上限約為一批的大小）
+IMPORT_CHUNK_SIZE = 5000
+
+# 單一 transaction 寫入的列數達此門檻、且達現有名單的 1 / BULK_TRIGGER_RATIO 時，
+# 暫停逐列 trigger（FTS、名單變動計數），結束前整表 rebuild / 計數加一一次
+# （逐列 FTS trigger 在 50 萬筆時慢十幾倍）
+BULK_TRIGGER_MIN_ROWS = IMPORT_CHUNK_SIZE
+BULK_TRIGGER_RATIO = 10
+
+
+# 參數為 ParticipantRow (name, employee_no, weight)；weight 為 NULL 時用預設 1
+_INSERT_SQL = """
+    INSERT INTO participants (name, employee_no, weight)
+    VALUES (?1, ?2, coalesce(?3, 1))
+"""
+
+# employee_no 已存在 → 只更新姓名與有給的權重（不動 is_active，已中獎者維持停用）
+_UPSERT_SQL = """
+    INSERT INTO participants (name, employee_no, weight)
+    VALUES (?1, ?2, coalesce(?3, 1))
+    ON CONFLICT (employee_no) WHERE employee_no IS NOT NULL
+    DO UPDATE SET name = excluded.name, weight = coalesce(?3, participants.weight)
+"""
+
+
+# 批次操作選取筆數超過此值改用暫存表 JOIN（避免 IN (...) 參數過多）
+BULK_TEMP_TABLE_THRESHOLD = 500
+
+# 搜尋結果預設上限
+SEARCH_LIMIT = 200
+
+# 名單畫面用的欄位
+_ROW_COLUMNS = "id, name, employee_no, is_active, created_at"
+
+
+class ImportCancelled(Exception):
+    """
+    匯入被使用者取消（transaction 已 rollback）
+    """
+
+
+class ImportResult(NamedTuple):
+    """
+    匯入結果：新增 / 更新 / 略過（檔案內重複或資料未變動）筆數
+    """
+    inserted: int
+    updated: int
+    skipped: int
+
+    @property
+    def total(self) -> int:
+        return self.inserted + self.updated + self.skipped
+
+
+class RosterDiff(NamedTuple):
+    """
+    名單同步差異：
+    - added：新名單有、資料庫沒有 → (name, employee_no, weight)
+    - renamed：同一人姓名變動 → (id, 舊姓名, 新姓名)
+    - reweighted：同一人抽籤權重變動 → (id, 舊權重, 新權重)
+      （新名單沒有 weight 欄位或該格空白時視為不變）
+    - removed：資料庫有、新名單沒有 → (id, name, employee_no)
+      已有中獎紀錄者改為停用（保留歷史），其餘直接刪除
+    - unchanged：未變動筆數
+    """
+    added: List[ParticipantRow]
+    renamed: List[Tuple[int, str, str]]
+    reweighted: List[Tuple[int, float, float]]
+    removed: List[Tuple[int, str, Optional[str]]]
+    unchanged: int
+
+    @property
+    def changes(self) -> int:
+        return (
+            len(self.added) + len(self.renamed)
+            + len(self.reweighted) + len(self.removed)
+        )
+
+
+def normalize_employee_no(employee_no) -> Optional[str]:
+    """
+    員工編號去空白；空字串視為沒有員編（NULL，不受唯一限制）
+    """
+    if employee_no is None:
+        return None
+    return str(employee_no).strip() or None
+
+
+def _roster_key(name: str, employee_no: Optional[str]) -> Tuple[str, str]:
+    # 有員編以員編識別，沒有員編以姓名識別
+    return ("E", employee_no) if employee_no else ("N", name)
+
+
+def _fingerprint(name: str, weight: float) -> bytes:
+    # 比對「同一人資料是否變動」的雜湊指紋（之後新增欄位一併納入）
+    return blake2b(f"{name}\x1f{weight!r}".encode("utf-8"), digest_size=8).digest()
+
+
+def _get_row(conn, pid: int) -> Optional[sqlite3.Row]:
+    return conn.execute(
+        f"SELECT {_ROW_COLUMNS} FROM participants WHERE id = ?", (pid,)
+    ).fetchone()
+
+
+@contextmanager
+def _id_set(conn, ids: Iterable[int]) -> Iterator[Tuple[str, List[int]]]:
+    """
+    選取的 id → (可放進 IN (...) 的 SQL, 參數)
+    少量直接展開參數；大量寫入暫存表再以子查詢 JOIN，用完清空
+    """
+    unique = list(dict.fromkeys(int(i) for i in ids))
+
+    if len(unique) <= BULK_TEMP_TABLE_THRESHOLD:
+        yield ",".join("?" * len(unique)) or "NULL", unique
+        return
+
+    conn.execute(
+        "CREATE TEMP TABLE IF NOT EXISTS _bulk_ids (id INTEGER PRIMARY KEY)"
+    )
+    conn.executemany(
+        "INSERT OR IGNORE INTO _bulk_ids (id) VALUES (?)",
+        ((i,) for i in unique)
+    )
+    try:
+        yield "SELECT id FROM temp._bulk_ids", []
+    finally:
+        conn.execute("DELETE FROM temp._bulk_ids")
+
+
+def _has_search_index(conn) -> bool:
+    # 目前的 SQLite 不支援 trigram 時，即使表還在也不能查（啟動時已移除其 trigger）
+    if not fts5_trigram_available():
+        return False
+    return conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'participants_fts'"
+    ).fetchone() is not None
+
+
+class _BulkTriggers:
+    """
+    大量寫入 participants 時暫停逐列 trigger，finish() 時重建 trigger、
+    FTS rebuild 一次、名單變動計數加一；少量寫入照常走 trigger（整表 rebuild 反而較慢）
+    DROP / CREATE TRIGGER 與寫入在同一個 transaction，rollback 時一併還原
+    """
+
+    def __init__(self, conn):
+        self._conn = conn
+        self._written = 0
+        self._suspended = False
+
+        self._triggers = dict(ROSTER_VERSION_TRIGGERS)
+        self._search_index = _has_search_index(conn)
+        if self._search_index:
+            self._triggers.update(PARTICIPANT_FTS_TRIGGERS)
+
+        existing = conn.execute("SELECT count(*) FROM participants").fetchone()[0]
+        self._threshold = max(BULK_TRIGGER_MIN_ROWS, existing // BULK_TRIGGER_RATIO)
+
+    def reserve(self, count: int) -> None:
+        """
+        即將寫入 count 列前呼叫；累計達門檻即移除 trigger
+        """
+        if self._suspended:
+            return
+        self._written += count
+        if self._written >= self._threshold:
+            for name in self._triggers:
+                self._conn.execute(f"DROP TRIGGER IF EXISTS {name}")
+            self._suspended = True
+
+    def finish(self) -> None:
+        if not self._suspended:
+            return
+        for sql in self._triggers.values():
+            self._conn.execute(sql)
+        if self._search_index:
+            self._conn.execute(
+                "INSERT INTO participants_fts (participants_fts) VALUES ('rebuild')"
+            )
+        self._conn.execute("UPDATE roster_version SET version = version + 1")
+        self._suspended = False
+
+
+def _escape_like(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _fts_search(conn, query: str, limit: int) -> List[sqlite3.Row]:
+    # 整串當成一個片語：trigram 下即為子字串比對
+    phrase = '"' + query.replace('"', '""') + '"'
+    return conn.execute(f"""
+        SELECT {_ROW_COLUMNS} FROM participants
+        WHERE id IN (
+            SELECT rowid FROM participants_fts
+            WHERE participants_fts MATCH ?
+            ORDER BY rowid
+            LIMIT ?
+        )
+        ORDER BY id
+    """, (phrase, limit)).fetchall()
+
+
+def _prefix_search(conn, query: str, limit: int) -> List[sqlite3.Row]:
+    # 兩個分支各自沿索引順序取前 limit 筆，寬鬆前綴（如 "E"）也不必全掃
+    upper = query + "\U0010ffff"
+    return conn.execute(f"""
+        SELECT * FROM (
+            SELECT {_ROW_COLUMNS} FROM participants
+            WHERE name >= ? AND name < ?
+            ORDER BY name
+            LIMIT ?
+        )
+        UNION
+        SELECT * FROM (
+            SELECT {_ROW_COLUMNS} FROM participants
+            WHERE employee_no >= ? AND employee_no < ?
+            ORDER BY employee_no
+            LIMIT ?
+        )
+        ORDER BY id
+        LIMIT ?
+    """, (query, upper, limit, query, upper, limit, limit)).fetchall()
+
+
+def _like_search(conn, query: str, limit: int) -> List[sqlite3.Row]:
+    pattern = "%" + _escape_like(query) + "%"
+    return conn.execute(f"""
+        SELECT {_ROW_COLUMNS} FROM participants
+        WHERE name LIKE ? ESCAPE '\\' OR employee_no LIKE ? ESCAPE '\\'
+        ORDER BY id
+        LIMIT ?
+    """, (pattern, pattern, limit)).fetchall()
+
+
+def _fetch_by_ids(conn, ids: List[int], batch: int = 500) -> dict:
+    # 分批 IN (...)，避免超過 SQLite 參數數量上限
+    rows = {}
+    for start in range(0, len(ids), batch):
+        part = ids[start:start + batch]
+        placeholders = ",".join("?" * len(part))
+        for r in conn.execute(
+            f"SELECT id, name, employee_no FROM participants WHERE id IN ({placeholders})",
+            part
+        ):
+            rows[r["id"]] = r
+    return rows
 
 
 class ParticipantService:
     """
     名單管理服務：
     - CRUD
-    - Excel 匯入
+    - Excel / CSV 匯入、名單同步
     - 抽籤狀態控制
     """
 
     # =========================
-    # 新增
+    # 新增（回傳新資料列，畫面只需局部更新）
     # =========================
-    def add(self, name, employee_no=None):
-        conn = get_connection()
-        cur = conn.cursor()
+    def add(self, name, employee_no=None) -> sqlite3.Row:
+        with transaction() as conn:
+            cur = conn.cursor()
 
-        cur.execute("""
-            INSERT INTO participants (name, employee_no)
-            VALUES (?, ?)
-        """, (name, employee_no))
+            cur.execute("""
+                INSERT INTO participants (name, employee_no)
+                VALUES (?, ?)
+            """, (name, normalize_employee_no(employee_no)))
 
-        conn.commit()
-        conn.close()
+            return _get_row(conn, cur.lastrowid)
 
     # =========================
     # 更新
     # =========================
-    def update(self, pid, name, employee_no):
-        conn = get_connection()
-        cur = conn.cursor()
+    def update(self, pid, name, employee_no) -> Optional[sqlite3.Row]:
+        with transaction() as conn:
+            cur = conn.cursor()
 
-        cur.execute("""
-            UPDATE participants
-            SET name = ?, employee_no = ?
-            WHERE id = ?
-        """, (name, employee_no, pid))
+            cur.execute("""
+                UPDATE participants
+                SET name = ?, employee_no = ?
+                WHERE id = ?
+            """, (name, normalize_employee_no(employee_no), pid))
 
-        conn.commit()
-        conn.close()
+            return _get_row(conn, pid)
 
     # =========================
     # 刪除
     # =========================
-    def delete(self, pid):
-        conn = get_connection()
-        cur = conn.cursor()
+    def delete(self, pid) -> bool:
+        """
+        回傳是否真的刪除了一筆
+        """
+        with transaction() as conn:
+            cur = conn.cursor()
 
-        cur.execute("""
-            DELETE FROM participants
-            WHERE id = ?
-        """, (pid,))
+            cur.execute("""
+                DELETE FROM participants
+                WHERE id = ?
+            """, (pid,))
 
-        conn.commit()
-        conn.close()
+            return cur.rowcount > 0
+
+    # =========================
+    # 批次刪除 / 啟用（單一 transaction，set-based）
+    # =========================
+    def delete_many(self, ids: Iterable[int]) -> List[int]:
+        """
+        刪除選取的名單，回傳實際刪除的 id
+        已有中獎紀錄者（FK）保留不刪，以免破壞歷史紀錄
+        """
+        with transaction() as conn, _id_set(conn, ids) as (selected, params):
+            deletable = f"""
+                id IN ({selected})
+                AND NOT EXISTS (
+                    SELECT 1 FROM draw_records
+                    WHERE participant_id = participants.id
+                )
+            """
+            deleted = [
+                r[0] for r in conn.execute(
+                    f"SELECT id FROM participants WHERE {deletable}", params
+                )
+            ]
+            conn.execute(f"DELETE FROM participants WHERE {deletable}", params)
+
+        return deleted
+
+    def set_active_many(self, ids: Iterable[int], active: bool) -> int:
+        """
+        批次設定啟用狀態，回傳實際更新筆數
+        """
+        with transaction() as conn, _id_set(conn, ids) as (selected, params):
+            cur = conn.execute(f"""
+                UPDATE participants
+                SET is_active = ?
+                WHERE id IN ({selected})
+            """, (1 if active else 0, *params))
+
+            return cur.rowcount
 
     def get_all_participants(self):
-        conn = get_connection()
-        conn.row_factory = sqlite3.Row
-        cur = conn.cursor()
-
-        cur.execute("""
-            SELECT
-                id,
-                name,
-                employee_no,
-                is_active,
-                created_at
-            FROM participants
-            ORDER BY id
-        """)
-
-        rows = cur.fetchall()
-        conn.close()
+        with connection() as conn:
+            cur = conn.cursor()
+
+            cur.execute(f"""
+                SELECT {_ROW_COLUMNS}
+                FROM participants
+                ORDER BY id
+            """)
+
+            rows = cur.fetchall()
         return rows
 
-    def set_active(self, participant_id: int, active: bool):
-        conn = get_connection()
-        cur = conn.cursor()
+    def get(self, pid) -> Optional[sqlite3.Row]:
+        with connection() as conn:
+            return _get_row(conn, pid)
 
-        cur.execute("""
-            UPDATE participants
-            SET is_active = ?
-            WHERE id = ?
-        """, (1 if active else 0, participant_id))
+    def set_active(self, participant_id: int, active: bool) -> Optional[sqlite3.Row]:
+        with transaction() as conn:
+            cur = conn.cursor()
+
+            cur.execute("""
+                UPDATE participants
+                SET is_active = ?
+                WHERE id = ?
+            """, (1 if active else 0, participant_id))
+
+            return _get_row(conn, participant_id)
+
+    # =========================
+    # 分頁讀取（名單畫面虛擬捲動用，依 id 排序）
+    # =========================
+    def count_participants(self, active: Optional[bool] = None) -> int:
+        with connection() as conn:
+            if active is None:
+                return conn.execute("SELECT COUNT(*) FROM participants").fetchone()[0]
+            return conn.execute(
+                "SELECT COUNT(*) FROM participants WHERE is_active = ?",
+                (1 if active else 0,)
+            ).fetchone()[0]
+
+    def get_page(self, limit: int = 100, after_id: Optional[int] = None) -> List[sqlite3.Row]:
+        with connection() as conn:
+            return conn.execute(f"""
+                SELECT {_ROW_COLUMNS}
+                FROM participants
+                WHERE id > ?
+                ORDER BY id
+                LIMIT ?
+            """, (after_id if after_id is not None else -1, limit)).fetchall()
+
+    def get_ids(self) -> List[int]:
+        """
+        全部名單的 id（依 id 排序；名單畫面「全選」用，不讀其他欄位）
+        """
+        with connection() as conn:
+            return [r[0] for r in conn.execute("SELECT id FROM participants ORDER BY id")]
+
+    def cursor_at(self, offset: int) -> Optional[int]:
+        """
+        回傳第 offset 筆之前那一筆的 id，供 get_page(after_id=...) 從第 offset 筆開始
+        """
+        if offset <= 0:
+            return None
+
+        with connection() as conn:
+            row = conn.execute("""
+                SELECT id FROM participants
+                ORDER BY id
+                LIMIT 1 OFFSET ?
+            """, (offset - 1,)).fetchone()
+
+        return row[0] if row else None
+
+    # =========================
+    # 搜尋（姓名 / 員工編號）
+    # =========================
+    def search(self, query: str, limit: int = SEARCH_LIMIT) -> List[sqlite3.Row]:
+        """
+        - 3 字以上：FTS5 trigram 子字串搜尋
+        - 1～2 字（中文姓氏、名字）：trigram 無法索引，先取姓名 / 員編前綴（走索引），
+          不足 limit 筆再以 LIKE 子字串補足
+        - SQLite 不支援 FTS5：一律 LIKE 子字串（全表掃描）
+        結果依 id 排序，最多 limit 筆
+        """
+        query = query.strip()
+        if not query or limit <= 0:
+            return []
+
+        with connection() as conn:
+            if len(query) >= 3 and _has_search_index(conn):
+                return _fts_search(conn, query, limit)
+
+            if len(query) >= 3:
+                return _like_search(conn, query, limit)
+
+            rows = {r["id"]: r for r in _prefix_search(conn, query, limit)}
+            if len(rows) < limit:
+                for r in _like_search(conn, query, limit):
+                    rows.setdefault(r["id"], r)
 
-        conn.commit()
-        conn.close()
+        return [rows[pid] for pid in sorted(rows)[:limit]]
 
     # =========================
     # 抽籤相關
     # =========================
     def get_active_participants(self) -> List[Tuple]:
-        conn = get_connection()
-        cursor = conn.cursor()
+        with connection() as conn:
+            cursor = conn.cursor()
 
-        cursor.execute(
-            "SELECT id, name FROM participants WHERE is_active = 1"
-        )
-        rows = cursor.fetchall()
-
-        conn.close()
+            cursor.execute(
+                "SELECT id, name FROM participants WHERE is_active = 1"
+            )
+            rows = cursor.fetchall()
         return rows
 
     def mark_as_selected(self, participant_id: int) -> None:
-        conn = get_connection()
-        cursor = conn.cursor()
+        with transaction() as conn:
+            cursor = conn.cursor()
 
-        cursor.execute(
-            "UPDATE participants SET is_active = 0 WHERE id = ?",
-            (participant_id,)
-        )
-
-        conn.commit()
-        conn.close()
+            cursor.execute(
+                "UPDATE participants SET is_active = 0 WHERE id = ?",
+                (participant_id,)
+            )
 
     def reset_all_participants(self) -> None:
         """
         特別獎用：全部名單重設為可抽
         """
-        conn = get_connection()
-        cursor = conn.cursor()
+        with transaction() as conn:
+            cursor = conn.cursor()
 
-        cursor.execute(
-            "UPDATE participants SET is_active = 1"
-        )
-
-        conn.commit()
-        conn.close()
+            cursor.execute(
+                "UPDATE participants SET is_active = 1"
+            )
 
     # =========================
     # Excel 匯入
     # =========================
-    def import_from_excel(self, file_path: str) -> int:
-    
-    # 從 Excel 匯入 participants
-    # Excel 欄位：
-    # | name | employee_no |
-    
-        try:
-            import openpyxl
-        except ImportError:
-            raise ImportError("請先安裝 openpyxl")
+    def import_from_excel(
+        self,
+        file_path: str,
+        progress: Optional[Callable[[int], None]] = None,
+        chunk_size: int = IMPORT_CHUNK_SIZE,
+        cancel: Optional[threading.Event] = None,
+        mode: str = "upsert"
+    ) -> "ImportResult":
+        """
+        從 Excel 串流匯入 participants（單一 transaction、分批寫入）
+        Excel 欄位（weight 可省略）：
+        | name | employee_no | weight |
 
-        workbook = openpyxl.load_workbook(file_path)
-        sheet = workbook.active
+        progress：每寫入一批呼叫一次，參數為目前已處理筆數
+        cancel：被 set 時於下一批前中止，rollback 並丟出 ImportCancelled
+        mode：upsert（依 employee_no 新增或更新，可重複匯入）/ append（一律新增）
+        """
+        return self._import_rows(
+            iter_excel_participants(file_path), mode, progress, chunk_size, cancel
+        )
 
-        conn = get_connection()
-        cursor = conn.cursor()
+    # =========================
+    # CSV / TSV 匯入
+    # =========================
+    def import_from_csv(
+        self,
+        file_path: str,
+        progress: Optional[Callable[[int], None]] = None,
+        chunk_size: int = IMPORT_CHUNK_SIZE,
+        cancel: Optional[threading.Event] = None,
+        mode: str = "upsert",
+        encoding: Optional[str] = None,
+        delimiter: Optional[str] = None
+    ) -> "ImportResult":
+        """
+        從 CSV / TSV 串流匯入 participants，欄位與 Excel 相同；
+        未指定 encoding 時自動偵測 UTF-8（含 BOM）/ Big5
+        """
+        return self._import_rows(
+            iter_csv_participants(file_path, encoding, delimiter),
+            mode,
+            progress,
+            chunk_size,
+            cancel
+        )
 
-        count = 0
+    def import_from_file(
+        self,
+        file_path: str,
+        progress: Optional[Callable[[int], None]] = None,
+        cancel: Optional[threading.Event] = None,
+        mode: str = "upsert"
+    ) -> "ImportResult":
+        """
+        依副檔名選擇匯入方式（.csv / .tsv / .txt → CSV，其餘 → Excel）
+        """
+        return self._import_rows(
+            self._read_roster(file_path), mode, progress, IMPORT_CHUNK_SIZE, cancel
+        )
 
-        # 讀取 header
-        headers = [cell.value for cell in next(sheet.iter_rows(min_row=1, max_row=1))]
-        header_map = {h: i for i, h in enumerate(headers) if h}
+    def _read_roster(self, file_path: str) -> Iterable[ParticipantRow]:
+        if file_path.lower().endswith((".csv", ".tsv", ".txt")):
+            return iter_csv_participants(file_path)
+        return iter_excel_participants(file_path)
+
+    # =========================
+    # 名單同步（只套用差異）
+    # =========================
+    def sync_from_file(
+        self,
+        file_path: str,
+        dry_run: bool = False,
+        progress: Optional[Callable[[int], None]] = None,
+        cancel: Optional[threading.Event] = None
+    ) -> RosterDiff:
+        """
+        以新名單檔為準同步 participants：
+        串流讀檔、以雜湊指紋比對現有名單，只在單一 transaction 內套用差異
+        dry_run=True 只回傳差異（預覽），不寫入
+        """
+        with transaction() as conn:
+            diff = self._diff_roster(
+                conn, self._read_roster(file_path), progress, cancel
+            )
+            if not dry_run:
+                self._apply_roster_diff(conn, diff)
+
+        return diff
+
+    def _diff_roster(
+        self,
+        conn,
+        rows: Iterable[ParticipantRow],
+        progress: Optional[Callable[[int], None]],
+        cancel: Optional[threading.Event]
+    ) -> RosterDiff:
+        # 現有名單只保留 key → (id, 指紋, 權重)，不把整份資料留在記憶體
+        current = {}
+        for pid, name, employee_no, weight in conn.execute(
+            "SELECT id, name, employee_no, weight FROM participants ORDER BY id"
+        ):
+            current.setdefault(
+                _roster_key(name, employee_no),
+                (pid, _fingerprint(name, weight), weight)
+            )
 
-        if "name" not in header_map:
-            raise ValueError("Excel 必須包含 name 欄位")
+        seen = set()
+        added: List[ParticipantRow] = []
+        renamed_to = {}
+        reweighted = []
+        unchanged = scanned = 0
+
+        for name, employee_no, weight in rows:
+            scanned += 1
+            if scanned % IMPORT_CHUNK_SIZE == 0:
+                if cancel is not None and cancel.is_set():
+                    raise ImportCancelled()
+                if progress:
+                    progress(scanned)
+
+            key = _roster_key(name, employee_no)
+            if key in seen:
+                continue
+            seen.add(key)
 
-        for row in sheet.iter_rows(min_row=2, values_only=True):
-            name = row[header_map["name"]]
-            employee_no = row[header_map.get("employee_no")]
+            entry = current.get(key)
+            if entry is None:
+                added.append((name, employee_no, weight))
+                continue
 
-            if not name:
+            pid, fingerprint, old_weight = entry
+            new_weight = old_weight if weight is None else weight
+            if fingerprint == _fingerprint(name, new_weight):
+                unchanged += 1
                 continue
 
-            cursor.execute(
-                """
-                INSERT INTO participants (name, employee_no)
-                VALUES (?, ?)
-                """,
-                (str(name).strip(), str(employee_no).strip() if employee_no else None)
-            )
-            count += 1
+            # 指紋不同：姓名、權重或兩者變動
+            if fingerprint != _fingerprint(name, old_weight):
+                renamed_to[pid] = name
+            if new_weight != old_weight:
+                reweighted.append((pid, old_weight, new_weight))
+
+        if progress:
+            progress(scanned)
+
+        removed_ids = [pid for key, (pid, _, _) in current.items() if key not in seen]
+
+        # 只有變動的人才回頭查姓名（報表用）
+        before = _fetch_by_ids(conn, list(renamed_to) + removed_ids)
+
+        return RosterDiff(
+            added=added,
+            renamed=[
+                (pid, before[pid]["name"], new_name)
+                for pid, new_name in renamed_to.items()
+            ],
+            reweighted=reweighted,
+            removed=[
+                (pid, before[pid]["name"], before[pid]["employee_no"])
+                for pid in removed_ids
+            ],
+            unchanged=unchanged
+        )
 
-        conn.commit()
-        conn.close()
-        return count
+    def _apply_roster_diff(self, conn, diff: RosterDiff) -> None:
+        bulk = _BulkTriggers(conn)
+        bulk.reserve(
+            len(diff.added) + len(diff.renamed) + len(diff.reweighted) + len(diff.removed)
+        )
+
+        conn.executemany(_UPSERT_SQL, diff.added)
+
+        conn.executemany(
+            "UPDATE participants SET name = ? WHERE id = ?",
+            [(new_name, pid) for pid, _, new_name in diff.renamed]
+        )
+        conn.executemany(
+            "UPDATE participants SET weight = ? WHERE id = ?",
+            [(new_weight, pid) for pid, _, new_weight in diff.reweighted]
+        )
+
+        removed = [(pid,) for pid, _, _ in diff.removed]
+        # 沒有中獎紀錄 → 刪除；有中獎紀錄（FK）→ 停用以保留歷史
+        conn.executemany("""
+            DELETE FROM participants
+            WHERE id = ?
+              AND NOT EXISTS (
+                  SELECT 1 FROM draw_records
+                  WHERE participant_id = participants.id
+              )
+        """, removed)
+        conn.executemany(
+            "UPDATE participants SET is_active = 0 WHERE id = ?", removed
+        )
 
+        bulk.finish()
+
+    def _import_rows(
+        self,
+        rows: Iterable[ParticipantRow],
+        mode: str,
+        progress: Optional[Callable[[int], None]],
+        chunk_size: int,
+        cancel: Optional[threading.Event] = None
+    ) -> "ImportResult":
+        if mode not in ("upsert", "append"):
+            raise ValueError(f"不支援的匯入模式：{mode}")
+
+        rows = iter(rows)
+        inserted = updated = skipped = 0
+
+        with transaction() as conn:
+            bulk = _BulkTriggers(conn)
+
+            if mode == "upsert":
+                # 現有名單載入記憶體做比對：有員編用員編，沒員編用姓名
+                existing = {
+                    r[0]: (r[1], r[2]) for r in conn.execute("""
+                        SELECT employee_no, name, weight
+                        FROM participants
+                        WHERE employee_no IS NOT NULL
+                    """)
+                }
+                nameless = {
+                    r[0] for r in conn.execute("""
+                        SELECT name FROM participants WHERE employee_no IS NULL
+                    """)
+                }
+                seen_keys = set()
+                seen_names = set()
+
+            while True:
+                if cancel is not None and cancel.is_set():
+                    raise ImportCancelled()
+
+                chunk = list(islice(rows, chunk_size))
+                if not chunk:
+                    break
+
+                if mode == "append":
+                    bulk.reserve(len(chunk))
+                    conn.executemany(_INSERT_SQL, chunk)
+                    inserted += len(chunk)
+                else:
+                    writes = []
+
+                    for row in chunk:
+                        name, employee_no, weight = row
+                        # 同一檔案內重複（hash set），以第一次出現為準
+                        if employee_no is None:
+                            if name in seen_names or name in nameless:
+                                skipped += 1
+                                continue
+                            seen_names.add(name)
+                            inserted += 1
+                        else:
+                            if employee_no in seen_keys:
+                                skipped += 1
+                                continue
+                            seen_keys.add(employee_no)
+
+                            current = existing.get(employee_no)
+                            if current is None:
+                                inserted += 1
+                            elif current[0] != name or (
+                                weight is not None and weight != current[1]
+                            ):
+                                updated += 1
+                            else:
+                                skipped += 1
+                                continue
+
+                        writes.append(row)
+
+                    bulk.reserve(len(writes))
+                    conn.executemany(_UPSERT_SQL, writes)
+
+                if progress:
+                    progress(inserted + updated + skipped)
+
+            bulk.finish()
+
+        return ImportResult(inserted, updated, skipped)
@@ -1,59 +1,47 @@
-import sqlite3
-from app.db.database import get_connection
+from app.db.database import connection, transaction
 
 
 class PrizeService:
 
     def get_all(self):
-        conn = get_connection()
-        conn.row_factory = sqlite3.Row
-        cur = conn.cursor()
-
-        cur.execute("""
-            SELECT id, name, quota, draw_order, is_special
-            FROM prizes
-            ORDER BY draw_order
-        """)
-
-        rows = cur.fetchall()
-        conn.close()
+        with connection() as conn:
+            cur = conn.cursor()
+
+            cur.execute("""
+                SELECT id, name, quota, draw_order, is_special
+                FROM prizes
+                ORDER BY draw_order
+            """)
+
+            rows = cur.fetchall()
         return rows
 
     def add(self, name, quota, draw_order, is_special):
-        conn = get_connection()
-        cur = conn.cursor()
-
-        cur.execute("""
-            INSERT INTO prizes (name, quota, draw_order, is_special)
-            VALUES (?, ?, ?, ?)
-        """, (name, quota, draw_order, is_special))
+        with transaction() as conn:
+            cur = conn.cursor()
 
-        conn.commit()
-        conn.close()
+            cur.execute("""
+                INSERT INTO prizes (name, quota, draw_order, is_special)
+                VALUES (?, ?, ?, ?)
+            """, (name, quota, draw_order, is_special))
 
     def update(self, pid, name, quota, draw_order, is_special):
-        conn = get_connection()
-        cur = conn.cursor()
+        with transaction() as conn:
+            cur = conn.cursor()
 
-        cur.execute("""
-            UPDATE prizes
-            SET name = ?, quota = ?, draw_order = ?, is_special = ?
-            WHERE id = ?
-        """, (name, quota, draw_order, is_special, pid))
-
-        conn.commit()
-        conn.close()
+            cur.execute("""
+                UPDATE prizes
+                SET name = ?, quota = ?, draw_order = ?, is_special = ?
+                WHERE id = ?
+            """, (name, quota, draw_order, is_special, pid))
 
     def delete(self, pid):
-        conn = get_connection()
-        cur = conn.cursor()
-
-        cur.execute("""
-            DELETE FROM prizes WHERE id = ?
-        """, (pid,))
+        with transaction() as conn:
+            cur = conn.cursor()
 
-        conn.commit()
-        conn.close()
+            cur.execute("""
+                DELETE FROM prizes WHERE id = ?
+            """, (pid,))
 # from typing import List, Tuple
 # from app.db.database import get_connection
 # import sqlite3
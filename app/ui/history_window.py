@@ -1,10 +1,62 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 from app.services.lottery_history_service import LotteryHistoryService
-import openpyxl
+from app.ui.progress_dialog import ProgressDialog
+from app.ui.virtual_tree import PagedSource
+from app.ui.virtual_tree import VirtualTreeview
 from datetime import datetime
 
 
+class HistoryRowSource(PagedSource):
+    """
+    中獎紀錄分頁來源：依序捲動沿用上一頁的 keyset 游標，
+    直接拖曳捲軸跳頁時才用 cursor_at() 以索引定位
+    """
+
+    def __init__(self, service: LotteryHistoryService, **filters):
+        super().__init__()
+        self.service = service
+        self.filters = filters
+        self._cursors = {}
+
+    def reset(self):
+        super().reset()
+        self._cursors.clear()
+
+    def _count(self) -> int:
+        return self.service.count_records(**self.filters)
+
+    def _load_page(self, index: int):
+        if index == 0:
+            after = None
+        elif index in self._cursors:
+            after = self._cursors[index]
+        else:
+            after = self.service.cursor_at(index * self.page_size, **self.filters)
+            if after is None:
+                return []
+
+        page = self.service.get_page(self.page_size, after=after, **self.filters)
+        if page.next_cursor is not None:
+            self._cursors[index + 1] = page.next_cursor
+
+        return [
+            (
+                str(record_id),
+                (
+                    prize_name,
+                    "是" if is_special else "否",
+                    name,
+                    employee_no or "",
+                    drawn_at
+                ),
+                ("special",) if is_special else ()
+            )
+            for record_id, prize_name, is_special, name, employee_no, drawn_at
+            in page.rows
+        ]
+
+
 class HistoryWindow(tk.Toplevel):
     """
     歷史中獎紀錄視窗
@@ -27,17 +79,19 @@ class HistoryWindow(tk.Toplevel):
 
         export_btn = ttk.Button(
             top_frame,
-            text="匯出 Excel",
+            text="匯出 Excel / CSV",
             command=self.export_to_excel
         )
         export_btn.pack(side=tk.RIGHT)
 
+        # 虛擬捲動：只建立看得到的列，捲動時才分頁讀取
         columns = ("prize", "special", "name", "emp_no", "time")
-        self.tree = ttk.Treeview(
+        self.view = VirtualTreeview(
             self,
-            columns=columns,
-            show="headings"
+            HistoryRowSource(self.history_service),
+            columns
         )
+        self.tree = self.view.tree
 
         self.tree.tag_configure(
             "special",
@@ -56,43 +110,20 @@ class HistoryWindow(tk.Toplevel):
         self.tree.column("emp_no", width=120, anchor="center")
         self.tree.column("time", width=180)
 
-        self.tree.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
-
-        # 捲軸
-        scrollbar = ttk.Scrollbar(
-            self,
-            orient="vertical",
-            command=self.tree.yview
-        )
-        self.tree.configure(yscrollcommand=scrollbar.set)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.view.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
 
     # ==================================================
-    # 資料載入
+    # 資料載入（只計數，列在捲動到時才讀取）
     # ==================================================
     def _load_data(self):
-        records = self.history_service.get_all_records()
-        for row in records:
-            tag = "special" if row["is_special"] else ""
-            self.tree.insert(
-                "",
-                tk.END,
-                values=(
-                    row["prize_name"],
-                    "是" if row["is_special"] else "否",
-                    row["participant_name"],
-                    row.get("employee_no", ""),  # 新增欄位
-                    row["drawn_at"]
-                ),
-                tags=(tag,)
-            )
+        self.view.refresh()
 
     # ==================================================
-    # 匯出 Excel
+    # 匯出 Excel / CSV / JSON Lines（背景執行緒串流寫出）
     # ==================================================
     def export_to_excel(self):
-        records = self.history_service.get_all_records()
-        if not records:
+        # 開窗時已計數，不必為了判斷是否為空再查一次 DB
+        if not self.view.total:
             messagebox.showinfo("提示", "目前沒有中獎紀錄")
             return
 
@@ -101,24 +132,24 @@ class HistoryWindow(tk.Toplevel):
         file_path = filedialog.asksaveasfilename(
             initialfile=default_filename,
             defaultextension=".xlsx",
-            filetypes=[("Excel 檔案", "*.xlsx")]
+            filetypes=[
+                ("Excel 檔案", "*.xlsx"),
+                ("CSV 檔案", "*.csv"),
+                ("JSON Lines", "*.jsonl"),
+            ]
         )
         if not file_path:
             return
 
-        wb = openpyxl.Workbook()
-        ws = wb.active
-        ws.title = "歷史中獎紀錄"
-        ws.append(["獎項", "特別獎", "中獎者", "員工編號", "抽籤時間"])
-
-        for r in records:
-            ws.append([
-                r["prize_name"],
-                "是" if r["is_special"] else "否",
-                r["participant_name"],
-                r.get("employee_no", ""),  # 新增欄位
-                r["drawn_at"]
-            ])
-
-        wb.save(file_path)
-        messagebox.showinfo("完成", "Excel 匯出完成")
+        ProgressDialog(
+            self,
+            "匯出中",
+            worker=lambda progress, cancel: self.history_service.export_records(
+                file_path, progress=progress, cancel=cancel
+            ),
+            on_done=lambda count: messagebox.showinfo(
+                "完成", f"匯出完成，共 {count} 筆"
+            ),
+            on_cancel=lambda: messagebox.showinfo("已取消", "匯出已取消"),
+            on_error=lambda exc: messagebox.showerror("匯出失敗", str(exc))
+        )
@@ -1,16 +1,16 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 from enum import Enum, auto
+import queue
 import sys
+import threading
 from pathlib import Path
 
 from app.services.lottery_service import LotteryService
 from app.services.admin_service import AdminService
+from app.db.database import release_connection
 
-from app.ui.history_window import HistoryWindow
-from app.ui.participants_window import ParticipantsWindow
-from app.ui.prizes_window import PrizesWindow
-from app.ui.special_wheel_window import SpecialWheelWindow
+# 管理視窗與輪盤在第一次開啟時才匯入，登入後主視窗不必等它們載入
 from app.core.lottery_state_machine import LotteryStateMachine, LotteryState
 
 def resource_path(relative_path: str) -> Path:
@@ -22,6 +22,9 @@ def resource_path(relative_path: str) -> Path:
 # 主視窗
 # ==================================================
 class MainWindow:
+    # 背景抽籤結果的輪詢間隔
+    DRAW_POLL_MS = 50
+
     def __init__(self, root: tk.Tk):
         self.root = root
         self.root.title("抽籤系統")
@@ -36,6 +39,14 @@ class MainWindow:
         self._lottery_results = []
         self._current_prize_index = 0
 
+        # 逐獎項抽籤：開始 / 繼續下一個獎項時才在背景執行緒抽一個獎項，
+        # 結果經由 queue 交回主執行緒（after() 輪詢）
+        self._session = None
+        self._draw_queue: "queue.Queue[tuple]" = queue.Queue()
+        self._drawing = False
+        self._awaiting_result = False
+        self._next_result = None
+
         # 動畫
         self._animation_lines = []
         self._animation_index = 0
@@ -76,7 +87,7 @@ class MainWindow:
             .pack(pady=15)
 
         ttk.Button(left, text="名單管理",
-                   command=lambda: ParticipantsWindow(self.root))\
+                   command=self.open_participants)\
             .pack(pady=10)
 
         # 中央控制
@@ -129,6 +140,9 @@ class MainWindow:
         )
         self.status_label.place(x=0, y=570, width=900)
 
+        # 背景抽籤中的提示（抽完才隱藏）
+        self.drawing_bar = ttk.Progressbar(self.root, mode="indeterminate")
+
     # ==================================================
     # 狀態同步
     # ==================================================
@@ -148,7 +162,9 @@ class MainWindow:
             self._lock_ui()
             self.pause_btn.state(["!disabled"])
             self.history_btn.state(["disabled"])
-            self.status_label.config(text="抽籤中...")
+            self.status_label.config(
+                text="抽籤中...（結果計算中）" if self._awaiting_result else "抽籤中..."
+            )
 
         elif self.sm.state == LotteryState.PAUSED:
             self._unlock_ui()
@@ -161,7 +177,8 @@ class MainWindow:
             self.next_btn.state(["!disabled"])
             self.pause_btn.state(["disabled"])
             self.history_btn.state(["disabled"])
-            self.status_label.config(text="請繼續下一個獎項")
+            remaining = self._session.remaining if self._session else 0
+            self.status_label.config(text=f"請繼續下一個獎項（尚餘 {remaining} 個）")
 
         elif self.sm.state == LotteryState.FINISHED:
             self._unlock_ui()
@@ -179,18 +196,11 @@ class MainWindow:
         except ValueError:
             return
 
-        self._lottery_results = LotteryService().run_lottery()
-        if not self._lottery_results:
-            messagebox.showwarning("無資料", "目前沒有可抽的獎項")
-            self.sm.reset()
-            self._refresh_ui()
-            return
-
+        self._lottery_results = []
         self._current_prize_index = 0
+        self._session = None
         self.result_listbox.delete(0, tk.END)
-
-        self._refresh_ui()
-        self._start_next_prize()
+        self._draw_next()
 
 
     def next_prize(self):
@@ -199,9 +209,100 @@ class MainWindow:
         except ValueError:
             return
 
+        self._draw_next()
+
+    def _draw_next(self):
+        """
+        在背景執行緒抽下一個獎項（第一次同時建立 session、載入名單），
+        主執行緒維持 RUNNING 並顯示計算中，結果到了才開始播放
+        """
+        self._awaiting_result = True
+        self._drawing = True
+        self._next_result = None
+        self._refresh_ui()
+        self._show_drawing(True)
+
+        threading.Thread(target=self._draw_worker, daemon=True).start()
+        self.root.after(self.DRAW_POLL_MS, self._poll_draw)
+
+    def _draw_worker(self):
+        """
+        背景執行緒：不碰任何 Tk 物件，只把結果放進 queue
+        """
+        try:
+            if self._session is None:
+                # 本輪已完成的獎項視為已抽：中斷後重開 App 從下一個獎項繼續；
+                # 上一輪已抽完則開始新的一輪
+                self._session = LotteryService().start_session()
+            result = next(self._session, None)
+        except Exception as exc:
+            self._draw_queue.put(("error", exc))
+        else:
+            self._draw_queue.put(("result", result))
+        finally:
+            release_connection()
+
+    def _poll_draw(self):
+        try:
+            kind, payload = self._draw_queue.get_nowait()
+        except queue.Empty:
+            self.root.after(self.DRAW_POLL_MS, self._poll_draw)
+            return
+
+        self._drawing = False
+        self._show_drawing(False)
+
+        if kind == "error":
+            self._awaiting_result = False
+            messagebox.showerror(
+                "抽籤失敗",
+                f"本獎項已復原，可重新抽取：\n{payload}"
+            )
+            # 已揭曉過的獎項保留，回到「繼續下一個獎項」重試；否則回到起點
+            if self.sm.state == LotteryState.PAUSED:
+                self.sm.resume()
+            if self._lottery_results:
+                self.sm.wait_next()
+            else:
+                self.sm.reset()
+            self._refresh_ui()
+            return
+
+        self._next_result = payload
+        # 暫停中先不播放，繼續時由 toggle_pause 接手
+        if self.sm.state == LotteryState.RUNNING:
+            self._on_result_ready()
+
+    def _on_result_ready(self):
+        self._awaiting_result = False
+        result, self._next_result = self._next_result, None
+
+        if result is None:
+            if self._lottery_results:
+                self._finish_lottery()
+            else:
+                messagebox.showwarning("無資料", "目前沒有可抽的獎項（或已全部抽完）")
+                self.sm.reset()
+                self._refresh_ui()
+            return
+
+        self._lottery_results.append(result)
+        self._current_prize_index = len(self._lottery_results) - 1
         self._refresh_ui()
         self._start_next_prize()
 
+    def _show_drawing(self, visible: bool):
+        if visible:
+            self.drawing_bar.place(x=740, y=572, width=150, height=18)
+            self.drawing_bar.start(15)
+        else:
+            self.drawing_bar.stop()
+            self.drawing_bar.place_forget()
+
+    def _finish_lottery(self):
+        self.sm.finish()
+        self._refresh_ui()
+        messagebox.showinfo("完成", "所有獎項已抽完")
 
 
     def _start_next_prize(self):
@@ -210,6 +311,8 @@ class MainWindow:
 
         # === 特別獎 → 輪盤 ===
         if prize.get("is_special") and winners:
+            from app.ui.special_wheel_window import SpecialWheelWindow
+
             SpecialWheelWindow(
                 self.root,
                 items=[w["name"] for w in winners],
@@ -282,14 +385,12 @@ class MainWindow:
             return
 
         if self._animation_index >= len(self._animation_lines):
-            self._current_prize_index += 1
-            if self._current_prize_index >= len(self._lottery_results):
-                self.sm.finish()
-                self._refresh_ui()
-                messagebox.showinfo("完成", "所有獎項已抽完")
-            else:
+            # 下一個獎項要等按下「繼續下一個獎項」才抽
+            if self._session is not None and self._session.remaining:
                 self.sm.wait_next()
                 self._refresh_ui()
+            else:
+                self._finish_lottery()
             return
 
         line = self._animation_lines[self._animation_index]
@@ -320,7 +421,11 @@ class MainWindow:
         self._refresh_ui()
 
         if self.sm.state == LotteryState.RUNNING:
-            self._show_next_line()
+            if not self._awaiting_result:
+                self._show_next_line()
+            elif not self._drawing:
+                # 暫停期間結果已送達
+                self._on_result_ready()
 
 
     # ==================================================
@@ -333,12 +438,25 @@ class MainWindow:
                 "僅能在尚未開始或抽籤完成後查看"
             )
             return
+
+        from app.ui.history_window import HistoryWindow
+
         HistoryWindow(self.root)
 
     def open_prizes(self):
+        from app.ui.prizes_window import PrizesWindow
+
         PrizesWindow(self.root)
 
+    def open_participants(self):
+        from app.ui.participants_window import ParticipantsWindow
+
+        ParticipantsWindow(self.root)
+
     def reset_lottery_results(self):
+        if self._drawing:
+            messagebox.showwarning("操作受限", "抽籤仍在進行中，請稍後再清空")
+            return
         if not messagebox.askyesno("警告", "確定清空所有抽獎資料？"):
             return
         AdminService().reset_lottery_data()
@@ -346,6 +464,7 @@ class MainWindow:
         messagebox.showinfo("完成", "抽獎資料已清空")
 
     def _reset_all(self):
+        self._session = None
         self._lottery_results.clear()
         self._current_prize_index = 0
         self._animation_lines.clear()
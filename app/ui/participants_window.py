@@ -1,30 +1,140 @@
+import sqlite3
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 from app.services.participant_service import ParticipantService
+from app.ui.progress_dialog import ProgressDialog
+from app.ui.virtual_tree import PagedSource
+from app.ui.virtual_tree import VirtualTreeview
+
+
+def _tree_row(row):
+    """
+    participants 資料列 → Treeview 列（iid 即 participant id）
+    """
+    return (
+        str(row["id"]),
+        (
+            row["id"],
+            row["name"],
+            row["employee_no"] or "",
+            "是" if row["is_active"] else "否"
+        ),
+        ()
+    )
+
+
+class ParticipantRowSource(PagedSource):
+    """
+    名單分頁來源：依 id keyset 接續讀取，跳頁時以 cursor_at() 定位
+    """
+
+    def __init__(self, service: ParticipantService):
+        super().__init__()
+        self.service = service
+
+    def _count(self) -> int:
+        return self.service.count_participants()
+
+    def iids(self):
+        return [str(pid) for pid in self.service.get_ids()]
+
+    def _load_page(self, index: int):
+        if index == 0:
+            after_id = None
+        else:
+            # 前一頁已快取就接續它的最後一筆，否則以索引定位
+            previous = self._pages.get(index - 1)
+            if previous and len(previous) == self.page_size:
+                after_id = int(previous[-1][0])
+            else:
+                after_id = self.service.cursor_at(index * self.page_size)
+                if after_id is None:
+                    return []
+
+        return [
+            _tree_row(row)
+            for row in self.service.get_page(self.page_size, after_id=after_id)
+        ]
+
+
+class SearchRowSource(PagedSource):
+    """
+    搜尋結果來源：筆數有上限（SEARCH_LIMIT），一次查完再分頁給 VirtualTreeview
+    """
+
+    def __init__(self, service: ParticipantService, query: str):
+        super().__init__()
+        self.service = service
+        self.query = query
+        self._rows = None
+
+    def reset(self):
+        super().reset()
+        self._rows = None
+
+    def patch(self, row):
+        super().patch(row)
+        for i, cached in enumerate(self._results()):
+            if cached[0] == row[0]:
+                self._rows[i] = row
+
+    def _results(self):
+        if self._rows is None:
+            self._rows = [_tree_row(r) for r in self.service.search(self.query)]
+        return self._rows
+
+    def _count(self) -> int:
+        return len(self._results())
+
+    def iids(self):
+        return [row[0] for row in self._results()]
+
+    def _load_page(self, index: int):
+        start = index * self.page_size
+        return self._results()[start:start + self.page_size]
 
 
 class ParticipantsWindow:
+    # 輸入停頓多久才搜尋（毫秒）
+    SEARCH_DELAY_MS = 250
+
     def __init__(self, parent):
         self.win = tk.Toplevel(parent)
         self.win.title("名單管理")
-        self.win.geometry("750x500")
+        self.win.geometry("900x560")
         self.win.resizable(False, False)
 
         self.service = ParticipantService()
         self.selected_id = None  # 單筆操作用（修改 / 啟用）
+        self._search_job = None
 
         self._build_ui()
         self._load_data()
 
     def _build_ui(self):
-        # ===== TreeView（開啟多選）=====
-        self.tree = ttk.Treeview(
+        # ===== 搜尋（輸入即查，停頓後才送出）=====
+        search_frame = ttk.Frame(self.win)
+        search_frame.pack(fill=tk.X, padx=10, pady=(10, 0))
+
+        ttk.Label(search_frame, text="搜尋姓名 / 員工編號").pack(side=tk.LEFT)
+        self.search_var = tk.StringVar()
+        self.search_var.trace_add("write", lambda *_: self._schedule_search())
+        ttk.Entry(
+            search_frame,
+            textvariable=self.search_var,
+            width=30
+        ).pack(side=tk.LEFT, padx=5)
+
+        # ===== TreeView（開啟多選；虛擬捲動，只建立看得到的列）=====
+        self._roster_source = ParticipantRowSource(self.service)
+        self.view = VirtualTreeview(
             self.win,
+            self._roster_source,
             columns=("id", "name", "employee_no", "active"),
-            show="headings",
             height=15,
             selectmode="extended"  # ⭐ 關鍵：允許多選
         )
+        self.tree = self.view.tree
 
         for col, text, width in [
             ("id", "ID", 50),
@@ -35,8 +145,12 @@ class ParticipantsWindow:
             self.tree.heading(col, text=text)
             self.tree.column(col, width=width, anchor="center")
 
-        self.tree.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
-        self.tree.bind("<<TreeviewSelect>>", self.on_select)
+        self.view.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        # add="+"：VirtualTreeview 先記下選取，on_select 才讀得到捲出畫面的列
+        self.tree.bind("<<TreeviewSelect>>", self.on_select, add="+")
+
+        self.selection_label = ttk.Label(self.win, text="")
+        self.selection_label.pack(anchor="e", padx=10)
 
         # ===== 表單 =====
         form = ttk.Frame(self.win)
@@ -58,29 +172,60 @@ class ParticipantsWindow:
         ttk.Button(btn_frame, text="新增", command=self.add).grid(row=0, column=0, padx=5)
         ttk.Button(btn_frame, text="修改", command=self.update).grid(row=0, column=1, padx=5)
         ttk.Button(btn_frame, text="刪除（可多選）", command=self.delete).grid(row=0, column=2, padx=5)
-        ttk.Button(btn_frame, text="切換啟用", command=self.toggle).grid(row=0, column=3, padx=5)
-        ttk.Button(btn_frame, text="Excel 匯入", command=self.import_excel).grid(row=0, column=4, padx=5)
+        ttk.Button(btn_frame, text="切換啟用（可多選）", command=self.toggle).grid(row=0, column=3, padx=5)
+        ttk.Button(btn_frame, text="全選（目前清單）", command=self.select_all).grid(row=0, column=4, padx=5)
+        ttk.Button(btn_frame, text="Excel / CSV 匯入", command=self.import_excel).grid(row=0, column=5, padx=5)
+        ttk.Button(btn_frame, text="名單同步", command=self.sync_roster).grid(row=0, column=6, padx=5)
 
     def _load_data(self):
+        # 匯入 / 同步等大量變動後才需要整批重讀；單筆操作只局部更新
         self.selected_id = None
-        self.tree.delete(*self.tree.get_children())
-
-        for row in self.service.get_all_participants():
-            self.tree.insert(
-                "",
-                "end",
-                values=(
-                    row["id"],
-                    row["name"],
-                    row["employee_no"],
-                    "是" if row["is_active"] else "否"
-                )
-            )
+        self.view.clear_selection()
+        self._show_selection_count()
+        self.view.refresh()
+
+    # ==================================================
+    # 搜尋
+    # ==================================================
+    def _schedule_search(self):
+        if self._search_job is not None:
+            self.win.after_cancel(self._search_job)
+        self._search_job = self.win.after(self.SEARCH_DELAY_MS, self._run_search)
+
+    def _run_search(self):
+        self._search_job = None
+        self.selected_id = None
+
+        query = self.search_var.get().strip()
+        self.view.set_source(
+            SearchRowSource(self.service, query) if query else self._roster_source
+        )
+        self._show_selection_count()
+
+    # ==================================================
+    # 選取（含捲出畫面的列，由 VirtualTreeview 記住）
+    # ==================================================
+    def select_all(self):
+        # 名單 / 搜尋結果全部選取，批次刪除 / 啟用不必逐頁點選
+        self.view.select_all()
+        self._show_selection_count()
+
+    def _show_selection_count(self):
+        count = len(self.view.selection())
+        self.selection_label.config(text=f"已選取 {count} 筆" if count else "")
+
+    def _selected_ids(self):
+        return sorted(int(iid) for iid in self.view.selection())
 
     def on_select(self, event):
+        self._show_selection_count()
+        if not self.view.selection():
+            self.selected_id = None
+            return
+
+        # 選取的列都捲出畫面時，保留原本的編輯對象
         selected = self.tree.selection()
         if not selected:
-            self.selected_id = None
             return
 
         # ⭐ 只用第一筆做「編輯用途」
@@ -102,68 +247,160 @@ class ParticipantsWindow:
             messagebox.showwarning("錯誤", "姓名不可空白")
             return
 
-        self.service.add(
-            self.name_entry.get().strip(),
-            self.emp_entry.get().strip()
-        )
-        self._load_data()
+        try:
+            row = self.service.add(
+                self.name_entry.get().strip(),
+                self.emp_entry.get().strip()
+            )
+        except sqlite3.IntegrityError:
+            messagebox.showerror("錯誤", "員工編號已存在")
+            return
+
+        if self.view.source is self._roster_source:
+            self.view.append_row(_tree_row(row))
+        else:
+            # 搜尋中：新資料不一定符合條件，重查一次
+            self.view.refresh()
 
     def update(self):
         if not self.selected_id:
             messagebox.showwarning("提示", "請先選擇一筆資料")
             return
 
-        self.service.update(
-            self.selected_id,
-            self.name_entry.get().strip(),
-            self.emp_entry.get().strip()
-        )
-        self._load_data()
+        try:
+            row = self.service.update(
+                self.selected_id,
+                self.name_entry.get().strip(),
+                self.emp_entry.get().strip()
+            )
+        except sqlite3.IntegrityError:
+            messagebox.showerror("錯誤", "員工編號已存在")
+            return
+
+        if row is not None:
+            self.view.update_row(_tree_row(row))
 
     def delete(self):
-        selected_items = self.tree.selection()
-        if not selected_items:
+        ids = self._selected_ids()
+        if not ids:
             messagebox.showwarning("提示", "請至少選擇一筆資料")
             return
 
-        ids = []
-        for item_id in selected_items:
-            values = self.tree.item(item_id, "values")
-            ids.append(values[0])
-
         if not messagebox.askyesno(
             "確認刪除",
             f"確定刪除 {len(ids)} 筆名單？"
         ):
             return
 
-        for pid in ids:
-            self.service.delete(pid)
+        deleted = self.service.delete_many(ids)
 
-        self._load_data()
+        self.selected_id = None
+        self.view.remove_rows([str(pid) for pid in deleted])
+        self._show_selection_count()
+
+        if len(deleted) < len(ids):
+            messagebox.showinfo(
+                "提示",
+                f"{len(ids) - len(deleted)} 筆已有中獎紀錄，未刪除（可改為停用）"
+            )
 
     def toggle(self):
-        if not self.selected_id:
+        ids = self._selected_ids()
+        if not ids:
             messagebox.showwarning("提示", "請先選擇一筆資料")
             return
 
-        selected = self.tree.selection()
-        if not selected:
+        # 多選時全部切換成「第一筆（id 最小）的相反狀態」；第一筆可能不在畫面上
+        first = self.service.get(ids[0])
+        if first is None:
             return
+        active = not first["is_active"]
 
-        item = self.tree.item(selected[0])
-        active = item["values"][3] == "是"
+        if len(ids) == 1:
+            self.view.update_row(_tree_row(self.service.set_active(ids[0], active)))
+            return
 
-        self.service.set_active(self.selected_id, not active)
-        self._load_data()
+        self.service.set_active_many(ids, active)
+        # 捲出畫面的列也變了：清快取重畫目前位置（選取保留）
+        self.view.refresh()
+
+    def _ask_roster_file(self):
+        return filedialog.askopenfilename(
+            filetypes=[
+                ("名單檔案", "*.xlsx *.csv *.tsv"),
+                ("Excel Files", "*.xlsx"),
+                ("CSV / TSV", "*.csv *.tsv"),
+            ]
+        )
 
     def import_excel(self):
-        path = filedialog.askopenfilename(
-            filetypes=[("Excel Files", "*.xlsx")]
-        )
+        path = self._ask_roster_file()
         if not path:
             return
 
-        count = self.service.import_from_excel(path)
-        messagebox.showinfo("完成", f"成功匯入 {count} 筆")
+        # 匯入在背景執行緒進行，取消時整批 rollback
+        ProgressDialog(
+            self.win,
+            "名單匯入中",
+            worker=lambda progress, cancel: self.service.import_from_file(
+                path, progress=progress, cancel=cancel
+            ),
+            on_done=self._on_import_done,
+            on_cancel=lambda: messagebox.showinfo("已取消", "匯入已取消，名單未變動"),
+            on_error=lambda exc: messagebox.showerror("匯入失敗", str(exc))
+        )
+
+    def _on_import_done(self, result):
+        messagebox.showinfo(
+            "完成",
+            f"新增 {result.inserted} 筆、更新 {result.updated} 筆、"
+            f"略過 {result.skipped} 筆"
+        )
         self._load_data()
+
+    # ==================================================
+    # 名單同步：先預覽差異，確認後才套用
+    # ==================================================
+    def sync_roster(self):
+        path = self._ask_roster_file()
+        if not path:
+            return
+
+        ProgressDialog(
+            self.win,
+            "比對名單中",
+            worker=lambda progress, cancel: self.service.sync_from_file(
+                path, dry_run=True, progress=progress, cancel=cancel
+            ),
+            on_done=lambda diff: self._confirm_sync(path, diff),
+            on_error=lambda exc: messagebox.showerror("比對失敗", str(exc))
+        )
+
+    def _confirm_sync(self, path, diff):
+        if not diff.changes:
+            messagebox.showinfo("名單同步", "名單已是最新，沒有需要變動的資料")
+            return
+
+        preview = [f"{old} → {new}" for _, old, new in diff.renamed[:5]]
+        preview += [f"移除 {name}" for _, name, _ in diff.removed[:5]]
+
+        if not messagebox.askyesno(
+            "確認同步",
+            f"新增 {len(diff.added)} 筆、改名 {len(diff.renamed)} 筆、"
+            f"權重變動 {len(diff.reweighted)} 筆、"
+            f"移除 {len(diff.removed)} 筆（已中獎者改為停用）\n\n"
+            + "\n".join(preview)
+            + "\n\n確定套用？"
+        ):
+            return
+
+        ProgressDialog(
+            self.win,
+            "名單同步中",
+            worker=lambda progress, cancel: self.service.sync_from_file(
+                path, progress=progress, cancel=cancel
+            ),
+            on_done=lambda _: self._load_data(),
+            on_cancel=lambda: messagebox.showinfo("已取消", "同步已取消，名單未變動"),
+            on_error=lambda exc: messagebox.showerror("同步失敗", str(exc))
+        )
@@ -0,0 +1,128 @@
+import queue
+import threading
+import time
+import tkinter as tk
+from tkinter import ttk
+from typing import Any, Callable, Optional
+
+from app.db.database import release_connection
+
+
+class ProgressDialog:
+    """
+    背景工作進度視窗：
+    - worker(progress, cancel) 在背景執行緒執行，不卡住 Tk 主執行緒
+    - 進度經由 thread-safe queue 回傳，主執行緒以 after() 輪詢更新
+    - 按「取消」只設定 cancel Event，由 worker 自行中止並 rollback
+    """
+
+    POLL_MS = 100
+
+    def __init__(
+        self,
+        parent,
+        title: str,
+        worker: Callable[[Callable[[int], None], threading.Event], Any],
+        on_done: Callable[[Any], None],
+        on_cancel: Optional[Callable[[], None]] = None,
+        on_error: Optional[Callable[[BaseException], None]] = None,
+        unit: str = "筆"
+    ):
+        self.worker = worker
+        self.on_done = on_done
+        self.on_cancel = on_cancel
+        self.on_error = on_error
+        self.unit = unit
+
+        self._queue: "queue.Queue[tuple]" = queue.Queue()
+        self._cancel = threading.Event()
+        self._started = time.perf_counter()
+
+        self.win = tk.Toplevel(parent)
+        self.win.title(title)
+        self.win.geometry("360x140")
+        self.win.resizable(False, False)
+        self.win.transient(parent)
+        self.win.grab_set()
+        self.win.protocol("WM_DELETE_WINDOW", self.cancel)
+
+        self._build_ui()
+
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        self.win.after(self.POLL_MS, self._poll)
+
+    def _build_ui(self):
+        self.bar = ttk.Progressbar(self.win, mode="indeterminate", length=320)
+        self.bar.pack(pady=(20, 10))
+        self.bar.start(15)
+
+        self.status_label = ttk.Label(self.win, text="處理中...")
+        self.status_label.pack()
+
+        self.cancel_btn = ttk.Button(self.win, text="取消", command=self.cancel)
+        self.cancel_btn.pack(pady=10)
+
+    # ==================================================
+    # 背景執行緒
+    # ==================================================
+    def _run(self):
+        try:
+            result = self.worker(
+                lambda done: self._queue.put(("progress", done)),
+                self._cancel
+            )
+        except BaseException as exc:
+            if self._cancel.is_set():
+                self._queue.put(("cancelled", None))
+            else:
+                self._queue.put(("error", exc))
+        else:
+            self._queue.put(("done", result))
+        finally:
+            release_connection()
+
+    # ==================================================
+    # 主執行緒
+    # ==================================================
+    def cancel(self):
+        self._cancel.set()
+        self.cancel_btn.state(["disabled"])
+        self.status_label.config(text="取消中，正在還原...")
+
+    def _poll(self):
+        try:
+            while True:
+                kind, payload = self._queue.get_nowait()
+
+                if kind == "progress":
+                    self._show_progress(payload)
+                    continue
+
+                self._close()
+                if kind == "done":
+                    self.on_done(payload)
+                elif kind == "cancelled":
+                    if self.on_cancel:
+                        self.on_cancel()
+                elif self.on_error:
+                    self.on_error(payload)
+                return
+        except queue.Empty:
+            pass
+
+        self.win.after(self.POLL_MS, self._poll)
+
+    def _show_progress(self, done: int):
+        if self._cancel.is_set():
+            return
+
+        elapsed = max(time.perf_counter() - self._started, 1e-6)
+        self.status_label.config(
+            text=f"已處理 {done:,} {self.unit}（{done / elapsed:,.0f} {self.unit}/秒）"
+        )
+
+    def _close(self):
+        self.bar.stop()
+        self.win.grab_release()
+        self.win.destroy()
@@ -0,0 +1,299 @@
+import tkinter as tk
+from collections import OrderedDict
+from tkinter import ttk
+from typing import List, Sequence, Set, Tuple
+
+# 一列畫面資料：(iid, values, tags)
+TreeRow = Tuple[str, Sequence, Sequence[str]]
+
+
+# ==================================================
+# 資料來源：固定大小分頁 + LRU 快取
+# ==================================================
+class PagedSource:
+    """
+    VirtualTreeview 的資料來源基底
+    子類實作 _count() 與 _load_page(index)；捲動時只會載入看得到的那幾頁
+    """
+
+    page_size = 200
+    max_pages = 16
+
+    def __init__(self):
+        self._pages: "OrderedDict[int, List[TreeRow]]" = OrderedDict()
+
+    def reset(self):
+        """
+        資料變動後清除快取
+        """
+        self._pages.clear()
+
+    def count(self) -> int:
+        self.reset()
+        return self._count()
+
+    def patch(self, row: TreeRow) -> None:
+        """
+        就地替換已快取的同 iid 列（位置不變的修改不必重新查詢）
+        """
+        for page in self._pages.values():
+            for i, cached in enumerate(page):
+                if cached[0] == row[0]:
+                    page[i] = row
+                    return
+
+    def drop_from(self, offset: int) -> None:
+        """
+        丟棄 offset 之後的快取頁（新增 / 刪除會讓後面的列位移）
+        """
+        first = offset // self.page_size
+        for index in [i for i in self._pages if i >= first]:
+            del self._pages[index]
+
+    def iids(self) -> List[str]:
+        """
+        來源內所有列的 iid（全選用）；子類可改成只查 id 的查詢
+        """
+        return [row[0] for row in self.fetch(0, self.count())]
+
+    def fetch(self, offset: int, limit: int) -> List[TreeRow]:
+        rows: List[TreeRow] = []
+        index = offset // self.page_size
+        start = offset % self.page_size
+
+        while len(rows) < limit:
+            page = self._page(index)
+            rows.extend(page[start:start + limit - len(rows)])
+            if len(page) < self.page_size:
+                break
+            index += 1
+            start = 0
+
+        return rows
+
+    def _page(self, index: int) -> List[TreeRow]:
+        page = self._pages.get(index)
+        if page is None:
+            page = self._load_page(index)
+            self._pages[index] = page
+            if len(self._pages) > self.max_pages:
+                self._pages.popitem(last=False)
+        else:
+            self._pages.move_to_end(index)
+        return page
+
+    def _count(self) -> int:
+        raise NotImplementedError
+
+    def _load_page(self, index: int) -> List[TreeRow]:
+        raise NotImplementedError
+
+
+# ==================================================
+# 虛擬捲動 Treeview
+# ==================================================
+class VirtualTreeview(ttk.Frame):
+    """
+    只建立畫面上看得到的列；捲軸依 source.count() 換算位置，捲動時才向 source 取資料
+    欄位、標題、tag 設定直接操作 self.tree
+
+    重畫會刪掉再建立畫面上的列（Treeview 的選取跟著消失），所以選取的 iid
+    另外記在 self._selected，重畫後再套回；多選操作請用 selection()，
+    不要用 tree.selection()（只有畫面上那幾列）
+    """
+
+    WHEEL_ROWS = 3
+    DEFAULT_ROW_HEIGHT = 20
+    # Shift / Control / Mod1（macOS 的 Command）：延伸或切換選取，不取代
+    EXTEND_SELECTION_MASK = 0x0001 | 0x0004 | 0x0008
+
+    def __init__(self, master, source, columns, **tree_options):
+        super().__init__(master)
+        self.source = source
+        self.total = 0
+        self._offset = 0
+        self._pending = False
+        self._selected: Set[str] = set()
+
+        tree_options.setdefault("show", "headings")
+        self.tree = ttk.Treeview(self, columns=columns, **tree_options)
+
+        self._scrollbar = ttk.Scrollbar(
+            self,
+            orient="vertical",
+            command=self._on_scrollbar
+        )
+        self._scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+        self.tree.bind("<Configure>", lambda e: self._schedule())
+        self.tree.bind("<MouseWheel>", self._on_wheel)
+        self.tree.bind("<Button-4>", lambda e: self.scroll_by(-self.WHEEL_ROWS))
+        self.tree.bind("<Button-5>", lambda e: self.scroll_by(self.WHEEL_ROWS))
+
+        # 其他元件綁 <<TreeviewSelect>> 時請加 add="+"，並可在裡面讀 selection()
+        self.tree.bind("<<TreeviewSelect>>", self._on_select, add="+")
+        self.tree.bind("<Button-1>", self._on_click, add="+")
+        self.tree.bind("<KeyPress-Up>", self._on_key_select, add="+")
+        self.tree.bind("<KeyPress-Down>", self._on_key_select, add="+")
+
+    # ==================================================
+    # 對外操作
+    # ==================================================
+    def refresh(self):
+        """
+        重新計數並重畫目前位置（資料變動後呼叫）
+        """
+        self.total = self.source.count()
+        self._schedule()
+
+    def set_source(self, source):
+        """
+        切換資料來源（例如名單 ↔ 搜尋結果），回到最上方並清除選取
+        """
+        self.source = source
+        self._offset = 0
+        self._selected.clear()
+        self.refresh()
+
+    def selection(self) -> List[str]:
+        """
+        所有選取列的 iid（含捲出畫面的）
+        """
+        return list(self._selected)
+
+    def select_all(self):
+        """
+        選取目前來源的全部列（不必捲到就能批次刪除 / 啟用）
+        """
+        self._selected = set(self.source.iids())
+        self._apply_selection()
+
+    def clear_selection(self):
+        self._selected.clear()
+        self._apply_selection()
+
+    def update_row(self, row: TreeRow):
+        """
+        修改單列：只更新快取與畫面上的該列
+        """
+        self.source.patch(row)
+        iid, values, tags = row
+        if self.tree.exists(iid):
+            self.tree.item(iid, values=values, tags=tags)
+
+    def append_row(self, row: TreeRow):
+        """
+        新增一列到最後（依 id 排序的名單）；畫面停在尾端時直接補上該列
+        """
+        self.total += 1
+        self.source.drop_from(self.total - 1)
+
+        shown = len(self.tree.get_children())
+        if shown <= self._visible_rows() and self._offset + shown == self.total - 1:
+            iid, values, tags = row
+            self.tree.insert("", tk.END, iid=iid, values=values, tags=tags)
+        self._update_scrollbar()
+
+    def remove_rows(self, iids):
+        """
+        移除已刪除的列；畫面上的列直接拿掉，之後的列位移，由下次重畫補上
+        """
+        removed = 0
+        for iid in iids:
+            removed += 1
+            self._selected.discard(iid)
+            if self.tree.exists(iid):
+                self.tree.delete(iid)
+
+        self.total = max(0, self.total - removed)
+        self.source.reset()
+        self._schedule()
+
+    def scroll_to(self, offset: int):
+        self._offset = offset
+        self._schedule()
+
+    def scroll_by(self, rows: int):
+        self.scroll_to(self._offset + rows)
+
+    # ==================================================
+    # 捲動事件
+    # ==================================================
+    def _on_scrollbar(self, action, value, unit=None):
+        if action == "moveto":
+            self.scroll_to(int(float(value) * self.total))
+        elif unit == "pages":
+            self.scroll_by(int(value) * self._visible_rows())
+        else:
+            self.scroll_by(int(value))
+
+    def _on_wheel(self, event):
+        # Windows 每格 120；macOS 為小整數
+        steps = event.delta // 120 if abs(event.delta) >= 120 else event.delta
+        self.scroll_by(-steps * self.WHEEL_ROWS)
+
+    # ==================================================
+    # 選取：畫面上的列以 Treeview 為準，畫面外的保留在 self._selected
+    # ==================================================
+    def _on_select(self, event):
+        # 重畫刪列也會觸發（事件排在重畫之後處理，那時選取已套回）
+        shown = set(self.tree.get_children())
+        self._selected = (self._selected - shown) | set(self.tree.selection())
+
+    def _on_click(self, event):
+        # 一般點選某列會取代選取：先丟掉畫面外的，其餘交給 Treeview 的預設行為
+        if event.state & self.EXTEND_SELECTION_MASK:
+            return
+        if self.tree.identify_region(event.x, event.y) in ("cell", "tree"):
+            self._selected.intersection_update(self.tree.selection())
+
+    def _on_key_select(self, event):
+        # 方向鍵（未按 Shift）同樣是單選
+        if not event.state & self.EXTEND_SELECTION_MASK:
+            self._selected.intersection_update(self.tree.selection())
+
+    def _apply_selection(self):
+        self.tree.selection_set(
+            [iid for iid in self.tree.get_children() if iid in self._selected]
+        )
+
+    # ==================================================
+    # 重畫：拖曳捲軸時同一輪事件只重畫一次
+    # ==================================================
+    def _schedule(self):
+        if not self._pending:
+            self._pending = True
+            self.after_idle(self._render)
+
+    def _visible_rows(self) -> int:
+        style = ttk.Style(self)
+        row_height = int(
+            style.lookup("Treeview", "rowheight") or self.DEFAULT_ROW_HEIGHT
+        )
+        # 完整顯示的列數（扣掉約一列高的標題列）
+        return max(1, self.tree.winfo_height() // row_height - 1)
+
+    def _render(self):
+        self._pending = False
+        visible = self._visible_rows()
+        self._offset = max(0, min(self._offset, self.total - visible))
+
+        # 多取一列填滿底部被截掉的半列
+        rows = self.source.fetch(self._offset, visible + 1) if self.total else []
+
+        self.tree.delete(*self.tree.get_children())
+        for iid, values, tags in rows:
+            self.tree.insert("", tk.END, iid=iid, values=values, tags=tags)
+        self._apply_selection()
+
+        self._update_scrollbar()
+
+    def _update_scrollbar(self):
+        if self.total:
+            self._scrollbar.set(
+                self._offset / self.total,
+                min(1.0, (self._offset + self._visible_rows()) / self.total)
+            )
+        else:
+            self._scrollbar.set(0.0, 1.0)
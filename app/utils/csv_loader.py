@@ -0,0 +1,76 @@
+import codecs
+import csv
+from pathlib import Path
+from typing import Iterator, Optional
+
+from app.utils.excel_loader import ParticipantRow, build_header_map, normalize_rows
+
+# 偵測編碼時讀取的位元組數
+_SAMPLE_SIZE = 64 * 1024
+
+
+def detect_encoding(file_path: str) -> str:
+    """
+    偵測 CSV 編碼：
+    - UTF-8 BOM（Excel「另存 CSV UTF-8」）→ utf-8-sig
+    - UTF-16 BOM → utf-16
+    - 可解成 UTF-8 → utf-8
+    - 其他一律視為 Big5（cp950，台灣 HR 系統常見）
+
+    樣本全是 ASCII 時（例如前幾萬列只有員編與英文名）無法分辨兩者，
+    會繼續往後檢查整個檔案，避免 Big5 檔被判成 utf-8、讀到後段才解碼失敗
+    """
+    with open(file_path, "rb") as f:
+        sample = f.read(_SAMPLE_SIZE)
+
+        if sample.startswith(codecs.BOM_UTF8):
+            return "utf-8-sig"
+        if sample.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+            return "utf-16"
+
+        # final=False：樣本尾端被截斷的多位元組字元不算錯誤
+        decoder = codecs.getincrementaldecoder("utf-8")()
+        try:
+            decoder.decode(sample, final=False)
+            if sample.isascii():
+                for chunk in iter(lambda: f.read(_SAMPLE_SIZE), b""):
+                    decoder.decode(chunk, final=False)
+                    if not chunk.isascii():
+                        break
+            return "utf-8"
+        except UnicodeDecodeError:
+            return "cp950"
+
+
+def detect_delimiter(file_path: str, header_line: str) -> str:
+    """
+    .tsv 或 header 只含 tab 時使用 tab，否則使用逗號
+    """
+    if Path(file_path).suffix.lower() == ".tsv":
+        return "\t"
+    if "\t" in header_line and "," not in header_line:
+        return "\t"
+    return ","
+
+
+def iter_csv_participants(
+    file_path: str,
+    encoding: Optional[str] = None,
+    delimiter: Optional[str] = None
+) -> Iterator[ParticipantRow]:
+    """
+    串流讀取 CSV / TSV 名單（欄位對應與 Excel 匯入相同）
+    | name | employee_no | weight |
+    """
+    encoding = encoding or detect_encoding(file_path)
+
+    with open(file_path, "r", encoding=encoding, newline="") as f:
+        header_line = f.readline()
+        delimiter = delimiter or detect_delimiter(file_path, header_line)
+
+        headers = next(csv.reader([header_line], delimiter=delimiter), None)
+        if headers is None:
+            raise ValueError("CSV 必須包含 name 欄位")
+
+        header_map = build_header_map(headers, source="CSV")
+        yield from normalize_rows(csv.reader(f, delimiter=delimiter), header_map)
@@ -0,0 +1,103 @@
+import math
+from typing import Any, Dict, Iterable, Iterator, Optional, Sequence, Tuple
+
+# 匯入後的一筆名單：(name, employee_no, weight)
+# weight 為 None 代表檔案沒有 weight 欄位或該格空白（新增時用預設 1，更新時保留原值）
+ParticipantRow = Tuple[str, Optional[str], Optional[float]]
+
+
+def build_header_map(
+    headers: Sequence[Any],
+    source: str = "Excel"
+) -> Dict[str, int]:
+    """
+    header 列 → {欄位名稱: 欄位索引}；欄位名稱去空白、不分大小寫
+    其他額外欄位（部門等）保留在 map 中但匯入時忽略
+    """
+    header_map = {
+        str(h).strip().lower(): i
+        for i, h in enumerate(headers)
+        if h is not None and str(h).strip()
+    }
+
+    if "name" not in header_map:
+        raise ValueError(f"{source} 必須包含 name 欄位")
+
+    return header_map
+
+
+def _cell_text(row: Sequence[Any], index: Optional[int]) -> Optional[str]:
+    # read_only 模式下尾端空白儲存格可能不存在，需檢查長度
+    if index is None or index >= len(row):
+        return None
+
+    value = row[index]
+    if value is None:
+        return None
+
+    text = str(value).strip()
+    return text or None
+
+
+def _cell_weight(
+    row: Sequence[Any],
+    index: Optional[int],
+    line: int
+) -> Optional[float]:
+    text = _cell_text(row, index)
+    if text is None:
+        return None
+
+    try:
+        weight = float(text)
+    except ValueError:
+        weight = math.nan
+
+    if not math.isfinite(weight) or weight < 0:
+        raise ValueError(f"第 {line} 列 weight 必須是不小於 0 的數字：{text}")
+    return weight
+
+
+def normalize_rows(
+    rows: Iterable[Sequence[Any]],
+    header_map: Dict[str, int]
+) -> Iterator[ParticipantRow]:
+    """
+    原始資料列 → (name, employee_no, weight)；沒有姓名的列略過
+    weight 欄位可省略（抽籤權重，0 代表不參加加權抽籤）
+    """
+    name_idx = header_map["name"]
+    emp_idx = header_map.get("employee_no")
+    weight_idx = header_map.get("weight")
+
+    # 第 1 列是 header
+    for line, row in enumerate(rows, start=2):
+        name = _cell_text(row, name_idx)
+        if not name:
+            continue
+
+        yield name, _cell_text(row, emp_idx), _cell_weight(row, weight_idx, line)
+
+
+def iter_excel_participants(file_path: str) -> Iterator[ParticipantRow]:
+    """
+    串流讀取 Excel 名單（read_only，記憶體不隨檔案大小成長）
+    Excel 欄位（weight 可省略）：
+    | name | employee_no | weight |
+    """
+    try:
+        import openpyxl
+    except ImportError:
+        raise ImportError("請先安裝 openpyxl")
+
+    workbook = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+
+        headers = next(rows, None)
+        if headers is None:
+            raise ValueError("Excel 必須包含 name 欄位")
+
+        yield from normalize_rows(rows, build_header_map(headers))
+    finally:
+        workbook.close()
@@ -0,0 +1,107 @@
+import csv
+import json
+import os
+import threading
+from typing import Callable, Iterable, List, Optional, Sequence
+
+# 每寫入幾列回報一次進度 / 檢查是否取消
+PROGRESS_EVERY = 1000
+
+
+class ExportCancelled(Exception):
+    """
+    匯出被使用者取消（未完成的檔案已刪除）
+    """
+
+
+def _track(
+    rows: Iterable[Sequence],
+    progress: Optional[Callable[[int], None]],
+    cancel: Optional[threading.Event]
+) -> Iterable[Sequence]:
+    count = 0
+    for row in rows:
+        yield row
+
+        count += 1
+        if count % PROGRESS_EVERY == 0:
+            if cancel is not None and cancel.is_set():
+                raise ExportCancelled()
+            if progress:
+                progress(count)
+
+    if progress:
+        progress(count)
+
+
+def _write_xlsx(path: str, headers: List[str], rows: Iterable[Sequence]) -> None:
+    try:
+        import openpyxl
+    except ImportError:
+        raise ImportError("請先安裝 openpyxl")
+
+    # write_only：逐列寫入暫存檔，不在記憶體保留所有儲存格
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet("歷史中獎紀錄")
+    ws.append(headers)
+    for row in rows:
+        ws.append(list(row))
+    wb.save(path)
+
+
+def _write_csv(path: str, headers: List[str], rows: Iterable[Sequence]) -> None:
+    # utf-8-sig：Excel 直接開啟中文不亂碼
+    with open(path, "w", encoding="utf-8-sig", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(headers)
+        writer.writerows(rows)
+
+
+def _write_jsonl(path: str, headers: List[str], rows: Iterable[Sequence]) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        for row in rows:
+            f.write(json.dumps(dict(zip(headers, row)), ensure_ascii=False))
+            f.write("\n")
+
+
+_WRITERS = {
+    ".xlsx": _write_xlsx,
+    ".csv": _write_csv,
+    ".jsonl": _write_jsonl,
+}
+
+SUPPORTED_FORMATS = tuple(_WRITERS)
+
+
+def export_rows(
+    file_path: str,
+    headers: List[str],
+    rows: Iterable[Sequence],
+    progress: Optional[Callable[[int], None]] = None,
+    cancel: Optional[threading.Event] = None
+) -> int:
+    """
+    串流寫出資料列（依副檔名：.xlsx / .csv / .jsonl），回傳寫出筆數
+    先寫入 .part 暫存檔，完成才改名；取消或失敗時刪除暫存檔
+    """
+    ext = os.path.splitext(file_path)[1].lower()
+    if ext not in _WRITERS:
+        raise ValueError(f"不支援的匯出格式：{ext}")
+
+    written = [0]
+
+    def report(done: int) -> None:
+        written[0] = done
+        if progress:
+            progress(done)
+
+    part_path = file_path + ".part"
+    try:
+        _WRITERS[ext](part_path, headers, _track(rows, report, cancel))
+        os.replace(part_path, file_path)
+    except BaseException:
+        if os.path.exists(part_path):
+            os.remove(part_path)
+        raise
+
+    return written[0]
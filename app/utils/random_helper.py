@@ -0,0 +1,207 @@
+import random
+from typing import (
+    Callable,
+    Dict,
+    Generic,
+    Hashable,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    TypeVar,
+)
+
+T = TypeVar("T")
+
+
+def sample_without_replacement(
+    population: Sequence[T],
+    k: int,
+    rng: Optional[random.Random] = None
+) -> List[T]:
+    """
+    從 population 隨機抽出 k 個不重複元素（順序即抽出順序）
+
+    部分 Fisher–Yates（稀疏交換）：
+    - 只用 dict 記錄被交換過的位置，不複製、不修改 population
+    - 額外時間與空間皆為 O(k)，與 population 大小無關
+    - k 大於 population 時回傳全部（順序隨機）
+    """
+    if k < 0:
+        raise ValueError("k 不可為負數")
+
+    randrange = (rng or random).randrange
+    n = len(population)
+    k = min(k, n)
+
+    # swapped[j] = 虛擬陣列中位置 j 目前存放的原始索引
+    swapped: Dict[int, int] = {}
+    picked: List[T] = []
+
+    for i in range(k):
+        j = randrange(i, n)
+        picked.append(population[swapped.get(j, j)])
+        # 位置 i 之後不會再被讀取，只需把原本 i 的元素搬到 j
+        swapped[j] = swapped.get(i, i)
+
+    return picked
+
+
+# ==================================================
+# 加權抽樣
+# ==================================================
+class AliasTable:
+    """
+    Walker / Vose alias method：依權重抽出索引
+    - 建表 O(n)，之後每抽一次 O(1)（一個亂數 + 一次比較）
+    - 權重不需正規化，但總和必須大於 0
+    """
+
+    def __init__(self, weights: Sequence[float]):
+        n = len(weights)
+        total = float(sum(weights))
+        if n == 0 or total <= 0:
+            raise ValueError("權重總和必須大於 0")
+
+        scaled = [w * n / total for w in weights]
+        prob = [1.0] * n
+        alias = list(range(n))
+
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+
+        while small and large:
+            s = small.pop()
+            g = large.pop()
+            prob[s] = scaled[s]
+            alias[s] = g
+            scaled[g] = (scaled[g] + scaled[s]) - 1.0
+            (small if scaled[g] < 1.0 else large).append(g)
+
+        # 剩下的（含浮點誤差殘留）機率視為 1
+        self._n = n
+        self._prob = prob
+        self._alias = alias
+
+    def __len__(self) -> int:
+        return self._n
+
+    def sample(self, rand: Callable[[], float] = random.random) -> int:
+        # 整數部分選欄、小數部分決定取本身或 alias
+        u = rand() * self._n
+        i = int(u)
+        if i >= self._n:  # random() 極接近 1 時乘法可能進位
+            i = self._n - 1
+        return i if u - i < self._prob[i] else self._alias[i]
+
+
+class WeightedSampler(Generic[T]):
+    """
+    依權重不放回抽樣（逐一抽出，每次機率與剩餘項目的權重成正比）：
+    - 以 AliasTable 抽樣，每抽一位期望 O(1)
+    - 已抽中 / 已移除的項目以拒絕取樣略過；被略過的權重超過一半時
+      以剩餘項目重建 alias table，期望嘗試次數維持在 2 次以內
+    - 權重為 0 的項目永遠不會被抽中，也不計入 len()
+    - remove(keys) 永久移除（例如一般獎中獎者），key 預設為項目本身
+    """
+
+    REBUILD_RATIO = 0.5
+
+    def __init__(
+        self,
+        items: Iterable[T],
+        weights: Iterable[float],
+        key: Optional[Callable[[T], Hashable]] = None
+    ):
+        self._key = key or (lambda item: item)
+        pairs = [(item, float(w)) for item, w in zip(items, weights) if w > 0]
+        self._build([p[0] for p in pairs], [p[1] for p in pairs])
+
+    def _build(self, items: List[T], weights: List[float]) -> None:
+        self._items = items
+        self._weights = weights
+        self._total = float(sum(weights))
+        self._table = AliasTable(weights) if items else None
+        self._position: Optional[Dict[Hashable, int]] = None
+        self._removed: Set[int] = set()
+        self._removed_weight = 0.0
+
+    def __len__(self) -> int:
+        return len(self._items) - len(self._removed)
+
+    def remove(self, keys: Iterable[Hashable]) -> None:
+        if self._position is None:
+            # 只有需要移除時才建 key → 位置的索引
+            self._position = {
+                self._key(item): i for i, item in enumerate(self._items)
+            }
+
+        for k in keys:
+            i = self._position.get(k)
+            if i is None or i in self._removed:
+                continue
+            self._removed.add(i)
+            self._removed_weight += self._weights[i]
+
+        if self._removed and self._removed_weight > self._total * self.REBUILD_RATIO:
+            keep = [i for i in range(len(self._items)) if i not in self._removed]
+            self._build(
+                [self._items[i] for i in keep],
+                [self._weights[i] for i in keep]
+            )
+
+    def sample(self, k: int, rng: Optional[random.Random] = None) -> List[T]:
+        """
+        抽出 k 個不重複項目（順序即抽出順序）；k 大於可抽人數時回傳全部
+        不會移除抽中的項目，需要時由呼叫端 remove()
+        """
+        if k < 0:
+            raise ValueError("k 不可為負數")
+
+        rand = (rng or random).random
+        k = min(k, len(self))
+
+        items, weights, table = self._items, self._weights, self._table
+        excluded = self._removed
+        total = self._total
+        skipped = self._removed_weight
+        taken: Set[int] = set()
+        picked: List[T] = []
+
+        while len(picked) < k:
+            if skipped > total * self.REBUILD_RATIO:
+                # 本次抽樣專用的重建，不影響 sampler 本身
+                keep = [
+                    i for i in range(len(items))
+                    if i not in excluded and i not in taken
+                ]
+                items = [items[i] for i in keep]
+                weights = [weights[i] for i in keep]
+                table = AliasTable(weights)
+                excluded, taken = set(), set()
+                total, skipped = float(sum(weights)), 0.0
+
+            i = table.sample(rand)
+            if i in excluded or i in taken:
+                continue
+            taken.add(i)
+            skipped += weights[i]
+            picked.append(items[i])
+
+        return picked
+
+
+def weighted_sample_without_replacement(
+    population: Sequence[T],
+    weights: Sequence[float],
+    k: int,
+    rng: Optional[random.Random] = None
+) -> List[T]:
+    """
+    依權重從 population 抽出 k 個不重複元素（只抽一次時使用；
+    同一份名單要抽多次請保留 WeightedSampler 以重複使用 alias table）
+    """
+    if len(population) != len(weights):
+        raise ValueError("population 與 weights 長度不同")
+    return WeightedSampler(population, weights).sample(k, rng)
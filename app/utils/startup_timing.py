@@ -0,0 +1,185 @@
+"""
+啟動時間報告（選用）：各模組匯入時間、資料庫準備、第一個畫面出現
+
+啟用方式：
+    LOTTERY_STARTUP_REPORT=1 python -m app.main               # 印到 stderr
+    LOTTERY_STARTUP_REPORT=startup.json python -m app.main    # 寫成 JSON
+
+app.main 需最先匯入本模組，之後的匯入才會被計時；
+未啟用時不安裝匯入掛鉤，mark / finish 皆不做事
+"""
+import importlib.abc
+import json
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+REPORT_TARGET = os.environ.get("LOTTERY_STARTUP_REPORT") or None
+
+# 報告只列出最慢的幾個非 app 模組；app.* 全部列出
+TOP_IMPORTS = 15
+
+_start = time.perf_counter()
+_last = _start
+_phases: List[Tuple[str, float]] = []
+# (模組, 匯入耗時（含其匯入的子模組）)
+_imports: List[Tuple[str, float]] = []
+_finder: Optional["_ImportTimer"] = None
+_finished = False
+
+
+# ==================================================
+# 匯入計時
+# ==================================================
+class _TimedLoader(importlib.abc.Loader):
+    """
+    只在 exec_module 期間代替原 loader，執行完即換回，模組上看不到這一層
+    """
+
+    def __init__(self, loader):
+        self._loader = loader
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        start = time.perf_counter()
+        try:
+            self._loader.exec_module(module)
+        finally:
+            _imports.append((module.__name__, time.perf_counter() - start))
+            module.__loader__ = self._loader
+            if module.__spec__ is not None:
+                module.__spec__.loader = self._loader
+
+
+class _ImportTimer(importlib.abc.MetaPathFinder):
+    def __init__(self):
+        self._local = threading.local()
+
+    def find_spec(self, fullname, path, target=None):
+        # 找 spec 時會再走一次 meta_path，避免遞迴
+        if getattr(self._local, "busy", False):
+            return None
+        self._local.busy = True
+        try:
+            for finder in sys.meta_path:
+                if finder is self or not hasattr(finder, "find_spec"):
+                    continue
+                spec = finder.find_spec(fullname, path, target)
+                if spec is not None:
+                    break
+            else:
+                return None
+        finally:
+            self._local.busy = False
+
+        if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+            spec.loader = _TimedLoader(spec.loader)
+        return spec
+
+
+def install() -> None:
+    global _finder
+    if _finder is None:
+        _finder = _ImportTimer()
+        sys.meta_path.insert(0, _finder)
+
+
+def uninstall() -> None:
+    global _finder
+    if _finder is not None:
+        sys.meta_path.remove(_finder)
+        _finder = None
+
+
+def enabled() -> bool:
+    return REPORT_TARGET is not None
+
+
+# ==================================================
+# 階段
+# ==================================================
+def mark(phase: str) -> None:
+    """
+    記下從上一個 mark（或程式開始）到現在的耗時
+    """
+    global _last
+    if not enabled():
+        return
+    now = time.perf_counter()
+    _phases.append((phase, now - _last))
+    _last = now
+
+
+def on_first_frame(root, phase: str = "first frame") -> None:
+    """
+    事件迴圈開始、第一次閒置重繪完成後記錄階段並輸出報告
+    """
+    if not enabled():
+        return
+
+    def done():
+        mark(phase)
+        finish()
+
+    root.after(0, lambda: root.after_idle(done))
+
+
+# ==================================================
+# 報告
+# ==================================================
+def report() -> Dict[str, Any]:
+    imports = sorted(_imports, key=lambda item: item[1], reverse=True)
+    app_imports = [item for item in imports if item[0].split(".")[0] == "app"]
+    other_imports = [item for item in imports if item[0].split(".")[0] != "app"]
+
+    return {
+        "total_seconds": round(_last - _start, 6),
+        "phases": [
+            {"phase": phase, "seconds": round(seconds, 6)}
+            for phase, seconds in _phases
+        ],
+        "imports": [
+            {"module": name, "seconds": round(seconds, 6)}
+            for name, seconds in app_imports + other_imports[:TOP_IMPORTS]
+        ],
+        "modules_loaded": len(sys.modules),
+    }
+
+
+def _format(data: Dict[str, Any]) -> str:
+    lines = [f"啟動耗時 {data['total_seconds'] * 1000:.1f} ms"]
+    for item in data["phases"]:
+        lines.append(f"  {item['phase']:<24} {item['seconds'] * 1000:8.1f} ms")
+    lines.append(f"模組匯入（含子模組，共載入 {data['modules_loaded']} 個模組）：")
+    for item in data["imports"]:
+        lines.append(f"  {item['module']:<40} {item['seconds'] * 1000:8.1f} ms")
+    return "\n".join(lines)
+
+
+def finish() -> None:
+    """
+    輸出一次報告並移除匯入掛鉤；REPORT_TARGET 為 "1" 時印到 stderr，否則視為 JSON 路徑
+    """
+    global _finished
+    if not enabled() or _finished:
+        return
+    _finished = True
+    uninstall()
+
+    data = report()
+    if REPORT_TARGET == "1":
+        print(_format(data), file=sys.stderr)
+    else:
+        Path(REPORT_TARGET).write_text(
+            json.dumps(data, ensure_ascii=False, indent=2) + "\n",
+            encoding="utf-8"
+        )
+
+
+if enabled():
+    install()
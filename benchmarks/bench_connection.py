@@ -0,0 +1,84 @@
+"""
+連線管理效能比較：每次呼叫都開新連線（舊做法） vs 每執行緒長期連線
+
+執行：
+    python -m benchmarks.bench_connection [--rows 20000] [--ops 2000]
+"""
+import argparse
+import time
+
+from app.db import database
+from app.db.database import get_connection, transaction
+from benchmarks.harness import temp_database
+
+
+def _seed(rows: int) -> None:
+    with transaction() as conn:
+        conn.executemany(
+            "INSERT INTO participants (name, employee_no) VALUES (?, ?)",
+            ((f"員工{i}", f"E{i:06d}") for i in range(rows))
+        )
+
+
+def _legacy_update(pid: int) -> None:
+    # 舊做法：每次開連線、設定 PRAGMA、執行、commit、關閉
+    conn = get_connection()
+    cur = conn.cursor()
+    cur.execute(
+        "UPDATE participants SET is_active = 1 - is_active WHERE id = ?",
+        (pid,)
+    )
+    conn.commit()
+    conn.close()
+
+
+def _pooled_update(pid: int) -> None:
+    with transaction() as conn:
+        conn.execute(
+            "UPDATE participants SET is_active = 1 - is_active WHERE id = ?",
+            (pid,)
+        )
+
+
+def _legacy_select(pid: int) -> None:
+    conn = get_connection()
+    conn.execute("SELECT name FROM participants WHERE id = ?", (pid,)).fetchone()
+    conn.close()
+
+
+def _pooled_select(pid: int) -> None:
+    with database.connection() as conn:
+        conn.execute("SELECT name FROM participants WHERE id = ?", (pid,)).fetchone()
+
+
+def _measure(fn, ops: int, rows: int) -> float:
+    start = time.perf_counter()
+    for i in range(ops):
+        fn(i % rows + 1)
+    return (time.perf_counter() - start) / ops * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--ops", type=int, default=2000)
+    args = parser.parse_args()
+
+    with temp_database() as tmp:
+        _seed(args.rows)
+
+        print(f"rows={args.rows} ops={args.ops}（µs / op）")
+        for label, legacy, pooled in [
+            ("SELECT by id", _legacy_select, _pooled_select),
+            ("UPDATE + commit", _legacy_update, _pooled_update),
+        ]:
+            before = _measure(legacy, args.ops, args.rows)
+            after = _measure(pooled, args.ops, args.rows)
+            print(
+                f"{label:<16} before={before:9.1f}  after={after:9.1f}  "
+                f"x{before / after:5.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+"""
+CSV 名單匯入量測（串流 csv.reader + 分批 executemany）
+
+執行：
+    python -m benchmarks.bench_csv_import [--rows 100000 500000] [--encoding big5]
+"""
+import argparse
+import time
+
+from app.db.database import transaction
+from app.services.participant_service import ParticipantService
+from benchmarks.harness import temp_database
+from benchmarks.synthetic import write_roster_csv
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, nargs="+", default=[100000, 500000])
+    parser.add_argument("--encoding", default="utf-8-sig")
+    args = parser.parse_args()
+
+    with temp_database() as tmp:
+        print(f"encoding={args.encoding}")
+        print("   rows   seconds    rows/s")
+        for rows in args.rows:
+            path = tmp / f"roster_{rows}.csv"
+            write_roster_csv(path, rows, args.encoding)
+
+            with transaction() as conn:
+                conn.execute("DELETE FROM participants")
+
+            start = time.perf_counter()
+            ParticipantService().import_from_csv(str(path))
+            elapsed = time.perf_counter() - start
+
+            print(f"{rows:>7} {elapsed:9.2f} {rows / elapsed:9,.0f}")
+
+
+if __name__ == "__main__":
+    main()
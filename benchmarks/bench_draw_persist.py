@@ -0,0 +1,93 @@
+"""
+中獎寫入效能比較：逐筆 INSERT / UPDATE（舊做法） vs executemany 批次寫入
+
+執行：
+    python -m benchmarks.bench_draw_persist [--winners 1000 10000 100000]
+"""
+import argparse
+import time
+
+from app.db.database import connection, transaction
+from app.services.lottery_service import LotteryService
+from app.utils.random_helper import sample_without_replacement
+from benchmarks.harness import temp_database
+
+
+def _reset(roster: int, quota: int) -> None:
+    with transaction() as conn:
+        conn.execute("DELETE FROM draw_records")
+        conn.execute("DELETE FROM draw_sessions")
+        conn.execute("DELETE FROM prizes")
+        conn.execute("DELETE FROM participants")
+        conn.executemany(
+            "INSERT INTO participants (name, employee_no) VALUES (?, ?)",
+            ((f"員工{i}", f"E{i:07d}") for i in range(roster))
+        )
+        conn.execute(
+            """
+            INSERT INTO prizes (name, quota, draw_order, is_special)
+            VALUES ('大量獎', ?, 1, 0)
+            """,
+            (quota,)
+        )
+
+
+def _legacy_draw() -> None:
+    # 舊做法：每位中獎者各一次 INSERT 與 UPDATE
+    with connection() as conn:
+        prize = conn.execute("SELECT id, quota FROM prizes").fetchone()
+
+    with transaction() as conn:
+        cur = conn.cursor()
+        cur.execute(
+            "INSERT INTO draw_sessions (prize_id) VALUES (?)", (prize["id"],)
+        )
+        session_id = cur.lastrowid
+        candidates = cur.execute(
+            "SELECT id, name, employee_no FROM participants WHERE is_active = 1"
+        ).fetchall()
+
+        for p in sample_without_replacement(candidates, prize["quota"]):
+            cur.execute(
+                """
+                INSERT INTO draw_records (session_id, participant_id, drawn_at)
+                VALUES (?, ?, datetime('now', '+8 hours'))
+                """,
+                (session_id, p["id"])
+            )
+            cur.execute(
+                "UPDATE participants SET is_active = 0 WHERE id = ?",
+                (p["id"],)
+            )
+
+
+def _timed(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--winners", type=int, nargs="+", default=[1000, 10000, 100000]
+    )
+    args = parser.parse_args()
+
+    with temp_database() as tmp:
+        print("winners     before(s)   after(s)   speedup")
+        for winners in args.winners:
+            _reset(winners * 2, winners)
+            before = _timed(_legacy_draw)
+
+            _reset(winners * 2, winners)
+            after = _timed(LotteryService().run_lottery)
+
+            print(
+                f"{winners:>7}  {before:10.3f} {after:10.3f}   "
+                f"x{before / after:5.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
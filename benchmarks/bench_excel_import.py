@@ -0,0 +1,87 @@
+"""
+Excel 名單匯入效能比較：整本載入 + 逐筆 INSERT（舊做法） vs read_only 串流 + 分批 executemany
+
+執行：
+    python -m benchmarks.bench_excel_import [--rows 20000 50000]
+"""
+import argparse
+import time
+import tracemalloc
+from pathlib import Path
+
+import openpyxl
+
+from app.db.database import transaction
+from app.services.participant_service import ParticipantService
+from benchmarks.harness import temp_database
+from benchmarks.synthetic import write_roster_xlsx
+
+
+def _legacy_import(file_path: str) -> int:
+    # 舊做法：整本 workbook 載入記憶體，每列一次 INSERT
+    workbook = openpyxl.load_workbook(file_path)
+    sheet = workbook.active
+
+    headers = [cell.value for cell in next(sheet.iter_rows(min_row=1, max_row=1))]
+    header_map = {h: i for i, h in enumerate(headers) if h}
+
+    count = 0
+    with transaction() as conn:
+        for row in sheet.iter_rows(min_row=2, values_only=True):
+            name = row[header_map["name"]]
+            employee_no = row[header_map.get("employee_no")]
+            if not name:
+                continue
+            conn.execute(
+                "INSERT INTO participants (name, employee_no) VALUES (?, ?)",
+                (str(name).strip(), str(employee_no).strip() if employee_no else None)
+            )
+            count += 1
+    return count
+
+
+def _clear() -> None:
+    with transaction() as conn:
+        conn.execute("DELETE FROM participants")
+
+
+def _measure(fn, path: Path):
+    # 計時與記憶體分開量測，避免 tracemalloc 拖慢計時
+    _clear()
+    start = time.perf_counter()
+    fn(str(path))
+    elapsed = time.perf_counter() - start
+
+    _clear()
+    tracemalloc.start()
+    fn(str(path))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return elapsed, peak / 1024 / 1024
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, nargs="+", default=[20000, 50000])
+    args = parser.parse_args()
+
+    with temp_database() as tmp:
+        print("rows      before(s)  peak(MB)   after(s)  peak(MB)")
+        for rows in args.rows:
+            path = tmp / f"roster_{rows}.xlsx"
+            write_roster_xlsx(path, rows)
+
+            before, before_mem = _measure(_legacy_import, path)
+            after, after_mem = _measure(
+                ParticipantService().import_from_excel, path
+            )
+
+            print(
+                f"{rows:>7}  {before:9.2f} {before_mem:9.1f}  "
+                f"{after:9.2f} {after_mem:9.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""
+歷史紀錄匯出量測：各格式的匯出時間與峰值記憶體（tracemalloc）
+
+執行：
+    python -m benchmarks.bench_history_export [--records 100000]
+"""
+import argparse
+import time
+import tracemalloc
+
+from app.services.lottery_history_service import LotteryHistoryService
+from benchmarks.harness import temp_database
+from benchmarks.synthetic import seed_history
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--records", type=int, default=100000)
+    args = parser.parse_args()
+
+    with temp_database() as tmp:
+        seed_history(args.records)
+
+        service = LotteryHistoryService()
+
+        tracemalloc.start()
+        service.get_all_records()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"records={args.records}")
+        print(f"get_all_records（參考） peak={peak / 1024 / 1024:7.1f} MB")
+
+        for ext in (".csv", ".jsonl", ".xlsx"):
+            path = str(tmp / f"history{ext}")
+
+            start = time.perf_counter()
+            service.export_records(path)
+            elapsed = time.perf_counter() - start
+
+            tracemalloc.start()
+            service.export_records(path)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+            print(f"{ext:<7} {elapsed:7.2f}s  peak={peak / 1024 / 1024:7.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
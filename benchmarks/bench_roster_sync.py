@@ -0,0 +1,60 @@
+"""
+名單同步量測：大名單中只有少量變動時，比對 + 套用差異所需時間
+
+執行：
+    python -m benchmarks.bench_roster_sync [--rows 100000] [--changes 200]
+"""
+import argparse
+import time
+from pathlib import Path
+
+from app.services.participant_service import ParticipantService
+from benchmarks.harness import temp_database
+
+
+def _write_csv(path: Path, rows) -> None:
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        f.write("name,employee_no\n")
+        for name, employee_no in rows:
+            f.write(f"{name},{employee_no}\n")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--changes", type=int, default=200)
+    args = parser.parse_args()
+
+    with temp_database() as tmp:
+        roster = [(f"員工{i}", f"E{i:07d}") for i in range(args.rows)]
+        day_one = tmp / "day1.csv"
+        _write_csv(day_one, roster)
+        ParticipantService().import_from_csv(str(day_one))
+
+        # 三分之一改名、三分之一離職、三分之一新進
+        third = args.changes // 3
+        day_two_rows = (
+            [(f"{n}改", e) for n, e in roster[:third]]
+            + roster[third:args.rows - third]
+            + [(f"新人{i}", f"N{i:07d}") for i in range(args.changes - 2 * third)]
+        )
+        day_two = tmp / "day2.csv"
+        _write_csv(day_two, day_two_rows)
+
+        service = ParticipantService()
+
+        start = time.perf_counter()
+        diff = service.sync_from_file(str(day_two), dry_run=True)
+        preview = time.perf_counter() - start
+
+        start = time.perf_counter()
+        service.sync_from_file(str(day_two))
+        applied = time.perf_counter() - start
+
+        print(f"rows={args.rows} changes={diff.changes}")
+        print(f"dry-run  {preview:6.2f}s")
+        print(f"apply    {applied:6.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""
+名單搜尋量測：大名單下各類查詢（姓氏前綴、名字、員編、查無資料）的回應時間
+
+執行：
+    python -m benchmarks.bench_search [--rows 200000] [--repeat 20]
+"""
+import argparse
+import time
+
+from app.services.participant_service import ParticipantService
+from benchmarks.harness import temp_database
+from benchmarks.synthetic import seed_roster
+
+QUERIES = ["王", "王小", "小明", "陳怡君", "E0123", "E0123456", "查無此人"]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=200000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    with temp_database() as tmp:
+        seed_roster(args.rows)
+
+        service = ParticipantService()
+        print(f"rows={args.rows}")
+        for query in QUERIES:
+            timings = []
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                found = len(service.search(query))
+                timings.append(time.perf_counter() - start)
+            timings.sort()
+            print(
+                f"{query:<10} hits={found:<4} "
+                f"median {timings[len(timings) // 2] * 1000:6.2f} ms  "
+                f"max {timings[-1] * 1000:6.2f} ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
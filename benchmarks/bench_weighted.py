@@ -0,0 +1,45 @@
+"""
+加權抽籤量測：alias table 建表時間與每位中獎者的抽樣時間（純記憶體，不含資料庫）
+
+執行：
+    python -m benchmarks.bench_weighted [--rows 1000000] [--winners 10000 100000 500000]
+"""
+import argparse
+import random
+import time
+
+from app.utils.random_helper import WeightedSampler, sample_without_replacement
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--winners", type=int, nargs="+", default=[10000, 100000, 500000])
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    # 年資 / 出席加權：多數人 1，少數人 2～10
+    weights = [1 if rng.random() < 0.8 else rng.randint(2, 10) for _ in range(args.rows)]
+    items = list(range(args.rows))
+
+    start = time.perf_counter()
+    sampler = WeightedSampler(items, weights)
+    print(f"rows={args.rows}  build alias table {time.perf_counter() - start:.3f} s")
+
+    for k in args.winners:
+        start = time.perf_counter()
+        picked = sampler.sample(k, rng)
+        weighted = time.perf_counter() - start
+
+        start = time.perf_counter()
+        sample_without_replacement(items, k, rng)
+        uniform = time.perf_counter() - start
+
+        print(
+            f"winners={k:<8} weighted {weighted / len(picked) * 1e6:6.2f} µs/人  "
+            f"uniform {uniform / k * 1e6:6.2f} µs/人"
+        )
+
+
+if __name__ == "__main__":
+    main()
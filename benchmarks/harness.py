@@ -0,0 +1,67 @@
+"""
+量測共用工具：每次量測一個全新的暫存資料庫，時間與峰值記憶體分開量
+
+tracemalloc 會拖慢純 Python 迴圈數倍，與計時同時開啟會讓時間失真，
+因此 measure() 以兩次獨立執行分別取得時間與記憶體
+"""
+import gc
+import tempfile
+import time
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Iterator, NamedTuple, Optional
+
+from app.db import database
+
+
+class Measurement(NamedTuple):
+    seconds: float
+    peak_mb: Optional[float]
+
+
+@contextmanager
+def temp_database() -> Iterator[Path]:
+    """
+    建立暫存目錄 + 全新資料庫（已跑完 migration），結束時關閉連線並刪除
+    yield 暫存目錄，可放測試用的匯入檔
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        database.configure(Path(tmp) / "bench.db")
+        try:
+            database.setup_database()
+            yield Path(tmp)
+        finally:
+            database.shutdown()
+            database.configure(None)
+
+
+def measure(
+    setup: Callable[[Path], Any],
+    run: Callable[[Any], Any],
+    memory: bool = True
+) -> Measurement:
+    """
+    setup(暫存目錄) 準備資料（不計時），回傳值交給 run() 量測
+    """
+    with temp_database() as tmp:
+        context = setup(tmp)
+        gc.collect()
+        start = time.perf_counter()
+        run(context)
+        seconds = time.perf_counter() - start
+
+    if not memory:
+        return Measurement(seconds, None)
+
+    with temp_database() as tmp:
+        context = setup(tmp)
+        gc.collect()
+        tracemalloc.start()
+        try:
+            run(context)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+    return Measurement(seconds, peak / 1024 / 1024)
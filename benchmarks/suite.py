@@ -0,0 +1,253 @@
+"""
+效能基準套件：抽籤、名單匯入、歷史紀錄在 1k / 10k / 100k / 1M 名單下的時間與峰值記憶體
+
+每個案例、每個規模都使用全新的暫存資料庫與合成資料（固定 seed），
+結果可與 benchmarks/baseline.json 比較，超過容許範圍即視為退化（結束碼 1）
+
+執行：
+    python -m benchmarks.suite                          # 1k / 10k / 100k，與基準比較
+    python -m benchmarks.suite --sizes 1000000 --cases draw import_csv
+    python -m benchmarks.suite --save-baseline          # 更新基準（換機器或確認改善後）
+"""
+import argparse
+import json
+import platform
+import sqlite3
+import sys
+from datetime import date
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from app.services.lottery_history_service import LotteryHistoryService
+from app.services.lottery_service import LotteryService
+from app.services.participant_service import ParticipantService
+from benchmarks.harness import Measurement, measure
+from benchmarks.synthetic import (
+    prize_plan,
+    seed_history,
+    seed_prizes,
+    seed_roster,
+    write_roster_csv,
+    write_roster_xlsx,
+)
+
+BASELINE_PATH = Path(__file__).with_name("baseline.json")
+DEFAULT_SIZES = [1000, 10000, 100000]
+
+# 低於此差距視為雜訊，不判定退化
+MIN_SECONDS_DELTA = 0.01
+MIN_MB_DELTA = 1.0
+
+
+# ==================================================
+# 案例：(準備資料, 量測對象)；準備階段不計時
+# ==================================================
+def _draw_setup(tmp: Path, size: int) -> None:
+    seed_roster(size)
+    seed_prizes(prize_plan(size))
+
+
+def _history_open(_) -> None:
+    # 開啟歷史視窗：計數 + 第一頁
+    service = LotteryHistoryService()
+    service.count_records()
+    service.get_page(100)
+
+
+CASES: Dict[str, Tuple[Callable[[Path, int], Any], Callable[[Any], Any]]] = {
+    "draw": (
+        _draw_setup,
+        lambda _: LotteryService().run_lottery()
+    ),
+    "import_csv": (
+        lambda tmp, size: write_roster_csv(tmp / "roster.csv", size),
+        lambda path: ParticipantService().import_from_csv(str(path))
+    ),
+    "import_excel": (
+        lambda tmp, size: write_roster_xlsx(tmp / "roster.xlsx", size),
+        lambda path: ParticipantService().import_from_excel(str(path))
+    ),
+    "history_open": (
+        lambda tmp, size: seed_history(size),
+        _history_open
+    ),
+    "history_all": (
+        lambda tmp, size: seed_history(size),
+        lambda _: LotteryHistoryService().get_all_records()
+    ),
+    "history_export": (
+        lambda tmp, size: seed_history(size) or tmp / "history.csv",
+        lambda path: LotteryHistoryService().export_records(str(path))
+    ),
+}
+
+
+def run_case(
+    name: str,
+    size: int,
+    repeat: int = 1,
+    memory: bool = True
+) -> Measurement:
+    """
+    時間取 repeat 次中最快的一次；記憶體只量一次
+    """
+    setup, run = CASES[name]
+    prepare = lambda tmp: setup(tmp, size)  # noqa: E731
+
+    first = measure(prepare, run, memory=memory)
+    seconds = min(
+        [first.seconds]
+        + [measure(prepare, run, memory=False).seconds for _ in range(repeat - 1)]
+    )
+    return Measurement(seconds, first.peak_mb)
+
+
+def run_suite(
+    cases: List[str],
+    sizes: List[int],
+    repeat: int = 1,
+    memory: bool = True,
+    report: Callable[[str, int, Optional[Measurement]], None] = lambda *a: None
+) -> Dict[str, Dict[str, Dict[str, Optional[float]]]]:
+    """
+    回傳 {案例: {規模: {"seconds", "peak_mb"}}}；缺少 openpyxl 的案例略過
+    """
+    results: Dict[str, Dict[str, Dict[str, Optional[float]]]] = {}
+    for name in cases:
+        for size in sizes:
+            try:
+                m = run_case(name, size, repeat, memory)
+            except ImportError:
+                report(name, size, None)
+                continue
+            report(name, size, m)
+            results.setdefault(name, {})[str(size)] = {
+                "seconds": round(m.seconds, 4),
+                "peak_mb": None if m.peak_mb is None else round(m.peak_mb, 2),
+            }
+    return results
+
+
+# ==================================================
+# 基準比較
+# ==================================================
+def compare(
+    results: Dict[str, Dict[str, Dict[str, Optional[float]]]],
+    baseline: Dict[str, Dict[str, Dict[str, Optional[float]]]],
+    tolerance: float
+) -> List[str]:
+    """
+    回傳退化項目的說明；基準沒有的項目不比較
+    """
+    regressions = []
+    for name, by_size in results.items():
+        for size, current in by_size.items():
+            base = baseline.get(name, {}).get(size)
+            if not base:
+                continue
+
+            for key, min_delta, unit in (
+                ("seconds", MIN_SECONDS_DELTA, "s"),
+                ("peak_mb", MIN_MB_DELTA, "MB"),
+            ):
+                now, before = current.get(key), base.get(key)
+                if now is None or before is None:
+                    continue
+                if now > before * (1 + tolerance) and now - before > min_delta:
+                    regressions.append(
+                        f"{name} @ {size}: {key} {before}{unit} → {now}{unit}"
+                    )
+    return regressions
+
+
+def load_baseline(path: Path) -> Dict[str, Any]:
+    if not path.exists():
+        return {"meta": {}, "results": {}}
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def save_baseline(path: Path, results: Dict[str, Any]) -> None:
+    """
+    合併寫入：只跑部分案例 / 規模時，其餘既有基準保留
+    """
+    baseline = load_baseline(path)
+    for name, by_size in results.items():
+        baseline["results"].setdefault(name, {}).update(by_size)
+    baseline["meta"] = _environment()
+    path.write_text(
+        json.dumps(baseline, ensure_ascii=False, indent=2, sort_keys=True) + "\n",
+        encoding="utf-8"
+    )
+
+
+def _environment() -> Dict[str, str]:
+    return {
+        "date": date.today().isoformat(),
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+    }
+
+
+# ==================================================
+# 進入點
+# ==================================================
+def _print_row(name: str, size: int, m: Optional[Measurement]) -> None:
+    if m is None:
+        print(f"{name:<15} {size:>8}   （略過：缺少套件）")
+        return
+    peak = "-" if m.peak_mb is None else f"{m.peak_mb:9.1f}"
+    print(f"{name:<15} {size:>8} {m.seconds:10.3f} {peak:>9}", flush=True)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--cases", nargs="+", choices=sorted(CASES), default=list(CASES))
+    parser.add_argument("--repeat", type=int, default=1, help="計時重複次數，取最快")
+    parser.add_argument("--no-memory", action="store_true", help="不量峰值記憶體（較快）")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--tolerance", type=float, default=0.25, help="容許變慢 / 變大的比例")
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--json", type=Path, help="另存本次結果")
+    args = parser.parse_args(argv)
+
+    print(f"{'case':<15} {'size':>8} {'seconds':>10} {'peak(MB)':>9}")
+    results = run_suite(
+        args.cases,
+        args.sizes,
+        repeat=args.repeat,
+        memory=not args.no_memory,
+        report=_print_row
+    )
+
+    if args.json:
+        args.json.write_text(
+            json.dumps(
+                {"meta": _environment(), "results": results},
+                ensure_ascii=False,
+                indent=2
+            ) + "\n",
+            encoding="utf-8"
+        )
+
+    if args.save_baseline:
+        save_baseline(args.baseline, results)
+        print(f"基準已更新：{args.baseline}")
+        return 0
+
+    baseline = load_baseline(args.baseline)
+    regressions = compare(results, baseline["results"], args.tolerance)
+    if regressions:
+        print(f"\n效能退化（容許 {args.tolerance:.0%}，基準 {baseline['meta'].get('date', '?')}）：")
+        for line in regressions:
+            print(f"  {line}")
+        return 1
+
+    print("\n未發現退化" if baseline["results"] else "\n尚無基準（--save-baseline 建立）")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
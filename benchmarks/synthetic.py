@@ -0,0 +1,103 @@
+"""
+合成測試資料：名單、獎項、中獎紀錄、匯入檔
+
+以固定 seed 產生，同樣的參數每次得到同樣的資料
+"""
+import random
+from pathlib import Path
+from typing import Iterator, List, Tuple
+
+from app.db.database import transaction
+
+SURNAMES = "王李張劉陳楊黃趙吳周徐孫馬朱胡郭何高林羅鄭梁謝宋唐許韓馮鄧曹"
+GIVEN = "小明華美玲志偉家豪怡君淑芬建宏俊傑雅婷宗翰信德惠文佳慧冠廷詩涵"
+
+# (獎項名稱, 每多少人一名, 是否特別獎)；合計約 7.6% 的人中獎
+PRIZE_TIERS = [
+    ("頭獎", 1000, 0),
+    ("二獎", 200, 0),
+    ("三獎", 50, 0),
+    ("參加獎", 20, 0),
+    ("特別獎", 0, 1),
+]
+
+PrizeRow = Tuple[str, int, int, int]
+
+
+def roster(size: int, seed: int = 42) -> Iterator[Tuple[str, str]]:
+    """
+    (姓名, 員工編號)：姓名可能重複（同名同姓），員編唯一
+    """
+    rng = random.Random(seed)
+    for i in range(size):
+        name = rng.choice(SURNAMES) + rng.choice(GIVEN) + rng.choice(GIVEN)
+        yield name, f"E{i:07d}"
+
+
+def prize_plan(participants: int) -> List[PrizeRow]:
+    """
+    依名單人數配置獎項 (name, quota, draw_order, is_special)；特別獎 1 名
+    """
+    plan = []
+    for order, (name, per, is_special) in enumerate(PRIZE_TIERS, start=1):
+        quota = 1 if is_special else max(1, participants // per)
+        plan.append((name, quota, order, is_special))
+    return plan
+
+
+def seed_roster(size: int, seed: int = 42) -> None:
+    with transaction() as conn:
+        conn.executemany(
+            "INSERT INTO participants (name, employee_no) VALUES (?, ?)",
+            roster(size, seed)
+        )
+
+
+def seed_prizes(plan: List[PrizeRow]) -> None:
+    with transaction() as conn:
+        conn.executemany(
+            "INSERT INTO prizes (name, quota, draw_order, is_special) VALUES (?, ?, ?, ?)",
+            plan
+        )
+
+
+def seed_history(records: int, seed: int = 42) -> None:
+    """
+    records 人的名單，每人一筆中獎紀錄（單一場次，每筆間隔一秒）
+    """
+    seed_roster(records, seed)
+    with transaction() as conn:
+        conn.execute(
+            "INSERT INTO prizes (id, name, quota, draw_order) VALUES (1, '參加獎', 1, 1)"
+        )
+        conn.execute("INSERT INTO draw_sessions (id, prize_id) VALUES (1, 1)")
+        conn.execute("""
+            INSERT INTO draw_records (session_id, participant_id, drawn_at)
+            SELECT 1, id, datetime('2024-01-01', '+' || id || ' seconds')
+            FROM participants
+        """)
+
+
+def write_roster_csv(
+    path: Path,
+    size: int,
+    encoding: str = "utf-8-sig",
+    seed: int = 42
+) -> Path:
+    with open(path, "w", encoding=encoding, newline="") as f:
+        f.write("name,employee_no,dept\n")
+        for name, employee_no in roster(size, seed):
+            f.write(f"{name},{employee_no},資訊部\n")
+    return path
+
+
+def write_roster_xlsx(path: Path, size: int, seed: int = 42) -> Path:
+    import openpyxl
+
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet()
+    ws.append(["name", "employee_no", "dept"])
+    for name, employee_no in roster(size, seed):
+        ws.append([name, employee_no, "IT"])
+    wb.save(path)
+    return path
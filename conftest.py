@@ -1,6 +1,58 @@
 import sys
 from pathlib import Path
 
+import pytest
+
 # 將專案根目錄加入 Python module 搜尋路徑
 ROOT_DIR = Path(__file__).resolve().parent
 sys.path.insert(0, str(ROOT_DIR))
+
+
+@pytest.fixture(autouse=True)
+def isolated_database(tmp_path):
+    """
+    每個測試使用獨立的暫存資料庫，避免動到使用者的 lottery.db
+    """
+    from app.db import database
+
+    database.configure(tmp_path / "lottery.db")
+    database.setup_database()
+    yield tmp_path / "lottery.db"
+    database.configure(None)
+
+
+# ==================================================
+# 名單測試共用
+# ==================================================
+@pytest.fixture
+def participants():
+    """
+    回傳函式：目前名單的 (name, employee_no)，依 id 排序
+    """
+    from app.db.database import connection
+
+    def load():
+        with connection() as conn:
+            return [
+                (r["name"], r["employee_no"])
+                for r in conn.execute(
+                    "SELECT name, employee_no FROM participants ORDER BY id"
+                )
+            ]
+
+    return load
+
+
+@pytest.fixture
+def write_csv():
+    """
+    回傳函式：write_csv(path, [(name, employee_no), ...]) 寫出 UTF-8 名單 CSV，回傳路徑字串
+    """
+    def write(path, rows):
+        path.write_text(
+            "name,employee_no\n" + "".join(f"{n},{e or ''}\n" for n, e in rows),
+            encoding="utf-8"
+        )
+        return str(path)
+
+    return write
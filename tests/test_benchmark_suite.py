@@ -0,0 +1,56 @@
+import json
+
+from benchmarks import suite
+from benchmarks.synthetic import prize_plan, roster
+
+
+def test_synthetic_data_is_reproducible():
+    assert list(roster(50)) == list(roster(50))
+    assert len({emp for _, emp in roster(1000)}) == 1000
+
+    plan = prize_plan(100000)
+    assert [p[1] for p in plan] == [100, 500, 2000, 5000, 1]
+    assert [p[3] for p in plan] == [0, 0, 0, 0, 1]
+    assert all(quota >= 1 for _, quota, _, _ in prize_plan(10))
+
+
+def test_every_case_runs_on_a_tiny_roster():
+    results = suite.run_suite(list(suite.CASES), [50])
+
+    # import_excel 在沒有 openpyxl 的環境會略過
+    assert set(suite.CASES) - set(results) <= {"import_excel"}
+    for by_size in results.values():
+        assert by_size["50"]["seconds"] >= 0
+        assert by_size["50"]["peak_mb"] is not None
+
+
+def test_compare_flags_only_meaningful_regressions():
+    baseline = {"draw": {"1000": {"seconds": 1.0, "peak_mb": 10.0}}}
+
+    assert suite.compare(
+        {"draw": {"1000": {"seconds": 1.2, "peak_mb": 10.5}}}, baseline, 0.25
+    ) == []
+    assert suite.compare(
+        {"draw": {"10000": {"seconds": 9.0, "peak_mb": 99.0}}}, baseline, 0.25
+    ) == []
+
+    regressions = suite.compare(
+        {"draw": {"1000": {"seconds": 1.5, "peak_mb": 20.0}}}, baseline, 0.25
+    )
+    assert len(regressions) == 2
+
+    # 極小的絕對差距視為雜訊
+    tiny = {"draw": {"1000": {"seconds": 0.001, "peak_mb": 0.1}}}
+    assert suite.compare(
+        {"draw": {"1000": {"seconds": 0.004, "peak_mb": 0.5}}}, tiny, 0.25
+    ) == []
+
+
+def test_save_baseline_merges(tmp_path):
+    path = tmp_path / "baseline.json"
+    suite.save_baseline(path, {"draw": {"1000": {"seconds": 1.0, "peak_mb": 1.0}}})
+    suite.save_baseline(path, {"draw": {"10000": {"seconds": 2.0, "peak_mb": 2.0}}})
+
+    saved = json.loads(path.read_text(encoding="utf-8"))
+    assert set(saved["results"]["draw"]) == {"1000", "10000"}
+    assert saved["meta"]["sqlite"]
@@ -0,0 +1,78 @@
+import random
+
+from app.core.candidate_pool import CandidatePool
+
+
+def _rows(n, inactive=(), weights=None):
+    return [
+        {"id": i, "name": f"員工{i}", "employee_no": f"E{i}",
+         "is_active": 0 if i in inactive else 1,
+         "weight": (weights or {}).get(i, 1.0)}
+        for i in range(1, n + 1)
+    ]
+
+
+def test_active_excludes_inactive_but_roster_keeps_everyone():
+    pool = CandidatePool(_rows(5, inactive={2, 4}))
+
+    assert sorted(r["id"] for r in pool.candidates(False)) == [1, 3, 5]
+    assert len(pool.candidates(True)) == 5
+    assert len(pool) == 3
+
+
+def test_remove_is_incremental():
+    pool = CandidatePool(_rows(6))
+
+    pool.remove([1, 6, 3])
+
+    assert sorted(r["id"] for r in pool.candidates(False)) == [2, 4, 5]
+    assert 1 not in pool and 2 in pool
+    # 特別獎仍看得到全部名單
+    assert len(pool.candidates(True)) == 6
+
+
+def test_remove_ignores_unknown_and_repeated_ids():
+    pool = CandidatePool(_rows(3))
+
+    pool.remove([2, 2, 99])
+
+    assert sorted(r["id"] for r in pool.candidates(False)) == [1, 3]
+
+
+def test_remove_everyone():
+    pool = CandidatePool(_rows(4))
+
+    pool.remove([4, 3, 2, 1])
+
+    assert len(pool) == 0
+    assert pool.candidates(False) == []
+
+
+def test_weighted_samplers_follow_active_and_roster():
+    pool = CandidatePool(_rows(5, inactive={2}, weights={3: 0.0, 4: 2.5}))
+
+    assert pool.has_weights
+    assert not CandidatePool(_rows(3)).has_weights
+    # 權重 0 的人不在加權候選中
+    assert len(pool.sampler(False)) == 3
+    assert len(pool.sampler(True)) == 4
+
+    pool.remove([4])
+
+    assert sorted(r["id"] for r in pool.sampler(False).sample(10)) == [1, 5]
+    assert len(pool.sampler(True)) == 4
+
+
+def test_weighted_draw_favours_heavier_tickets():
+    """
+    重 9 倍的人約有 90% 機率抽中唯一名額（1000 次，期望約 900）
+    """
+    pool = CandidatePool([
+        {"id": 1, "name": "甲", "employee_no": "E1", "is_active": 1, "weight": 9.0},
+        {"id": 2, "name": "乙", "employee_no": "E2", "is_active": 1, "weight": 1.0},
+    ])
+    rng = random.Random(59)
+    wins = sum(pool.sampler(False).sample(1, rng)[0]["id"] == 1 for _ in range(1000))
+
+    # 二項分佈標準差約 9.5，取 ±5σ
+    assert 850 < wins < 950
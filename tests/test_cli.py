@@ -0,0 +1,165 @@
+import json
+
+import pytest
+
+from app import cli
+from app.db import database
+from app.db.database import transaction
+
+
+def _run(capsys, *argv):
+    code = cli.main(list(argv))
+    out, err = capsys.readouterr()
+    return code, (json.loads(out) if out else None), err
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "cli.db")
+
+
+@pytest.fixture
+def roster(tmp_path):
+    path = tmp_path / "roster.csv"
+    path.write_text(
+        "name,employee_no\n" + "".join(f"員工{i},E{i:03d}\n" for i in range(10)),
+        encoding="utf-8"
+    )
+    return str(path)
+
+
+def _add_prizes(db_path, *prizes):
+    database.configure(db_path)
+    database.setup_database()
+    with transaction() as conn:
+        conn.executemany(
+            "INSERT INTO prizes (name, quota, draw_order, is_special) VALUES (?, ?, ?, ?)",
+            prizes
+        )
+    database.shutdown()
+
+
+def test_import_then_draw_then_history(capsys, db_path, roster):
+    code, out, _ = _run(capsys, "--db", db_path, "import", roster)
+    assert code == 0
+    assert out["result"] == {"inserted": 10, "updated": 0, "skipped": 0}
+    assert out["db"] == db_path
+    assert set(out["timing"]) == {"setup_database", "import", "total"}
+
+    _add_prizes(db_path, ("頭獎", 3, 1, 0), ("特別獎", 1, 2, 1))
+
+    code, out, _ = _run(capsys, "--db", db_path, "--indent", "0", "draw")
+    assert code == 0
+    assert out["result"]["candidates"] == 10
+    assert out["result"]["winners"] == 4
+    first = out["result"]["results"][0]
+    assert first["prize"] == "頭獎" and len(first["winners"]) == 3
+    assert {"prepare", "draw", "total"} <= set(out["timing"])
+
+    code, out, _ = _run(capsys, "--db", db_path, "history", "--limit", "3")
+    page = out["result"]
+    assert len(page["records"]) == 3 and page["next_cursor"]
+
+    code, out, _ = _run(
+        capsys, "--db", db_path, "history", "--after", page["next_cursor"]
+    )
+    assert len(out["result"]["records"]) == 1
+    assert out["result"]["next_cursor"] is None
+
+    code, out, _ = _run(capsys, "--db", db_path, "history", "--special")
+    assert [r["prize_name"] for r in out["result"]["records"]] == ["特別獎"]
+
+
+def test_import_append_mode(capsys, db_path, roster, tmp_path):
+    _run(capsys, "--db", db_path, "import", roster)
+
+    extra = tmp_path / "extra.csv"
+    extra.write_text(
+        "name,employee_no\n" + "".join(f"新人{i},N{i:03d}\n" for i in range(3)),
+        encoding="utf-8"
+    )
+    code, out, _ = _run(capsys, "--db", db_path, "import", str(extra), "--mode", "append")
+    assert code == 0
+    assert out["result"] == {"inserted": 3, "updated": 0, "skipped": 0}
+
+    # append 不比對現有名單：員編重複時整批失敗
+    code, out, err = _run(capsys, "--db", db_path, "import", roster, "--mode", "append")
+    assert code == 1 and "error" in json.loads(err)
+
+    with pytest.raises(SystemExit):
+        cli.main(["--db", db_path, "import", roster, "--mode", "insert"])
+
+
+def test_draw_reset_and_summary(capsys, db_path, roster):
+    _run(capsys, "--db", db_path, "import", roster)
+    _add_prizes(db_path, ("頭獎", 10, 1, 0))
+
+    _run(capsys, "--db", db_path, "draw")
+    # 全部中獎後重設才能再排練一次
+    _, out, _ = _run(capsys, "--db", db_path, "draw", "--summary")
+    assert out["result"]["results"][0]["winners"] == 0
+
+    _, out, _ = _run(capsys, "--db", db_path, "draw", "--reset", "--summary")
+    assert out["result"]["results"] == [{
+        "session_id": 3,
+        "prize": "頭獎",
+        "is_special": False,
+        "winners": 10,
+        "message": "",
+    }]
+
+
+def test_draw_next_draws_one_prize_per_run(capsys, db_path, roster):
+    _run(capsys, "--db", db_path, "import", roster)
+    _add_prizes(db_path, ("頭獎", 1, 1, 0), ("二獎", 2, 2, 0))
+
+    _, first, _ = _run(capsys, "--db", db_path, "draw", "--next", "--summary")
+    _, second, _ = _run(capsys, "--db", db_path, "draw", "--next", "--summary")
+    _, again, _ = _run(capsys, "--db", db_path, "draw", "--next", "--summary")
+
+    assert [r["prize"] for r in first["result"]["results"]] == ["頭獎"]
+    assert first["result"]["remaining"] == 1
+    assert [r["prize"] for r in second["result"]["results"]] == ["二獎"]
+    assert second["result"]["remaining"] == 0
+    # 整輪抽完後再執行：開始新的一輪
+    assert [r["prize"] for r in again["result"]["results"]] == ["頭獎"]
+    assert again["result"]["remaining"] == 1
+
+
+def test_draw_weighted_and_uniform(capsys, db_path, tmp_path):
+    roster = tmp_path / "weighted.csv"
+    roster.write_text(
+        "name,employee_no,weight\n"
+        + "".join(f"員工{i},E{i:03d},{1 if i < 3 else 0}\n" for i in range(10)),
+        encoding="utf-8"
+    )
+    _run(capsys, "--db", db_path, "import", str(roster))
+    _add_prizes(db_path, ("頭獎", 5, 1, 0))
+
+    _, out, _ = _run(capsys, "--db", db_path, "draw", "--weighted")
+    winners = out["result"]["results"][0]["winners"]
+    assert sorted(w["employee_no"] for w in winners) == ["E000", "E001", "E002"]
+
+    _, out, _ = _run(capsys, "--db", db_path, "draw", "--reset", "--uniform", "--summary")
+    assert out["result"]["winners"] == 5
+
+
+def test_sync_dry_run_and_export(capsys, db_path, roster, tmp_path):
+    _run(capsys, "--db", db_path, "import", roster)
+
+    code, out, _ = _run(capsys, "--db", db_path, "import", roster, "--sync", "--dry-run")
+    assert out["result"]["unchanged"] == 10 and out["result"]["dry_run"] is True
+
+    target = tmp_path / "history.jsonl"
+    code, out, _ = _run(capsys, "--db", db_path, "export", str(target))
+    assert code == 0 and out["result"]["records"] == 0
+    assert target.exists()
+
+
+def test_errors_are_reported_as_json(capsys, db_path, tmp_path):
+    code, out, err = _run(capsys, "--db", db_path, "import", str(tmp_path / "missing.csv"))
+    assert code == 1 and out is None
+    assert "error" in json.loads(err)
+
+    with pytest.raises(SystemExit):
+        cli.main(["--db", db_path, "history", "--after", "not-a-cursor"])
@@ -0,0 +1,86 @@
+import pytest
+
+from app.services.participant_service import ParticipantService
+from app.utils.csv_loader import detect_encoding
+
+
+def _write(path, text, encoding):
+    path.write_bytes(text.encode(encoding))
+    return str(path)
+
+
+ROSTER = "name,employee_no,dept\n王小明,E001,資訊部\n李小華,E002,人資部\n,E003,空白\n"
+
+
+@pytest.mark.parametrize("encoding, expected", [
+    ("utf-8-sig", "utf-8-sig"),
+    ("utf-8", "utf-8"),
+    ("big5", "cp950"),
+])
+def test_detect_encoding(tmp_path, encoding, expected):
+    path = _write(tmp_path / "roster.csv", ROSTER, encoding)
+
+    assert detect_encoding(path) == expected
+
+
+@pytest.mark.parametrize("encoding", ["utf-8-sig", "utf-8", "big5"])
+def test_import_csv_in_common_encodings(tmp_path, encoding, participants):
+    path = _write(tmp_path / "roster.csv", ROSTER, encoding)
+
+    result = ParticipantService().import_from_csv(path)
+
+    assert result.inserted == 2
+    assert participants() == [("王小明", "E001"), ("李小華", "E002")]
+
+
+@pytest.mark.parametrize("encoding, expected", [
+    ("utf-8", "utf-8"),
+    ("big5", "cp950"),
+])
+def test_ascii_prefix_longer_than_sample(tmp_path, encoding, expected, participants):
+    # 前 64 KB 以上全是 ASCII，中文姓名出現在後段
+    text = (
+        "name,employee_no\n"
+        + "".join(f"Staff{i},A{i:05d}\n" for i in range(5000))
+        + "王小明,E001\n"
+    )
+    path = _write(tmp_path / "roster.csv", text, encoding)
+
+    assert detect_encoding(path) == expected
+
+    result = ParticipantService().import_from_csv(path)
+
+    assert result.inserted == 5001
+    assert ("王小明", "E001") in participants()
+
+
+def test_import_tsv_and_quoted_fields(tmp_path, participants):
+    tsv = _write(
+        tmp_path / "roster.tsv", "Name\tEmployee_No\n王小明\tE001\n", "utf-8"
+    )
+    csv_path = _write(
+        tmp_path / "quoted.csv", 'name,employee_no\n"Lin, Amy",E009\n', "utf-8"
+    )
+
+    service = ParticipantService()
+    assert service.import_from_file(tsv).inserted == 1
+    assert service.import_from_file(csv_path).inserted == 1
+    assert participants() == [("王小明", "E001"), ("Lin, Amy", "E009")]
+
+
+def test_import_csv_requires_name_column(tmp_path):
+    path = _write(tmp_path / "bad.csv", "employee_no\nE001\n", "utf-8")
+
+    with pytest.raises(ValueError):
+        ParticipantService().import_from_csv(path)
+
+
+def test_import_csv_reports_progress(tmp_path):
+    rows = "".join(f"員工{i},E{i}\n" for i in range(25))
+    path = _write(tmp_path / "roster.csv", "name,employee_no\n" + rows, "utf-8")
+    seen = []
+
+    assert ParticipantService().import_from_csv(
+        path, progress=seen.append, chunk_size=10
+    ).inserted == 25
+    assert seen == [10, 20, 25]
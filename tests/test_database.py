@@ -0,0 +1,165 @@
+import threading
+
+import pytest
+
+from app.db import database
+from app.db.database import connection, transaction
+
+
+def test_connection_is_reused_within_thread():
+    """
+    同一執行緒重複借用，應拿到同一條連線
+    """
+    with connection() as first:
+        pass
+    with connection() as second:
+        pass
+
+    assert first is second
+
+
+def test_each_thread_gets_its_own_connection():
+    with connection() as main_conn:
+        pass
+
+    seen = []
+
+    def worker():
+        with connection() as conn:
+            seen.append(conn)
+        database.get_manager().release()
+
+    t = threading.Thread(target=worker)
+    t.start()
+    t.join()
+
+    assert seen and seen[0] is not main_conn
+
+
+def test_transaction_commits_on_success():
+    with transaction() as conn:
+        conn.execute(
+            "INSERT INTO participants (name, employee_no) VALUES (?, ?)",
+            ("王小明", "E001")
+        )
+
+    # 另開一次性連線確認資料已寫入磁碟
+    other = database.get_connection()
+    count = other.execute("SELECT COUNT(*) FROM participants").fetchone()[0]
+    other.close()
+
+    assert count == 1
+
+
+def test_transaction_rolls_back_on_error():
+    with pytest.raises(RuntimeError):
+        with transaction() as conn:
+            conn.execute(
+                "INSERT INTO participants (name) VALUES (?)", ("王小明",)
+            )
+            raise RuntimeError("boom")
+
+    with connection() as conn:
+        count = conn.execute("SELECT COUNT(*) FROM participants").fetchone()[0]
+
+    assert count == 0
+
+
+def test_nested_transaction_commits_once_at_outermost():
+    with pytest.raises(RuntimeError):
+        with transaction() as conn:
+            with transaction() as inner:
+                inner.execute(
+                    "INSERT INTO participants (name) VALUES (?)", ("內層",)
+                )
+            # 內層結束不應 commit，外層失敗時一起 rollback
+            raise RuntimeError("boom")
+
+    with connection() as conn:
+        count = conn.execute("SELECT COUNT(*) FROM participants").fetchone()[0]
+
+    assert count == 0
+
+
+def test_shutdown_closes_and_reopens_lazily():
+    with connection() as before:
+        pass
+
+    database.shutdown()
+
+    with connection() as after:
+        count = after.execute("SELECT COUNT(*) FROM users").fetchone()[0]
+
+    assert after is not before
+    assert count == 1  # 預設 admin
+
+
+def _pragma(conn, name):
+    return conn.execute(f"PRAGMA {name}").fetchone()[0]
+
+
+def test_durable_profile_uses_wal_and_full_sync():
+    with connection() as conn:
+        assert _pragma(conn, "journal_mode") == "wal"
+        assert _pragma(conn, "synchronous") == 2  # FULL
+        assert _pragma(conn, "busy_timeout") == 5000
+
+
+def test_event_profile_applies_to_new_connections():
+    database.set_pragma_profile("event")
+    try:
+        with connection() as conn:
+            assert _pragma(conn, "synchronous") == 1  # NORMAL
+            assert _pragma(conn, "temp_store") == 2   # MEMORY
+            assert _pragma(conn, "cache_size") == -65536
+    finally:
+        database.set_pragma_profile("durable")
+
+
+def test_custom_profile_overrides_durable_defaults():
+    pragmas = database.resolve_pragmas({"synchronous": "normal"})
+
+    assert pragmas["synchronous"] == "NORMAL"
+    assert pragmas["journal_mode"] == "WAL"
+
+
+@pytest.mark.parametrize("profile", [
+    "unknown",
+    {"page_size": 4096},
+    {"synchronous": "FAST"},
+    {"cache_size": "1; DROP TABLE users"},
+])
+def test_invalid_profile_is_rejected(profile):
+    with pytest.raises(ValueError):
+        database.set_pragma_profile(profile)
+
+
+def test_reader_and_writer_do_not_block_each_other():
+    """
+    WAL：歷史查詢的讀取 transaction 不會擋住抽籤寫入的 commit，
+    讀取端也持續看到自己的快照
+    """
+    reader = database.get_connection()
+    writer = database.get_connection()
+    writer.execute("PRAGMA busy_timeout = 0")
+
+    try:
+        reader.execute("BEGIN")
+        before = reader.execute(
+            "SELECT COUNT(*) FROM participants"
+        ).fetchone()[0]
+
+        writer.execute(
+            "INSERT INTO participants (name) VALUES (?)", ("寫入中",)
+        )
+        writer.commit()  # rollback journal 模式下此處會 database is locked
+
+        during = reader.execute(
+            "SELECT COUNT(*) FROM participants"
+        ).fetchone()[0]
+        reader.commit()
+
+        assert before == during == 0
+    finally:
+        reader.close()
+        writer.close()
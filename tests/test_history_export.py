@@ -0,0 +1,90 @@
+import csv
+import json
+import threading
+
+import pytest
+
+from app.db.database import transaction
+from app.services.lottery_history_service import LotteryHistoryService
+from app.services.lottery_service import LotteryService
+import app.utils.history_exporter as exporter
+from app.utils.history_exporter import ExportCancelled
+
+
+@pytest.fixture
+def drawn_history():
+    with transaction() as conn:
+        conn.executemany(
+            "INSERT INTO participants (name, employee_no) VALUES (?, ?)",
+            [(f"員工{i}", f"E{i:04d}" if i % 2 else None) for i in range(50)]
+        )
+        conn.executemany(
+            """
+            INSERT INTO prizes (name, quota, draw_order, is_special)
+            VALUES (?, ?, ?, ?)
+            """,
+            [("頭獎", 2, 1, 0), ("特別獎", 1, 2, 1), ("參加獎", 20, 3, 0)]
+        )
+    LotteryService().run_lottery()
+    return LotteryHistoryService().get_all_records()
+
+
+def test_iter_records_matches_get_all_records(drawn_history):
+    rows = list(LotteryHistoryService().iter_records(batch_size=7))
+
+    assert [r[0] for r in rows] == [r["record_id"] for r in drawn_history]
+    assert len(rows) == 23
+
+
+def test_export_csv(tmp_path, drawn_history):
+    path = tmp_path / "history.csv"
+
+    count = LotteryHistoryService().export_records(str(path))
+
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        rows = list(csv.reader(f))
+
+    assert count == 23
+    assert rows[0] == ["獎項", "特別獎", "中獎者", "員工編號", "抽籤時間"]
+    assert len(rows) == 24
+    assert {r[1] for r in rows[1:]} == {"是", "否"}
+
+
+def test_export_jsonl(tmp_path, drawn_history):
+    path = tmp_path / "history.jsonl"
+
+    LotteryHistoryService().export_records(str(path))
+
+    lines = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+    assert len(lines) == 23
+    assert lines[0]["中獎者"].startswith("員工")
+
+
+def test_export_xlsx_write_only(tmp_path, drawn_history):
+    openpyxl = pytest.importorskip("openpyxl")
+    path = tmp_path / "history.xlsx"
+
+    LotteryHistoryService().export_records(str(path))
+
+    ws = openpyxl.load_workbook(path, read_only=True).active
+    rows = list(ws.iter_rows(values_only=True))
+    assert rows[0][0] == "獎項"
+    assert len(rows) == 24
+
+
+def test_unknown_format_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        LotteryHistoryService().export_records(str(tmp_path / "history.pdf"))
+
+
+def test_cancelled_export_leaves_no_file(tmp_path, drawn_history, monkeypatch):
+    monkeypatch.setattr(exporter, "PROGRESS_EVERY", 5)
+    cancel = threading.Event()
+    cancel.set()
+    path = tmp_path / "history.csv"
+
+    with pytest.raises(ExportCancelled):
+        LotteryHistoryService().export_records(str(path), cancel=cancel)
+
+    assert not path.exists()
+    assert not (tmp_path / "history.csv.part").exists()
@@ -0,0 +1,163 @@
+import pytest
+
+from app.db.database import connection, transaction
+from app.services.lottery_history_service import LotteryHistoryService
+
+
+def _seed_history(sessions):
+    """
+    sessions：[(prize_name, is_special, drawn_at, 人數), ...]
+    同一場次所有人的 drawn_at 相同（與實際批次寫入一致，靠 record_id 排序）
+    """
+    with transaction() as conn:
+        for name, is_special, drawn_at, winners in sessions:
+            prize_id = conn.execute(
+                """
+                INSERT INTO prizes (name, quota, draw_order, is_special)
+                VALUES (?, ?, 1, ?)
+                """,
+                (name, winners, is_special)
+            ).lastrowid
+            session_id = conn.execute(
+                "INSERT INTO draw_sessions (prize_id) VALUES (?)", (prize_id,)
+            ).lastrowid
+            for i in range(winners):
+                pid = conn.execute(
+                    "INSERT INTO participants (name) VALUES (?)", (f"{name}{i}",)
+                ).lastrowid
+                conn.execute(
+                    """
+                    INSERT INTO draw_records (session_id, participant_id, drawn_at)
+                    VALUES (?, ?, ?)
+                    """,
+                    (session_id, pid, drawn_at)
+                )
+
+
+def _all_pages(service, limit, **filters):
+    rows, cursor = [], None
+    while True:
+        page = service.get_page(limit=limit, after=cursor, **filters)
+        rows.extend(page.rows)
+        if page.next_cursor is None:
+            return rows
+        cursor = page.next_cursor
+
+
+@pytest.fixture
+def history():
+    _seed_history([
+        ("頭獎", 0, "2024-01-01 20:00:00", 3),
+        ("特別獎", 1, "2024-01-01 20:05:00", 1),
+        ("參加獎", 0, "2024-01-02 19:00:00", 12),
+    ])
+    return LotteryHistoryService()
+
+
+def test_pages_cover_everything_in_order(history):
+    rows = _all_pages(history, limit=5)
+
+    keys = [(r[5], r[0]) for r in rows]
+    assert len(rows) == 16
+    assert keys == sorted(keys, reverse=True)
+    assert len(set(r[0] for r in rows)) == 16
+
+
+def test_last_page_has_no_cursor(history):
+    page = history.get_page(limit=16)
+
+    assert len(page.rows) == 16
+    assert page.next_cursor is None
+
+
+def test_page_boundaries_are_stable_while_new_draws_arrive(history):
+    original = [r[0] for r in _all_pages(history, limit=100)]
+    first = history.get_page(limit=6)
+
+    # 翻頁途中又開了一個獎（時間較新），以及與游標同一秒的補抽（id 較大）
+    _seed_history([
+        ("加碼獎", 0, "2024-01-03 10:00:00", 4),
+        ("補抽", 0, first.rows[-1][5], 2),
+    ])
+
+    rows, cursor = list(first.rows), first.next_cursor
+    while cursor is not None:
+        page = history.get_page(limit=6, after=cursor)
+        rows.extend(page.rows)
+        cursor = page.next_cursor
+
+    # 新資料都排在游標之前，後續頁面與插入前完全相同：不重複、不遺漏
+    assert [r[0] for r in rows] == original
+
+
+def test_filters(history):
+    with connection() as conn:
+        prize_id = conn.execute(
+            "SELECT id FROM prizes WHERE name = '頭獎'"
+        ).fetchone()[0]
+        session_id = conn.execute(
+            "SELECT id FROM draw_sessions WHERE prize_id = ?", (prize_id,)
+        ).fetchone()[0]
+
+    assert len(_all_pages(history, 2, prize_id=prize_id)) == 3
+    assert len(_all_pages(history, 2, session_id=session_id)) == 3
+    assert [r[1] for r in _all_pages(history, 2, is_special=True)] == ["特別獎"]
+    assert len(_all_pages(history, 2, is_special=False)) == 15
+    assert len(_all_pages(
+        history, 4, date_from="2024-01-01", date_to="2024-01-02"
+    )) == 4
+    assert len(_all_pages(history, 4, date_from="2024-01-02")) == 12
+
+
+def test_page_query_uses_keyset_index(history):
+    with connection() as conn:
+        plan = " | ".join(r[3] for r in conn.execute("""
+            EXPLAIN QUERY PLAN
+            SELECT dr.id FROM draw_records dr
+            JOIN draw_sessions ds ON dr.session_id = ds.id
+            JOIN prizes pr ON ds.prize_id = pr.id
+            JOIN participants p ON dr.participant_id = p.id
+            WHERE (dr.drawn_at, dr.id) < (?, ?)
+            ORDER BY dr.drawn_at DESC, dr.id DESC
+            LIMIT 101
+        """, ("2024-01-02", 5)))
+
+    assert "idx_draw_records_drawn_at_id" in plan
+    assert "TEMP B-TREE" not in plan
+
+
+def test_count_records_matches_filters(history):
+    assert history.count_records() == 16
+    assert history.count_records(is_special=True) == 1
+    assert history.count_records(date_from="2024-01-02") == 12
+
+
+def test_cursor_at_starts_page_at_offset(history):
+    everything = [r[0] for r in _all_pages(history, limit=100)]
+
+    assert history.cursor_at(0) is None
+    for offset in (1, 7, 15):
+        page = history.get_page(limit=3, after=history.cursor_at(offset))
+        assert [r[0] for r in page.rows] == everything[offset:offset + 3]
+
+    assert history.cursor_at(16) is not None
+    assert history.get_page(after=history.cursor_at(16)).rows == []
+    assert history.cursor_at(17) is None
+
+
+def test_virtual_source_jumps_and_scrolls_consistently(history):
+    pytest.importorskip("tkinter")
+    from app.ui.history_window import HistoryRowSource
+
+    everything = [str(r[0]) for r in _all_pages(history, limit=100)]
+    source = HistoryRowSource(history)
+    source.page_size = 4
+    assert source.count() == 16
+
+    # 先跳到中間（cursor_at 定位），再往回捲（keyset 接續）
+    assert [r[0] for r in source.fetch(9, 5)] == everything[9:14]
+    assert [r[0] for r in source.fetch(0, 16)] == everything
+    assert [r[0] for r in source.fetch(14, 10)] == everything[14:]
+
+    special = [r for r in source.fetch(0, 16) if r[2] == ("special",)]
+    assert len(special) == 1 and special[0][1][1] == "是"
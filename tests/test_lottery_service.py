@@ -0,0 +1,414 @@
+import sqlite3
+
+import pytest
+
+from app.db.database import connection, transaction
+from app.services.lottery_service import LotteryService
+from app.services.participant_service import ParticipantService
+
+
+def _seed(participants, prizes):
+    """
+    participants：人數；prizes：[(name, quota, is_special), ...]
+    """
+    with transaction() as conn:
+        conn.executemany(
+            "INSERT INTO participants (name, employee_no) VALUES (?, ?)",
+            [(f"員工{i}", f"E{i:05d}") for i in range(participants)]
+        )
+        conn.executemany(
+            """
+            INSERT INTO prizes (name, quota, draw_order, is_special)
+            VALUES (?, ?, ?, ?)
+            """,
+            [
+                (name, quota, order, is_special)
+                for order, (name, quota, is_special) in enumerate(prizes, 1)
+            ]
+        )
+
+
+def _active_count():
+    with connection() as conn:
+        return conn.execute(
+            "SELECT COUNT(*) FROM participants WHERE is_active = 1"
+        ).fetchone()[0]
+
+
+def test_winners_are_unique_across_normal_prizes():
+    _seed(100, [("頭獎", 3, 0), ("二獎", 10, 0), ("三獎", 20, 0)])
+
+    results = LotteryService().run_lottery()
+
+    ids = [w["id"] for r in results for w in r["winners"]]
+    assert [len(r["winners"]) for r in results] == [3, 10, 20]
+    assert len(ids) == len(set(ids))
+    assert _active_count() == 100 - 33
+
+
+def test_quota_larger_than_pool_draws_everyone():
+    _seed(5, [("大獎", 8, 0)])
+
+    result = LotteryService().run_lottery()[0]
+
+    assert len(result["winners"]) == 5
+    assert result["message"] == "人數不足，全部中獎"
+    assert _active_count() == 0
+
+
+def test_special_prize_does_not_deactivate_winner():
+    _seed(10, [("特別獎", 1, 1)])
+
+    result = LotteryService().run_lottery()[0]
+
+    assert len(result["winners"]) == 1
+    assert _active_count() == 10
+
+
+def test_empty_pool_records_session_without_winners():
+    _seed(2, [("一獎", 2, 0), ("二獎", 1, 0)])
+
+    results = LotteryService().run_lottery()
+
+    assert results[1]["winners"] == []
+    assert results[1]["message"] == "無可抽名單"
+
+
+def test_records_are_persisted_per_session():
+    _seed(30, [("一獎", 4, 0), ("特別獎", 1, 1)])
+
+    results = LotteryService().run_lottery()
+
+    with connection() as conn:
+        for r in results:
+            rows = conn.execute(
+                "SELECT participant_id FROM draw_records WHERE session_id = ?",
+                (r["session_id"],)
+            ).fetchall()
+            assert sorted(row[0] for row in rows) == sorted(
+                w["id"] for w in r["winners"]
+            )
+
+
+def test_failed_prize_rolls_back_its_whole_batch(monkeypatch):
+    """
+    單一獎項寫入失敗時，該獎項的場次、中獎紀錄與停用狀態全部 rollback
+    """
+    import app.services.lottery_service as lottery_module
+
+    _seed(10, [("一獎", 3, 0)])
+
+    # 故意回傳重複的人，觸發 UNIQUE (session_id, participant_id)
+    monkeypatch.setattr(
+        lottery_module,
+        "sample_without_replacement",
+        lambda candidates, k: [candidates[0]] * k
+    )
+
+    with pytest.raises(sqlite3.IntegrityError):
+        LotteryService().run_lottery()
+
+    with connection() as conn:
+        sessions = conn.execute("SELECT COUNT(*) FROM draw_sessions").fetchone()[0]
+        records = conn.execute("SELECT COUNT(*) FROM draw_records").fetchone()[0]
+
+    assert (sessions, records) == (0, 0)
+    assert _active_count() == 10
+
+
+def test_participants_are_scanned_once_per_run():
+    """
+    40 個獎項也只查一次 participants（候選池增量維護）
+    """
+    _seed(200, [(f"獎{i}", 2, i % 10 == 0) for i in range(40)])
+
+    statements = []
+    with connection() as conn:
+        conn.set_trace_callback(statements.append)
+        try:
+            results = LotteryService().run_lottery()
+        finally:
+            conn.set_trace_callback(None)
+
+    scans = [
+        s for s in statements
+        if "SELECT" in s and "FROM participants" in s and "IN (" not in s
+    ]
+    assert len(scans) == 1
+
+    normal_ids = [
+        w["id"] for r in results if not r["is_special"] for w in r["winners"]
+    ]
+    assert len(normal_ids) == len(set(normal_ids)) == 36 * 2
+
+
+def test_live_session_reloads_only_after_roster_edits(monkeypatch):
+    """
+    逐獎項揭曉：名單沒被編輯就沿用候選池（含加權抽樣表），編輯後才重新載入
+    """
+    from app.core.candidate_pool import CandidatePool
+
+    _seed(200, [(f"獎{i}", 2, i % 10 == 0) for i in range(20)])
+    _set_weights({"E00000": 2})
+
+    loads = []
+    original = CandidatePool.load.__func__
+    monkeypatch.setattr(
+        CandidatePool, "load",
+        classmethod(lambda cls, conn: loads.append(1) or original(cls, conn))
+    )
+
+    session = LotteryService().start_session()
+    for _ in range(10):
+        next(session)
+    assert len(loads) == 1
+
+    ParticipantService().add("新來的", "E99999")
+    next(session)
+    assert len(loads) == 2
+
+    rest = list(session)
+    assert len(loads) == 2 and len(rest) == 9
+
+
+def test_special_prize_sees_previous_winners():
+    """
+    特別獎候選包含本次已中一般獎的人
+    """
+    _seed(3, [("一獎", 3, 0), ("特別獎", 1, 1)])
+
+    results = LotteryService().run_lottery()
+
+    assert len(results[1]["winners"]) == 1
+
+
+# ==================================================
+# 逐獎項 session
+# ==================================================
+def _session_count():
+    with connection() as conn:
+        return conn.execute("SELECT COUNT(*) FROM draw_sessions").fetchone()[0]
+
+
+def test_session_draws_only_when_advanced():
+    _seed(20, [("頭獎", 1, 0), ("二獎", 2, 0), ("三獎", 3, 0)])
+
+    session = LotteryService().start_session()
+    assert (session.remaining, _session_count()) == (3, 0)
+
+    first = next(session)
+    assert first["prize"] == "頭獎"
+    assert (session.remaining, _session_count()) == (2, 1)
+    assert _active_count() == 19
+
+    rest = list(session)
+    assert [r["prize"] for r in rest] == ["二獎", "三獎"]
+    assert session.remaining == 0
+    assert _active_count() == 20 - 6
+
+
+def test_new_session_resumes_after_finished_prizes():
+    _seed(20, [("頭獎", 1, 0), ("二獎", 2, 0), ("特別獎", 1, 1)])
+
+    halted = LotteryService().start_session()
+    first = next(halted)
+
+    resumed = LotteryService().start_session()
+    assert resumed.remaining == 2
+    results = list(resumed)
+
+    assert [r["prize"] for r in results] == ["二獎", "特別獎"]
+    # 已中一般獎的人不會再中一般獎
+    assert first["winners"][0]["id"] not in {w["id"] for w in results[0]["winners"]}
+
+
+def test_resume_is_limited_to_the_current_run():
+    _seed(20, [("頭獎", 1, 0), ("二獎", 2, 0), ("特別獎", 1, 1)])
+
+    # 整輪抽完、重設名單（歷史保留）後，下一次從頭開始新的一輪
+    assert len(list(LotteryService().start_session())) == 3
+    ParticipantService().reset_all_participants()
+    fresh = LotteryService().start_session()
+    assert fresh.remaining == 3
+
+    next(fresh)
+    # resume=False：放棄未抽完的這一輪，重新開始
+    assert LotteryService().start_session(resume=False).remaining == 3
+    # 被放棄的輪次不會再被接續
+    restarted = LotteryService().start_session()
+    assert restarted.remaining == 3
+    assert _session_count() == 3 + 1
+
+    with connection() as conn:
+        runs = conn.execute(
+            "SELECT finished_at IS NOT NULL FROM draw_runs ORDER BY id"
+        ).fetchall()
+    assert [r[0] for r in runs] == [1, 1, 0]
+
+
+def test_run_lottery_starts_its_own_run():
+    _seed(20, [("頭獎", 1, 0), ("二獎", 2, 0)])
+    next(LotteryService().start_session())
+
+    assert len(LotteryService().run_lottery()) == 2
+    # run_lottery 結束後不留下可接續的輪次
+    assert LotteryService().start_session().remaining == 2
+
+
+def test_empty_pool_prize_counts_as_drawn():
+    _seed(0, [("一獎", 1, 0), ("二獎", 1, 0)])
+
+    assert next(LotteryService().start_session())["winners"] == []
+    assert LotteryService().start_session().remaining == 1
+
+
+def test_failed_prize_can_be_retried(monkeypatch):
+    import app.services.lottery_service as lottery_module
+
+    _seed(10, [("一獎", 3, 0), ("二獎", 1, 0)])
+    session = LotteryService().start_session()
+
+    monkeypatch.setattr(
+        lottery_module,
+        "sample_without_replacement",
+        lambda candidates, k: [candidates[0]] * k
+    )
+    with pytest.raises(sqlite3.IntegrityError):
+        next(session)
+    assert (session.remaining, _session_count()) == (2, 0)
+
+    monkeypatch.undo()
+    assert [r["prize"] for r in session] == ["一獎", "二獎"]
+    assert _active_count() == 10 - 4
+
+
+# ==================================================
+# 加權抽籤
+# ==================================================
+def _set_weights(weights):
+    with transaction() as conn:
+        conn.executemany(
+            "UPDATE participants SET weight = ? WHERE employee_no = ?",
+            [(w, emp) for emp, w in weights.items()]
+        )
+
+
+def test_weighted_mode_is_automatic_and_skips_zero_weights():
+    _seed(10, [("一獎", 5, 0)])
+    with transaction() as conn:
+        conn.execute("UPDATE participants SET weight = 0")
+    _set_weights({"E00001": 3, "E00004": 1.5, "E00007": 1})
+
+    session = LotteryService().start_session()
+    result = next(session)
+
+    assert session.weighted is True
+    assert sorted(w["employee_no"] for w in result["winners"]) == ["E00001", "E00004", "E00007"]
+    assert result["message"] == "人數不足，全部中獎"
+
+
+def test_uniform_mode_ignores_weights():
+    _seed(10, [("一獎", 10, 0)])
+    with transaction() as conn:
+        conn.execute("UPDATE participants SET weight = 0")
+
+    results = LotteryService().run_lottery(weighted=False)
+
+    assert len(results[0]["winners"]) == 10
+
+
+def test_weighted_winners_are_unique_across_prizes():
+    _seed(300, [("頭獎", 5, 0), ("二獎", 40, 0), ("特別獎", 3, 1), ("三獎", 100, 0)])
+    _set_weights({f"E{i:05d}": 1 + i % 7 for i in range(0, 300, 3)})
+
+    results = LotteryService().run_lottery()
+
+    normal_ids = [
+        w["id"] for r in results if not r["is_special"] for w in r["winners"]
+    ]
+    assert [len(r["winners"]) for r in results] == [5, 40, 3, 100]
+    assert len(normal_ids) == len(set(normal_ids))
+    assert _active_count() == 300 - 145
+
+
+
+# ==================================================
+# 揭曉之間編輯名單 / 獎項
+# ==================================================
+def _ids(employee_nos):
+    with connection() as conn:
+        return {
+            r[0] for r in conn.execute(
+                f"SELECT id FROM participants WHERE employee_no IN "
+                f"({','.join('?' * len(employee_nos))})",
+                employee_nos
+            )
+        }
+
+
+def test_session_sees_roster_edits_between_reveals():
+
+    _seed(4, [("一獎", 1, 0), ("二獎", 10, 0)])
+    session = LotteryService().start_session()
+    first = next(session)
+
+    service = ParticipantService()
+    remaining = _ids([f"E{i:05d}" for i in range(4)]) - {first["winners"][0]["id"]}
+    deactivated, deleted, kept = sorted(remaining)
+    service.set_active(deactivated, False)
+    assert service.delete(deleted)
+    added = service.add("新來的", "E99999")["id"]
+
+    second = next(session)
+
+    assert {w["id"] for w in second["winners"]} == {kept, added}
+
+
+def test_session_skips_prize_deleted_between_reveals():
+    from app.services.prize_service import PrizeService
+
+    _seed(10, [("一獎", 1, 0), ("二獎", 1, 0), ("三獎", 1, 0)])
+    session = LotteryService().start_session()
+    next(session)
+
+    second = next(p for p in PrizeService().get_all() if p["name"] == "二獎")
+    PrizeService().delete(second["id"])
+
+    assert [r["prize"] for r in session] == ["三獎"]
+
+
+def test_session_picks_up_quota_change_between_reveals():
+    _seed(10, [("一獎", 1, 0), ("二獎", 1, 0)])
+    session = LotteryService().start_session()
+    next(session)
+
+    with transaction() as conn:
+        conn.execute("UPDATE prizes SET quota = 3 WHERE name = '二獎'")
+
+    assert len(next(session)["winners"]) == 3
+
+
+def test_failed_draw_reloads_pool_on_retry():
+    """
+    名單只載入一次的 session（run_lottery）失敗後，重試時也要重讀名單
+    """
+    from app.services.lottery_service import DrawSession
+
+    _seed(2, [("一獎", 1, 0), ("二獎", 1, 0)])
+    with connection() as conn:
+        prizes = conn.execute("""
+            SELECT id, name, quota, is_special
+            FROM prizes
+            ORDER BY draw_order
+        """).fetchall()
+    session = DrawSession(LotteryService(), prizes, live=False)
+    first = next(session)
+
+    # 候選池裡只剩被刪掉的人 → 寫入中獎紀錄時 FK 失敗
+    other = _ids(["E00000", "E00001"]) - {first["winners"][0]["id"]}
+    assert ParticipantService().delete(other.pop())
+    with pytest.raises(sqlite3.IntegrityError):
+        next(session)
+
+    ParticipantService().add("補上", "E00002")
+    assert [w["name"] for w in next(session)["winners"]] == ["補上"]
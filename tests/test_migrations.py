@@ -0,0 +1,194 @@
+import sqlite3
+
+import pytest
+
+from app.db import database, migrations, sql_trace
+from app.db.database import connection, resource_path
+from app.services.participant_service import ParticipantService
+
+
+def _plan(conn, sql, params=()):
+    rows = conn.execute("EXPLAIN QUERY PLAN " + sql, params).fetchall()
+    return " | ".join(row[3] for row in rows)
+
+
+def _index_names(conn):
+    return {
+        row[0] for row in conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'index'"
+        )
+    }
+
+
+def test_new_database_is_at_latest_version():
+    with connection() as conn:
+        assert migrations.get_schema_version(conn) == migrations.SCHEMA_VERSION
+
+
+def test_migrate_is_idempotent():
+    assert migrations.migrate() == []
+
+
+def test_legacy_database_is_upgraded_in_place(tmp_path):
+    """
+    舊版 DB（只跑過 schema.sql、user_version = 0）啟動時應就地補上索引且保留資料
+    """
+    legacy_path = tmp_path / "legacy.db"
+    legacy = sqlite3.connect(legacy_path)
+    legacy.executescript(resource_path("schema.sql").read_text(encoding="utf-8"))
+    legacy.execute(
+        "INSERT INTO participants (name, employee_no) VALUES ('王小明', 'E001')"
+    )
+    legacy.commit()
+    legacy.close()
+
+    database.configure(legacy_path)
+    database.setup_database()
+
+    with connection() as conn:
+        assert migrations.get_schema_version(conn) == migrations.SCHEMA_VERSION
+        assert "idx_participants_active" in _index_names(conn)
+        names = [r["name"] for r in conn.execute("SELECT name FROM participants")]
+
+    assert names == ["王小明"]
+    # 既有名單一併建入搜尋索引
+    assert [r["name"] for r in ParticipantService().search("王小明")] == ["王小明"]
+
+
+def test_failed_migration_rolls_back(monkeypatch):
+    monkeypatch.setattr(migrations, "MIGRATIONS", migrations.MIGRATIONS + [
+        (99, "broken", """
+            CREATE TABLE half_done (id INTEGER);
+            INSERT INTO no_such_table VALUES (1);
+        """),
+    ])
+
+    with pytest.raises(sqlite3.OperationalError):
+        migrations.migrate()
+
+    with connection() as conn:
+        assert migrations.get_schema_version(conn) == migrations.SCHEMA_VERSION
+        tables = {
+            r[0] for r in conn.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'table'"
+            )
+        }
+
+    assert "half_done" not in tables
+
+
+# ==================================================
+# 啟動快速路徑
+# ==================================================
+def test_current_database_takes_fast_path_without_writes():
+    sql_trace.reset()
+    database.enable_sql_trace()
+    try:
+        result = database.setup_database()
+        executed = [s["sql"] for s in sql_trace.statements()]
+    finally:
+        database.disable_sql_trace()
+        sql_trace.reset()
+
+    assert result["fast_path"] is True
+    assert result["applied"] == []
+    # 只有開連線的 PRAGMA 設定與一次版本查詢
+    non_pragma = [sql for sql in executed if not sql.startswith("PRAGMA")]
+    assert len(non_pragma) == 1 and "pragma_user_version" in non_pragma[0]
+
+
+def test_new_database_gets_default_admin_and_application_id():
+    with connection() as conn:
+        application_id = conn.execute("PRAGMA application_id").fetchone()[0]
+        users = [r["username"] for r in conn.execute("SELECT username FROM users")]
+
+    assert application_id == migrations.APPLICATION_ID
+    assert users == [database.DEFAULT_ADMIN_USERNAME]
+
+
+def test_deleted_admin_is_not_recreated_on_startup():
+    with database.transaction() as conn:
+        conn.execute("DELETE FROM users")
+
+    assert database.setup_database()["fast_path"] is True
+    with connection() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM users").fetchone()[0] == 0
+
+
+def test_previous_version_database_takes_slow_path_once(tmp_path):
+    path = tmp_path / "v5.db"
+    database.configure(path)
+    with connection() as conn:
+        for version, _description, sql in migrations.MIGRATIONS[:5]:
+            migrations._apply(conn, version, sql() if callable(sql) else sql)
+
+    first = database.setup_database()
+    second = database.setup_database()
+
+    assert first["fast_path"] is False
+    assert first["applied"] == [version for version, _, _ in migrations.MIGRATIONS[5:]]
+    assert second["fast_path"] is True
+    with connection() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM users").fetchone()[0] == 1
+
+
+def test_foreign_database_is_rejected(tmp_path):
+    path = tmp_path / "other.db"
+    other = sqlite3.connect(path)
+    other.execute("PRAGMA application_id = 1234")
+    other.close()
+
+    database.configure(path)
+    with pytest.raises(sqlite3.DatabaseError):
+        database.setup_database()
+
+
+# ==================================================
+# EXPLAIN QUERY PLAN：熱門查詢不可全表掃描
+# ==================================================
+def test_active_candidates_use_covering_index():
+    with connection() as conn:
+        plan = _plan(conn, """
+            SELECT id, name, employee_no
+            FROM participants
+            WHERE is_active = 1
+        """)
+
+    assert "COVERING INDEX idx_participants_active" in plan
+
+
+def test_participant_delete_fk_check_uses_index():
+    with connection() as conn:
+        plan = _plan(conn, "DELETE FROM participants WHERE id = ?", (1,))
+
+    assert "SCAN draw_records" not in plan
+    assert "idx_draw_records_participant" in plan
+
+
+def test_history_order_by_drawn_at_uses_index():
+    with connection() as conn:
+        plan = _plan(conn, """
+            SELECT dr.id, p.name, p.employee_no, pr.name, pr.is_special, dr.drawn_at
+            FROM draw_records dr
+            JOIN draw_sessions ds ON dr.session_id = ds.id
+            JOIN prizes pr ON ds.prize_id = pr.id
+            JOIN participants p ON dr.participant_id = p.id
+            ORDER BY dr.drawn_at DESC
+        """)
+
+    assert "idx_draw_records_drawn_at_id" in plan
+    assert "TEMP B-TREE" not in plan
+
+
+def test_history_by_prize_uses_index():
+    with connection() as conn:
+        plan = _plan(conn, """
+            SELECT dr.id, p.name, dr.drawn_at
+            FROM draw_records dr
+            JOIN draw_sessions ds ON dr.session_id = ds.id
+            JOIN participants p ON dr.participant_id = p.id
+            WHERE ds.prize_id = ?
+        """, (1,))
+
+    assert "SCAN ds" not in plan
+    assert "SCAN dr" not in plan
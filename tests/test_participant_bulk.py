@@ -0,0 +1,93 @@
+import pytest
+
+from app.db.database import connection, transaction
+from app.services import participant_service
+from app.services.participant_service import ParticipantService
+
+
+@pytest.fixture
+def service():
+    return ParticipantService()
+
+
+def _ids(service, n):
+    return [service.add(f"P{i}")["id"] for i in range(n)]
+
+
+def _active(ids):
+    with connection() as conn:
+        return {
+            r[0]: r[1] for r in conn.execute(
+                f"SELECT id, is_active FROM participants WHERE id IN ({','.join('?' * len(ids))})",
+                ids
+            )
+        }
+
+
+@pytest.mark.parametrize("threshold", [500, 2])  # 參數展開 / 暫存表兩條路徑
+def test_set_active_many(service, monkeypatch, threshold):
+    monkeypatch.setattr(participant_service, "BULK_TEMP_TABLE_THRESHOLD", threshold)
+    ids = _ids(service, 6)
+
+    assert service.set_active_many(ids[:4] + ids[:2], False) == 4
+    assert _active(ids) == {i: (0 if i in ids[:4] else 1) for i in ids}
+
+    assert service.set_active_many(iter(ids[1:3]), True) == 2
+    assert service.set_active_many([], True) == 0
+
+
+@pytest.mark.parametrize("threshold", [500, 2])
+def test_delete_many_keeps_winners(service, monkeypatch, threshold):
+    monkeypatch.setattr(participant_service, "BULK_TEMP_TABLE_THRESHOLD", threshold)
+    ids = _ids(service, 5)
+
+    with transaction() as conn:
+        prize_id = conn.execute(
+            "INSERT INTO prizes (name, quota, draw_order) VALUES ('頭獎', 1, 1)"
+        ).lastrowid
+        session_id = conn.execute(
+            "INSERT INTO draw_sessions (prize_id) VALUES (?)", (prize_id,)
+        ).lastrowid
+        conn.execute(
+            "INSERT INTO draw_records (session_id, participant_id) VALUES (?, ?)",
+            (session_id, ids[1])
+        )
+
+    deleted = service.delete_many([ids[0], ids[1], ids[2], 99999])
+
+    assert sorted(deleted) == [ids[0], ids[2]]
+    assert service.count_participants() == 3
+    assert service.delete_many([]) == []
+
+
+def test_temp_table_is_emptied_between_calls(service, monkeypatch):
+    monkeypatch.setattr(participant_service, "BULK_TEMP_TABLE_THRESHOLD", 1)
+    ids = _ids(service, 4)
+
+    service.set_active_many(ids[:3], False)
+    # 上一批的 id 不應殘留在暫存表
+    assert service.set_active_many(ids[2:], True) == 2
+    assert _active(ids) == {ids[0]: 0, ids[1]: 0, ids[2]: 1, ids[3]: 1}
+
+
+def test_select_all_covers_rows_off_screen(service, monkeypatch):
+    # 全選的 id 來自整個來源（不只畫面上 / 已快取的頁），大量時走暫存表
+    pytest.importorskip("tkinter")
+    from app.ui.participants_window import ParticipantRowSource, SearchRowSource
+    from app.ui.virtual_tree import PagedSource
+
+    monkeypatch.setattr(participant_service, "BULK_TEMP_TABLE_THRESHOLD", 2)
+    monkeypatch.setattr(PagedSource, "page_size", 3)
+    ids = _ids(service, 10)
+
+    roster = ParticipantRowSource(service)
+    roster.fetch(0, 3)
+    assert roster.iids() == [str(i) for i in ids]
+    # 基底類別逐頁讀完也得到同樣結果
+    assert PagedSource.iids(roster) == roster.iids()
+
+    selected = [int(iid) for iid in SearchRowSource(service, "P").iids()]
+    assert service.set_active_many(selected, False) == 10
+    assert set(_active(ids).values()) == {0}
+    assert service.get(ids[-1])["is_active"] == 0
+    assert service.get(99999) is None
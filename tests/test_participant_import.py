@@ -0,0 +1,100 @@
+import threading
+
+import pytest
+
+from app.services.participant_service import ImportCancelled, ParticipantService
+
+openpyxl = pytest.importorskip("openpyxl")
+
+
+def _write_xlsx(path, rows):
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    for row in rows:
+        ws.append(row)
+    wb.save(path)
+    return str(path)
+
+
+def test_import_excel_normalizes_rows(tmp_path, participants):
+    path = _write_xlsx(tmp_path / "roster.xlsx", [
+        ["name", "employee_no", "dept"],
+        ["  王小明 ", "E001", "IT"],
+        [None, "E002", "HR"],          # 無姓名 → 略過
+        ["李小華", 1234, "HR"],         # 數字員編 → 字串
+        ["陳大文", None, "Sales"],
+    ])
+
+    result = ParticipantService().import_from_excel(path)
+
+    assert result.inserted == 3
+    assert participants() == [
+        ("王小明", "E001"), ("李小華", "1234"), ("陳大文", None)
+    ]
+
+
+def test_import_excel_without_employee_no_column(tmp_path, participants):
+    path = _write_xlsx(tmp_path / "names.xlsx", [["Name"], ["王小明"], ["李小華"]])
+
+    assert ParticipantService().import_from_excel(path).inserted == 2
+    assert participants() == [("王小明", None), ("李小華", None)]
+
+
+def test_import_excel_requires_name_column(tmp_path, participants):
+    path = _write_xlsx(tmp_path / "bad.xlsx", [["employee_no"], ["E001"]])
+
+    with pytest.raises(ValueError):
+        ParticipantService().import_from_excel(path)
+
+    assert participants() == []
+
+
+def test_import_excel_reports_progress_per_chunk(tmp_path):
+    path = _write_xlsx(
+        tmp_path / "big.xlsx",
+        [["name", "employee_no"]] + [[f"員工{i}", f"E{i}"] for i in range(25)]
+    )
+    seen = []
+
+    result = ParticipantService().import_from_excel(
+        path, progress=seen.append, chunk_size=10
+    )
+
+    assert result.inserted == 25
+    assert seen == [10, 20, 25]
+
+
+def test_import_excel_is_all_or_nothing(tmp_path, participants):
+    path = _write_xlsx(
+        tmp_path / "roster.xlsx",
+        [["name"]] + [[f"員工{i}"] for i in range(30)]
+    )
+
+    def fail_after_first_chunk(done):
+        if done >= 10:
+            raise RuntimeError("中斷")
+
+    with pytest.raises(RuntimeError):
+        ParticipantService().import_from_excel(
+            path, progress=fail_after_first_chunk, chunk_size=10
+        )
+
+    assert participants() == []
+
+
+def test_cancelled_import_rolls_back(tmp_path, participants):
+    path = _write_xlsx(
+        tmp_path / "roster.xlsx",
+        [["name"]] + [[f"員工{i}"] for i in range(30)]
+    )
+    cancel = threading.Event()
+
+    with pytest.raises(ImportCancelled):
+        ParticipantService().import_from_excel(
+            path,
+            progress=lambda done: cancel.set(),  # 第一批寫入後按下取消
+            chunk_size=10,
+            cancel=cancel
+        )
+
+    assert participants() == []
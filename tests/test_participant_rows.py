@@ -0,0 +1,62 @@
+import pytest
+
+from app.services.participant_service import ParticipantService
+
+
+@pytest.fixture
+def service():
+    return ParticipantService()
+
+
+def test_mutations_return_changed_row(service):
+    row = service.add("王小明", " E001 ")
+    assert (row["name"], row["employee_no"], row["is_active"]) == ("王小明", "E001", 1)
+
+    updated = service.update(row["id"], "王大明", "E002")
+    assert (updated["id"], updated["name"], updated["employee_no"]) == (row["id"], "王大明", "E002")
+
+    toggled = service.set_active(row["id"], False)
+    assert toggled["is_active"] == 0
+
+    assert service.delete(row["id"]) is True
+    assert service.delete(row["id"]) is False
+    assert service.update(row["id"], "x", None) is None
+    assert service.set_active(row["id"], True) is None
+
+
+def test_paging_by_id(service):
+    ids = [service.add(f"P{i}")["id"] for i in range(25)]
+    service.delete(ids[3])
+    ids.remove(ids[3])
+
+    assert service.count_participants() == 24
+    assert [r["id"] for r in service.get_page(10)] == ids[:10]
+    assert [r["id"] for r in service.get_page(10, after_id=ids[9])] == ids[10:20]
+
+    assert service.cursor_at(0) is None
+    assert [r["id"] for r in service.get_page(5, service.cursor_at(17))] == ids[17:22]
+    assert service.cursor_at(25) is None
+
+
+def test_row_source_patches_cache_without_requery(service):
+    pytest.importorskip("tkinter")
+    from app.ui.participants_window import ParticipantRowSource, _tree_row
+
+    ids = [service.add(f"P{i}", f"E{i:03d}")["id"] for i in range(12)]
+    source = ParticipantRowSource(service)
+    source.page_size = 5
+
+    assert source.count() == 12
+    # 跳到中間再接續往後讀
+    assert [r[0] for r in source.fetch(7, 5)] == [str(i) for i in ids[7:12]]
+    assert [r[0] for r in source.fetch(0, 12)] == [str(i) for i in ids]
+
+    # 修改：快取就地更新
+    source.patch(_tree_row(service.set_active(ids[8], False)))
+    assert source.fetch(8, 1)[0][1][3] == "否"
+
+    # 新增：尾端快取丟棄後重讀得到新列
+    new_id = service.add("新人")["id"]
+    source.drop_from(12)
+    assert source.fetch(12, 1)[0][0] == str(new_id)
+    assert source.fetch(12, 1)[0][1][2] == ""
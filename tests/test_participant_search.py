@@ -0,0 +1,225 @@
+import threading
+
+import pytest
+
+from app.db import database, migrations
+from app.db.database import connection
+from app.services import participant_service
+from app.services.participant_service import ParticipantService
+
+requires_fts = pytest.mark.skipif(
+    not migrations.fts5_trigram_available(),
+    reason="SQLite 未支援 FTS5 trigram"
+)
+
+
+@pytest.fixture
+def service():
+    service = ParticipantService()
+    for name, emp in [
+        ("王小明", "E001"),
+        ("陳小明", "E002"),
+        ("王大華", "A100"),
+        ("林怡君", None),
+        ("李100%", "E100"),
+    ]:
+        service.add(name, emp)
+    return service
+
+
+def _names(rows):
+    return [r["name"] for r in rows]
+
+
+@requires_fts
+def test_search_index_is_created():
+    with connection() as conn:
+        assert participant_service._has_search_index(conn)
+
+
+def test_long_query_is_substring(service):
+    assert _names(service.search("小明 ")) == ["王小明", "陳小明"]
+    assert _names(service.search("王小明")) == ["王小明"]
+    assert _names(service.search("E00")) == ["王小明", "陳小明"]
+    assert _names(service.search("100%")) == ["李100%"]
+    assert service.search("不存在的人") == []
+    assert service.search("   ") == []
+
+
+def test_short_query_prefix_then_substring(service):
+    # 前綴（姓氏）+ 子字串（名字）都找得到，依 id 排序
+    assert _names(service.search("王")) == ["王小明", "王大華"]
+    assert _names(service.search("小明")) == ["王小明", "陳小明"]
+    assert _names(service.search("A1")) == ["王大華"]
+    assert _names(service.search("E", limit=2)) == ["王小明", "陳小明"]
+
+
+def test_like_fallback_without_fts(service, monkeypatch):
+    monkeypatch.setattr(participant_service, "_has_search_index", lambda conn: False)
+
+    assert _names(service.search("小明")) == ["王小明", "陳小明"]
+    assert _names(service.search("E10")) == ["李100%"]
+    # LIKE 萬用字元需跳脫
+    assert service.search("0_") == []
+
+
+@requires_fts
+def test_index_follows_inserts_updates_and_deletes(service):
+    pid = service.add("張三豐", "X999")["id"]
+    assert _names(service.search("張三豐")) == ["張三豐"]
+
+    service.update(pid, "張無忌", "X999")
+    assert service.search("張三豐") == []
+    assert _names(service.search("張無忌")) == ["張無忌"]
+
+    service.delete_many([pid])
+    assert service.search("X999") == []
+
+
+@requires_fts
+def test_limit_applies_to_fts(service):
+    for i in range(10):
+        service.add(f"測試員{i}", f"T{i:03d}")
+
+    assert len(service.search("測試員", limit=4)) == 4
+    assert [r["employee_no"] for r in service.search("T00", limit=3)] == [
+        "T000", "T001", "T002"
+    ]
+
+
+def test_short_prefix_uses_name_index(service):
+    with connection() as conn:
+        plan = " | ".join(r[3] for r in conn.execute(
+            "EXPLAIN QUERY PLAN SELECT id FROM participants WHERE name >= ? AND name < ? ORDER BY name LIMIT 10",
+            ("王", "王\U0010ffff")
+        ))
+
+    assert "idx_participants_name" in plan
+
+
+def test_search_row_source_pages_results(service):
+    pytest.importorskip("tkinter")
+    from app.ui.participants_window import SearchRowSource, _tree_row
+
+    source = SearchRowSource(service, "小明")
+    assert source.count() == 2
+
+    row = service.set_active(source.fetch(1, 1)[0][1][0], False)
+    source.patch(_tree_row(row))
+    assert source.fetch(0, 5)[1][1][3] == "否"
+
+
+# ==================================================
+# 大量匯入：暫停 trigger、結束前 rebuild
+# ==================================================
+def _fts_triggers():
+    with connection() as conn:
+        return sorted(r[0] for r in conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'trigger' AND name LIKE 'participants_fts_%'"
+        ))
+
+
+@pytest.fixture
+def small_bulk_threshold(monkeypatch):
+    monkeypatch.setattr(participant_service, "BULK_TRIGGER_MIN_ROWS", 20)
+
+
+@requires_fts
+@pytest.mark.parametrize("mode", ["upsert", "append"])
+def test_search_works_after_bulk_import(
+    service, small_bulk_threshold, tmp_path, mode, write_csv
+):
+    path = write_csv(
+        tmp_path / "roster.csv", [(f"匯入員{i}", f"B{i:03d}") for i in range(50)]
+    )
+    ParticipantService().import_from_csv(path, chunk_size=10, mode=mode)
+
+    assert _fts_triggers() == sorted(migrations.PARTICIPANT_FTS_TRIGGERS)
+    assert len(service.search("匯入員", limit=100)) == 50
+    assert _names(service.search("B049")) == ["匯入員49"]
+    # 原有名單的索引仍在，之後單筆新增照常走 trigger
+    assert _names(service.search("王小明")) == ["王小明"]
+    service.add("匯入後新增", "Z001")
+    assert _names(service.search("Z001")) == ["匯入後新增"]
+
+
+@requires_fts
+def test_search_works_after_bulk_sync(
+    service, small_bulk_threshold, tmp_path, write_csv
+):
+    path = write_csv(
+        tmp_path / "roster.csv",
+        [("王小明改名", "E001")] + [(f"同步員{i}", f"S{i:03d}") for i in range(30)]
+    )
+    ParticipantService().sync_from_file(path)
+
+    assert _fts_triggers() == sorted(migrations.PARTICIPANT_FTS_TRIGGERS)
+    assert _names(service.search("王小明")) == ["王小明改名"]
+    assert service.search("陳小明") == []
+    assert len(service.search("同步員", limit=100)) == 30
+
+
+@requires_fts
+def test_cancelled_bulk_import_keeps_triggers(
+    service, small_bulk_threshold, tmp_path, write_csv
+):
+    path = write_csv(
+        tmp_path / "roster.csv", [(f"匯入員{i}", f"B{i:03d}") for i in range(50)]
+    )
+    cancel = threading.Event()
+
+    with pytest.raises(participant_service.ImportCancelled):
+        ParticipantService().import_from_csv(
+            path,
+            progress=lambda done: done >= 30 and cancel.set(),
+            chunk_size=10,
+            cancel=cancel
+        )
+
+    assert _fts_triggers() == sorted(migrations.PARTICIPANT_FTS_TRIGGERS)
+    assert service.search("匯入員") == []
+
+
+# ==================================================
+# 換 SQLite 版本：啟動時依 trigram 支援補建 / 停用索引
+# ==================================================
+def _without_trigram(monkeypatch):
+    monkeypatch.setattr(migrations, "fts5_trigram_available", lambda: False)
+    monkeypatch.setattr(participant_service, "fts5_trigram_available", lambda: False)
+
+
+@requires_fts
+def test_search_index_is_disabled_then_rebuilt_across_sqlite_builds(service, monkeypatch):
+    # 不支援 trigram 的 SQLite 開啟：移除 trigger，寫入不經過 FTS，搜尋退回 LIKE
+    _without_trigram(monkeypatch)
+    assert database.setup_database()["fast_path"] is True
+    assert _fts_triggers() == []
+
+    service.add("換版新增", "V001")
+    assert _names(service.search("換版新增")) == ["換版新增"]
+    assert database.setup_database()["fast_path"] is True
+
+    # 換回支援的 SQLite：補 trigger 並 rebuild，期間新增的人也找得到
+    monkeypatch.undo()
+    database.setup_database()
+    assert _fts_triggers() == sorted(migrations.PARTICIPANT_FTS_TRIGGERS)
+    with connection() as conn:
+        assert participant_service._fts_search(conn, "換版新增", 10)
+
+
+@requires_fts
+def test_search_index_is_created_after_sqlite_upgrade(tmp_path, monkeypatch):
+    _without_trigram(monkeypatch)
+    database.configure(tmp_path / "old_sqlite.db")
+    database.setup_database()
+    ParticipantService().add("王小明", "E001")
+    with connection() as conn:
+        assert not conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'participants_fts'"
+        ).fetchone()
+
+    monkeypatch.undo()
+    assert database.setup_database()["fast_path"] is True
+    with connection() as conn:
+        assert participant_service._has_search_index(conn)
+        assert _names(participant_service._fts_search(conn, "王小明", 10)) == ["王小明"]
@@ -0,0 +1,99 @@
+from app.db.database import connection, transaction
+from app.services.participant_service import ParticipantService
+
+
+def _participants():
+    with connection() as conn:
+        return [
+            (r["name"], r["employee_no"], r["is_active"])
+            for r in conn.execute(
+                "SELECT name, employee_no, is_active FROM participants ORDER BY id"
+            )
+        ]
+
+
+def _seed_day_one(tmp_path, write_csv):
+    ParticipantService().import_from_file(write_csv(tmp_path / "day1.csv", [
+        ("王小明", "E001"), ("李小華", "E002"), ("陳大文", "E003"), ("林小美", None),
+    ]))
+
+
+DAY_TWO = [
+    ("王小明", "E001"),      # 不變
+    ("李曉華", "E002"),      # 改名
+    ("林小美", None),        # 不變（無員編，以姓名比對）
+    ("張新人", "E004"),      # 新增
+]                           # 陳大文 E003 → 移除
+
+
+def test_dry_run_previews_without_writing(tmp_path, write_csv):
+    _seed_day_one(tmp_path, write_csv)
+    before = _participants()
+
+    diff = ParticipantService().sync_from_file(
+        write_csv(tmp_path / "day2.csv", DAY_TWO), dry_run=True
+    )
+
+    assert diff.added == [("張新人", "E004", None)]
+    assert [(old, new) for _, old, new in diff.renamed] == [("李小華", "李曉華")]
+    assert [(name, emp) for _, name, emp in diff.removed] == [("陳大文", "E003")]
+    assert diff.unchanged == 2
+    assert diff.changes == 3
+    assert _participants() == before
+
+
+def test_sync_applies_only_the_delta(tmp_path, write_csv):
+    _seed_day_one(tmp_path, write_csv)
+    with connection() as conn:
+        ids_before = {
+            r["employee_no"]: r["id"]
+            for r in conn.execute("SELECT id, employee_no FROM participants")
+        }
+
+    ParticipantService().sync_from_file(write_csv(tmp_path / "day2.csv", DAY_TWO))
+
+    assert _participants() == [
+        ("王小明", "E001", 1),
+        ("李曉華", "E002", 1),
+        ("林小美", None, 1),
+        ("張新人", "E004", 1),
+    ]
+    with connection() as conn:
+        ids_after = {
+            r["employee_no"]: r["id"]
+            for r in conn.execute("SELECT id, employee_no FROM participants")
+        }
+    # 未變動 / 改名的人保留原 id（中獎紀錄不受影響）
+    assert ids_after["E001"] == ids_before["E001"]
+    assert ids_after["E002"] == ids_before["E002"]
+
+
+def test_removed_winner_is_deactivated_not_deleted(tmp_path, write_csv):
+    _seed_day_one(tmp_path, write_csv)
+    with transaction() as conn:
+        pid = conn.execute(
+            "SELECT id FROM participants WHERE employee_no = 'E003'"
+        ).fetchone()[0]
+        conn.execute(
+            "INSERT INTO prizes (id, name, quota, draw_order) VALUES (1, '頭獎', 1, 1)"
+        )
+        conn.execute("INSERT INTO draw_sessions (id, prize_id) VALUES (1, 1)")
+        conn.execute(
+            "INSERT INTO draw_records (session_id, participant_id) VALUES (1, ?)",
+            (pid,)
+        )
+
+    ParticipantService().sync_from_file(write_csv(tmp_path / "day2.csv", DAY_TWO))
+
+    assert ("陳大文", "E003", 0) in _participants()
+
+
+def test_sync_same_file_is_noop(tmp_path, write_csv):
+    _seed_day_one(tmp_path, write_csv)
+
+    diff = ParticipantService().sync_from_file(write_csv(tmp_path / "same.csv", [
+        ("王小明", "E001"), ("李小華", "E002"), ("陳大文", "E003"), ("林小美", None),
+    ]))
+
+    assert diff.changes == 0
+    assert diff.unchanged == 4
@@ -0,0 +1,104 @@
+import sqlite3
+
+import pytest
+
+from app.db import database, migrations
+from app.db.database import connection, resource_path
+from app.services.participant_service import ParticipantService
+
+
+def test_repeated_import_is_idempotent(tmp_path, participants, write_csv):
+    path = write_csv(tmp_path / "roster.csv", [
+        ("王小明", "E001"), ("李小華", "E002"), ("陳大文", None),
+    ])
+    service = ParticipantService()
+
+    first = service.import_from_file(path)
+    second = service.import_from_file(path)
+
+    assert (first.inserted, first.updated, first.skipped) == (3, 0, 0)
+    assert (second.inserted, second.updated, second.skipped) == (0, 0, 3)
+    assert len(participants()) == 3
+
+
+def test_upsert_updates_renamed_rows_and_dedups_within_file(tmp_path, participants, write_csv):
+    ParticipantService().add("王小明", "E001")
+    path = write_csv(tmp_path / "roster.csv", [
+        ("王曉明", "E001"),   # 改名 → 更新
+        ("李小華", "E002"),   # 新增
+        ("李小華2", "E002"),  # 檔案內重複 → 略過（以第一筆為準）
+    ])
+
+    result = ParticipantService().import_from_file(path)
+
+    assert (result.inserted, result.updated, result.skipped) == (1, 1, 1)
+    assert participants() == [("王曉明", "E001"), ("李小華", "E002")]
+
+
+def test_upsert_keeps_winner_inactive(tmp_path, write_csv):
+    service = ParticipantService()
+    service.add("王小明", "E001")
+    with connection() as conn:
+        pid = conn.execute("SELECT id FROM participants").fetchone()[0]
+    service.set_active(pid, False)
+
+    service.import_from_file(write_csv(tmp_path / "r.csv", [("王曉明", "E001")]))
+
+    with connection() as conn:
+        row = conn.execute("SELECT name, is_active FROM participants").fetchone()
+    assert (row["name"], row["is_active"]) == ("王曉明", 0)
+
+
+def test_append_mode_rejects_duplicate_employee_no(tmp_path, participants, write_csv):
+    service = ParticipantService()
+    service.add("王小明", "E001")
+    path = write_csv(tmp_path / "r.csv", [("李小華", "E002"), ("王小明", "E001")])
+
+    with pytest.raises(sqlite3.IntegrityError):
+        service.import_from_file(path, mode="append")
+
+    assert participants() == [("王小明", "E001")]
+
+
+def test_blank_employee_no_is_stored_as_null(participants):
+    service = ParticipantService()
+    service.add("王小明", "")
+    service.add("李小華", "  ")
+
+    assert participants() == [("王小明", None), ("李小華", None)]
+
+
+def test_migration_keeps_existing_duplicates(tmp_path):
+    """
+    舊 DB 已有重複員編：升級時只清掉較晚那筆的員編，人與中獎紀錄都不動
+    """
+    legacy_path = tmp_path / "legacy.db"
+    legacy = sqlite3.connect(legacy_path)
+    legacy.executescript(resource_path("schema.sql").read_text(encoding="utf-8"))
+    legacy.executescript("""
+        INSERT INTO participants (id, name, employee_no, is_active) VALUES
+            (1, '王小明', 'E001', 1),
+            (2, '王小明', 'E001', 0),
+            (3, '李小華', ' ', 1),
+            (4, '陳大文', '', 1);
+        INSERT INTO prizes (id, name, quota, draw_order) VALUES (1, '頭獎', 1, 1);
+        INSERT INTO draw_sessions (id, prize_id) VALUES (1, 1);
+        INSERT INTO draw_records (session_id, participant_id) VALUES (1, 2);
+    """)
+    legacy.close()
+
+    database.configure(legacy_path)
+    database.setup_database()
+
+    with connection() as conn:
+        people = conn.execute(
+            "SELECT id, employee_no, is_active FROM participants ORDER BY id"
+        ).fetchall()
+        winner = conn.execute("SELECT participant_id FROM draw_records").fetchone()[0]
+        version = migrations.get_schema_version(conn)
+
+    assert [tuple(p) for p in people] == [
+        (1, "E001", 1), (2, None, 0), (3, None, 1), (4, None, 1)
+    ]
+    assert winner == 2
+    assert version == migrations.SCHEMA_VERSION
@@ -0,0 +1,78 @@
+import pytest
+
+from app.db.database import connection
+from app.services.participant_service import ParticipantService
+
+
+def _write_csv(path, text):
+    path.write_text(text, encoding="utf-8")
+    return str(path)
+
+
+def _weights():
+    with connection() as conn:
+        return {
+            r["employee_no"]: r["weight"]
+            for r in conn.execute("SELECT employee_no, weight FROM participants")
+        }
+
+
+def test_weight_column_is_optional(tmp_path):
+    service = ParticipantService()
+    service.import_from_csv(_write_csv(
+        tmp_path / "a.csv", "name,employee_no\n王小明,E001\n李小華,E002\n"
+    ))
+    service.import_from_csv(_write_csv(
+        tmp_path / "b.csv", "name,employee_no,weight\n陳大文,E003,2.5\n林小美,E004,\n"
+    ))
+
+    assert _weights() == {"E001": 1.0, "E002": 1.0, "E003": 2.5, "E004": 1.0}
+
+
+def test_upsert_updates_weight_only_when_given(tmp_path):
+    service = ParticipantService()
+    service.import_from_csv(_write_csv(
+        tmp_path / "a.csv", "name,employee_no,weight\n王小明,E001,3\n李小華,E002,2\n"
+    ))
+
+    result = service.import_from_csv(_write_csv(
+        tmp_path / "b.csv", "name,employee_no,weight\n王小明,E001,5\n李小華,E002,\n"
+    ))
+    assert (result.updated, result.skipped) == (1, 1)
+
+    # 沒有 weight 欄位的檔案不會把權重重設回 1
+    result = service.import_from_csv(_write_csv(
+        tmp_path / "c.csv", "name,employee_no\n王小明,E001\n李小華,E002\n"
+    ))
+    assert result.skipped == 2
+    assert _weights() == {"E001": 5.0, "E002": 2.0}
+
+
+def test_sync_reports_and_applies_weight_changes(tmp_path):
+    service = ParticipantService()
+    service.import_from_csv(_write_csv(
+        tmp_path / "a.csv", "name,employee_no,weight\n王小明,E001,1\n李小華,E002,2\n"
+    ))
+    with connection() as conn:
+        pid = conn.execute(
+            "SELECT id FROM participants WHERE employee_no = 'E002'"
+        ).fetchone()[0]
+
+    diff = service.sync_from_file(_write_csv(
+        tmp_path / "b.csv", "name,employee_no,weight\n王小明,E001,\n李曉華,E002,4\n"
+    ))
+
+    assert diff.reweighted == [(pid, 2.0, 4.0)]
+    assert [(old, new) for _, old, new in diff.renamed] == [("李小華", "李曉華")]
+    assert (diff.unchanged, diff.changes) == (1, 2)
+    assert _weights() == {"E001": 1.0, "E002": 4.0}
+
+
+@pytest.mark.parametrize("value", ["abc", "-1", "nan"])
+def test_invalid_weight_is_rejected(tmp_path, value):
+    path = _write_csv(tmp_path / "bad.csv", f"name,employee_no,weight\n王小明,E001,{value}\n")
+
+    with pytest.raises(ValueError, match="第 2 列"):
+        ParticipantService().import_from_csv(path)
+
+    assert _weights() == {}
@@ -0,0 +1,202 @@
+import itertools
+import random
+from collections import Counter
+
+import pytest
+
+from app.utils.random_helper import (
+    AliasTable,
+    WeightedSampler,
+    sample_without_replacement,
+    weighted_sample_without_replacement,
+)
+
+# 卡方檢定臨界值（顯著水準 0.001），避免額外依賴 scipy
+CHI2_CRITICAL_999 = {5: 20.515, 9: 27.877, 19: 43.820}
+
+
+def _chi_square(observed, expected):
+    return sum((o - expected) ** 2 / expected for o in observed)
+
+
+def _chi_square_weighted(observed, weights, trials):
+    total = sum(weights)
+    return sum(
+        (o - trials * w / total) ** 2 / (trials * w / total)
+        for o, w in zip(observed, weights)
+    )
+
+
+def test_picks_are_unique_and_from_population():
+    population = list(range(1000))
+    picked = sample_without_replacement(population, 300, random.Random(1))
+
+    assert len(picked) == 300
+    assert len(set(picked)) == 300
+    assert set(picked) <= set(population)
+
+
+def test_population_is_not_modified():
+    population = list(range(50))
+    sample_without_replacement(population, 50, random.Random(2))
+
+    assert population == list(range(50))
+
+
+def test_k_larger_than_population_returns_everyone():
+    picked = sample_without_replacement("abc", 10, random.Random(3))
+
+    assert sorted(picked) == ["a", "b", "c"]
+
+
+def test_zero_and_empty():
+    assert sample_without_replacement([1, 2, 3], 0) == []
+    assert sample_without_replacement([], 5) == []
+
+
+def test_negative_k_raises():
+    with pytest.raises(ValueError):
+        sample_without_replacement([1, 2, 3], -1)
+
+
+def test_inclusion_frequency_is_uniform():
+    """
+    每個人被抽中的機率都應是 k / n
+    """
+    rng = random.Random(20240101)
+    n, k, trials = 20, 5, 20000
+    counts = Counter()
+
+    for _ in range(trials):
+        counts.update(sample_without_replacement(range(n), k, rng))
+
+    expected = trials * k / n
+    stat = _chi_square([counts[i] for i in range(n)], expected)
+
+    assert stat < CHI2_CRITICAL_999[n - 1]
+
+
+def test_first_pick_is_uniform():
+    rng = random.Random(7)
+    n, trials = 10, 20000
+    counts = Counter(
+        sample_without_replacement(range(n), 3, rng)[0]
+        for _ in range(trials)
+    )
+
+    stat = _chi_square([counts[i] for i in range(n)], trials / n)
+
+    assert stat < CHI2_CRITICAL_999[n - 1]
+
+
+def test_every_ordering_is_equally_likely():
+    rng = random.Random(11)
+    trials = 12000
+    counts = Counter(
+        tuple(sample_without_replacement("abc", 3, rng))
+        for _ in range(trials)
+    )
+
+    orderings = list(itertools.permutations("abc"))
+    assert set(counts) == set(orderings)
+
+    stat = _chi_square([counts[o] for o in orderings], trials / len(orderings))
+
+    assert stat < CHI2_CRITICAL_999[len(orderings) - 1]
+
+
+# ==================================================
+# 加權抽樣
+# ==================================================
+WEIGHTS = [1, 2, 3, 4, 5, 9]
+
+
+def test_alias_table_frequencies_match_weights():
+    rng = random.Random(31)
+    table = AliasTable(WEIGHTS)
+    trials = 60000
+    counts = Counter(table.sample(rng.random) for _ in range(trials))
+
+    stat = _chi_square_weighted(
+        [counts[i] for i in range(len(WEIGHTS))], WEIGHTS, trials
+    )
+
+    assert stat < CHI2_CRITICAL_999[len(WEIGHTS) - 1]
+
+
+def test_weighted_first_pick_matches_weights():
+    rng = random.Random(37)
+    sampler = WeightedSampler(range(len(WEIGHTS)), WEIGHTS)
+    trials = 30000
+    counts = Counter(sampler.sample(3, rng)[0] for _ in range(trials))
+
+    stat = _chi_square_weighted(
+        [counts[i] for i in range(len(WEIGHTS))], WEIGHTS, trials
+    )
+
+    assert stat < CHI2_CRITICAL_999[len(WEIGHTS) - 1]
+
+
+def test_weighted_orderings_follow_successive_sampling():
+    """
+    不放回：每一步的機率與「剩下的人」的權重成正比
+    """
+    rng = random.Random(41)
+    weights = {"a": 1, "b": 2, "c": 5}
+    sampler = WeightedSampler(list(weights), list(weights.values()))
+    trials = 30000
+    counts = Counter(tuple(sampler.sample(3, rng)) for _ in range(trials))
+
+    orderings = list(itertools.permutations("abc"))
+    total = sum(weights.values())
+    expected = [
+        weights[x] / total * weights[y] / (total - weights[x])
+        for x, y, _ in orderings
+    ]
+    stat = _chi_square_weighted([counts[o] for o in orderings], expected, trials)
+
+    assert stat < CHI2_CRITICAL_999[len(orderings) - 1]
+
+
+def test_removed_items_are_never_picked_and_rest_keep_their_odds():
+    rng = random.Random(43)
+    items = list(range(1, 11))
+    sampler = WeightedSampler(items, items)
+
+    # 移除 7～10（佔總權重 62%）→ 觸發重建
+    sampler.remove([10, 9, 8, 7])
+    assert len(sampler) == 6
+
+    trials = 30000
+    counts = Counter(sampler.sample(2, rng)[0] for _ in range(trials))
+    assert set(counts) <= set(range(1, 7))
+
+    stat = _chi_square_weighted([counts[i] for i in range(1, 7)], range(1, 7), trials)
+    assert stat < CHI2_CRITICAL_999[5]
+
+
+def test_drawing_most_of_a_skewed_pool_stays_unique():
+    # 抽到後段時被略過的權重過半，會在本次抽樣內重建
+    rng = random.Random(47)
+    weights = [1000] * 5 + [1] * 995
+    picked = weighted_sample_without_replacement(range(1000), weights, 990, rng)
+
+    assert len(picked) == len(set(picked)) == 990
+    assert set(range(5)) <= set(picked)
+
+
+def test_zero_weights_are_never_picked():
+    sampler = WeightedSampler("abcd", [0, 1, 0, 2])
+
+    assert len(sampler) == 2
+    assert sorted(sampler.sample(5, random.Random(53))) == ["b", "d"]
+    assert WeightedSampler("ab", [0, 0]).sample(1) == []
+
+
+def test_weighted_sampling_validates_input():
+    with pytest.raises(ValueError):
+        AliasTable([0, 0])
+    with pytest.raises(ValueError):
+        WeightedSampler("abc", [1, 1, 1]).sample(-1)
+    with pytest.raises(ValueError):
+        weighted_sample_without_replacement("abc", [1, 2], 1)
@@ -0,0 +1,110 @@
+import json
+import sqlite3
+
+import pytest
+
+from app.db import database, sql_trace
+from app.db.database import connection
+from app.services.lottery_service import LotteryService
+from app.services.participant_service import ParticipantService
+from app.services.prize_service import PrizeService
+
+
+@pytest.fixture
+def tracing():
+    sql_trace.reset()
+    database.enable_sql_trace()
+    yield
+    database.disable_sql_trace()
+    sql_trace.reset()
+
+
+def _by_caller(suffix):
+    return next(c for c in sql_trace.callers() if c["caller"].endswith(suffix))
+
+
+def test_disabled_connections_are_plain():
+    with connection() as conn:
+        assert type(conn) is sqlite3.Connection
+    assert sql_trace.statements() == []
+
+
+def test_statements_are_attributed_to_service_methods(tracing):
+    service = ParticipantService()
+    for i in range(5):
+        service.add(f"P{i}", f"E{i}")
+    PrizeService().add("頭獎", 2, 1, 0)
+
+    results = LotteryService().run_lottery()
+    assert len(results[0]["winners"]) == 2
+
+    add = _by_caller("ParticipantService.add")
+    assert add["rows"] >= 5          # INSERT rowcount + 讀回的資料列
+    assert any(
+        s["sql"] == "COMMIT" and s["calls"] == 5
+        for s in sql_trace.statements()
+        if s["caller"].endswith("ParticipantService.add")
+    )
+
+    draw = [
+        s for s in sql_trace.statements()
+        if s["caller"].endswith("LotteryService._draw_for_prize")
+    ]
+    insert = next(s for s in draw if s["sql"].startswith("INSERT INTO draw_records"))
+    assert insert["calls"] == 1 and insert["rows"] == 2
+
+
+def test_fetched_rows_and_time_accumulate_on_the_statement(tracing):
+    service = ParticipantService()
+    service.delete_many([])
+    for i in range(30):
+        service.add(f"P{i}")
+    sql_trace.reset()
+
+    with connection() as conn:
+        cur = conn.execute("SELECT id FROM participants")
+        first = cur.fetchone()
+        rest = cur.fetchmany(10)
+        remaining = list(cur)
+
+    assert first and len(rest) == 10 and len(remaining) == 19
+    stat = next(s for s in sql_trace.statements() if s["sql"] == "SELECT id FROM participants")
+    assert stat["calls"] == 1
+    assert stat["rows"] == 30
+    assert stat["caller"].startswith("tests.") or stat["caller"] == "(other)"
+
+
+def test_vm_steps_reflect_work(tracing):
+    with connection() as conn:
+        conn.execute(
+            "WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n WHERE i < 20000) "
+            "SELECT sum(i) FROM n"
+        ).fetchone()
+
+    heavy = max(sql_trace.statements(), key=lambda s: s["vm_steps"])
+    assert heavy["sql"].startswith("WITH RECURSIVE")
+    assert heavy["vm_steps"] >= 20000
+
+
+def test_dump_writes_json_report(tracing, tmp_path):
+    ParticipantService().add("王小明")
+
+    path = sql_trace.dump(tmp_path / "trace.json")
+    report = json.loads(path.read_text(encoding="utf-8"))
+
+    assert report["enabled"] is True
+    assert {"caller", "statements", "calls", "seconds", "rows", "vm_steps"} <= set(report["callers"][0])
+    assert any(s["caller"].endswith("ParticipantService.add") for s in report["statements"])
+
+
+def test_cli_trace_option(tmp_path, capsys):
+    from app import cli
+
+    trace = tmp_path / "trace.json"
+    assert cli.main(["--db", str(tmp_path / "cli.db"), "--trace", str(trace), "history"]) == 0
+    capsys.readouterr()
+
+    report = json.loads(trace.read_text(encoding="utf-8"))
+    assert any(c["caller"].endswith("LotteryHistoryService.get_page") for c in report["callers"])
+    assert not sql_trace.is_enabled()
+    sql_trace.reset()
@@ -0,0 +1,93 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+
+# 匯入 app.main 的時間上限（目前約 30ms；留足 CI / 冷快取的餘裕）
+MAX_IMPORT_SECONDS = 1.0
+
+# 登入畫面出現前不該載入的模組
+LAZY_MODULES = [
+    "openpyxl",
+    "app.ui.main_window",
+    "app.ui.history_window",
+    "app.ui.participants_window",
+    "app.ui.prizes_window",
+    "app.ui.special_wheel_window",
+    "app.utils.history_exporter",
+]
+
+
+def _python(code, **env):
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=ROOT_DIR,
+        env={**os.environ, **env},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return result
+
+
+def _import_probe(module):
+    code = (
+        "import json, sys, time\n"
+        "start = time.perf_counter()\n"
+        f"import {module}\n"
+        "seconds = time.perf_counter() - start\n"
+        "print(json.dumps({'seconds': seconds, 'modules': sorted(sys.modules)}))\n"
+    )
+    return json.loads(_python(code).stdout)
+
+
+def test_app_main_import_is_fast_and_lazy():
+    probe = _import_probe("app.main")
+
+    assert probe["seconds"] < MAX_IMPORT_SECONDS
+    loaded = [name for name in LAZY_MODULES if name in probe["modules"]]
+    assert loaded == []
+
+
+def test_main_window_defers_management_windows():
+    probe = _import_probe("app.ui.main_window")
+
+    loaded = [
+        name for name in LAZY_MODULES
+        if name in probe["modules"] and name != "app.ui.main_window"
+    ]
+    assert loaded == []
+
+
+def test_startup_report_times_imports_and_phases(tmp_path):
+    path = tmp_path / "startup.json"
+    code = (
+        "import app.main\n"
+        "from app.utils import startup_timing\n"
+        "startup_timing.mark('imports')\n"
+        "startup_timing.finish()\n"
+        "import app.db.database as database\n"
+        "print(type(database.__loader__).__name__)\n"
+    )
+    result = _python(code, LOTTERY_STARTUP_REPORT=str(path))
+
+    report = json.loads(path.read_text(encoding="utf-8"))
+    assert [p["phase"] for p in report["phases"]] == ["imports"]
+    modules = {item["module"] for item in report["imports"]}
+    assert {"app.db.database", "app.ui.login_window", "tkinter"} <= modules
+    # 計時用的 loader 在模組執行完就換回原本的
+    assert result.stdout.strip() == "SourceFileLoader"
+
+
+def test_startup_report_is_off_by_default():
+    from app.utils import startup_timing
+
+    if startup_timing.enabled():
+        pytest.skip("LOTTERY_STARTUP_REPORT 已設定")
+    startup_timing.mark("imports")
+    assert startup_timing.report()["phases"] == []